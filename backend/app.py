@@ -1,27 +1,323 @@
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Request, Response, current_app, g, request, jsonify, send_file
 from flask_cors import CORS
-from pathlib import Path
 import os
+import atexit
+import io
+import json
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+import shutil
+import tempfile
+import threading
+import time
+from urllib.parse import quote
 from werkzeug.utils import secure_filename
 from ocr.ocr_engine import OCREngine
+from ocr.layout import PageLayout
+from ocr.redaction import MissingPagesError, redact
+from ocr.result_cache import OCRResultCache, hash_content
 from detector.pii_detector import PIIDetector
+from jobs import JobManager, JobQueueFullError
+from metrics import CACHE, REQUEST_SECONDS, REQUESTS, render_metrics, start_request_timings, timed
+from response_format import compact_result, encode_response, wants_compact, wants_raw
+from settings import Settings
 
-app = Flask(__name__)
-CORS(app)  # React 연결 위해 필수!
+ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'pdf'}
 
+api = Blueprint('api', __name__)
 
-# 설정
-BASE_DIR = Path(__file__).resolve().parent
-UPLOAD_FOLDER = BASE_DIR / 'uploads'
-ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'pdf'}
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB
+def create_app(settings=None):
+    """
+    Flask 앱 생성
+    
+    Args:
+        settings: Settings (없으면 환경 변수에서 읽음)
+    """
+    settings = settings or Settings.from_env()
+    
+    app = Flask(__name__)
+    app.request_class = UploadRequest
+    CORS(app)  # React 연결 위해 필수!
+    
+    os.makedirs(settings.upload_folder, exist_ok=True)
+    app.config['UPLOAD_FOLDER'] = settings.upload_folder
+    app.config['MAX_CONTENT_LENGTH'] = settings.max_content_length
+    
+    services = AppServices(settings)
+    atexit.register(services.close)
+    app.extensions['services'] = services
+    
+    app.register_blueprint(api)
+    return app
+
+
+class UploadRequest(Request):
+    """
+    업로드 파일을 받을 곳을 IN_MEMORY_UPLOAD_MAX 기준으로 정하는 Request
+    
+    기본 Request는 500KB가 넘으면 이름 없는 임시 파일로 받아서 OCR에 넘기려면 한 번 더 복사해야 하므로,
+    요청 전체가 IN_MEMORY_UPLOAD_MAX 이하면 메모리에, 넘으면 바로 upload 폴더의 임시 파일로 받는다.
+    그 파일은 read_upload가 넘겨받고 (claim_upload), 아무도 넘겨받지 않은 파일은 요청이 끝날 때 지운다.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.spooled_uploads = {}  # 임시 파일로 받은 업로드 {경로: 파일} (넘겨받은 파일은 빠짐)
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        settings = get_services().settings
+        if total_content_length is not None and total_content_length <= settings.in_memory_upload_max:
+            return io.BytesIO()
+        
+        # 확장자는 파일명 그대로 쓰지 않음 (경로 문자 등)
+        ext = get_extension(filename) if filename and '.' in filename else ''
+        suffix = f'.{ext}' if ext.isalnum() else ''
+        stream = tempfile.NamedTemporaryFile(dir=settings.upload_folder, suffix=suffix, delete=False)
+        self.spooled_uploads[stream.name] = stream
+        return stream
+    
+    def claim_upload(self, file):
+        """
+        업로드 파일이 임시 파일로 받은 것이면 그 경로를 넘겨받음 (요청이 끝나도 지우지 않음)
+        
+        Returns:
+            임시 파일 경로 (지우는 건 넘겨받은 쪽 책임) 또는 None (메모리로 받은 파일)
+        """
+        path = getattr(file.stream, 'name', None)
+        stream = self.spooled_uploads.pop(path, None)
+        if stream is None:
+            return None
+        stream.flush()
+        return path
+    
+    def close(self):
+        super().close()
+        for path in list(self.spooled_uploads):
+            self.spooled_uploads.pop(path).close()
+            remove_temp_file(path)
+
+
+class AppServices:
+    """
+    앱 하나가 쓰는 OCR 엔진 / 탐지기 / 캐시 / 작업 관리자 (create_app에서 생성)
+    
+    요청 밖(작업 스레드, 배치 스레드)에서도 쓰므로 current_app 대신 이 객체를 넘겨서 사용
+    """
+    
+    def __init__(self, settings):
+        self.settings = settings
+        
+        # OCR, 탐지기 초기화 (각 설정은 Settings / README 환경 변수 표 참고)
+        self.ocr_engine = OCREngine(**settings.ocr_engine_options())
+        self.pii_detector = PIIDetector()
+        
+        # 큰 문서용 백그라운드 작업 (/api/jobs)
+        self.job_manager = JobManager(
+            workers=settings.job_workers,
+            max_pending=settings.job_max_pending,
+            ttl=settings.job_result_ttl
+        )
+        
+        # OCR 결과 캐시 (같은 파일 재업로드 시 OCR 생략, OCR_CACHE_MAX_MB=0 이면 사용 안 함)
+        self.ocr_cache = None
+        if settings.ocr_cache_max_mb > 0:
+            self.ocr_cache = OCRResultCache(
+                settings.ocr_cache_dir,
+                max_bytes=settings.ocr_cache_max_mb * 1024 * 1024
+            )
+    
+    def close(self):
+        """서버 종료 시 워커 풀 / 작업 스레드 정리"""
+        self.ocr_engine.close()
+        self.job_manager.shutdown()
+    
+    def read_upload(self, file, ext):
+        """
+        업로드 파일을 OCR 입력으로 준비
+        
+        작은 파일은 bytes로 메모리에서 바로 처리하고, 큰 파일만 겹치지 않는 이름의
+        임시 파일로 저장한다. (같은 이름 파일이 동시에 올라와도 서로 덮어쓰지 않음)
+        요청을 받을 때 이미 임시 파일로 받은 파일은 (UploadRequest) 복사하지 않고 그 파일을 그대로 쓴다.
+        
+        Returns:
+            (OCR 입력(bytes 또는 경로), 나중에 지울 임시 파일 경로 또는 None)
+        """
+        stream = file.stream
+        stream.seek(0, os.SEEK_END)
+        size = stream.tell()
+        stream.seek(0)
+        
+        with timed('upload_read'):
+            if size > self.settings.in_memory_upload_max:
+                claim_upload = getattr(request, 'claim_upload', None)
+                temp_path = claim_upload(file) if claim_upload else None
+                if temp_path:
+                    return temp_path, temp_path
+            return self.spool_stream(stream, size, ext)
+    
+    def spool_stream(self, stream, size, ext):
+        """크기가 size인 스트림을 bytes 또는 임시 파일로 (read_upload 참고)"""
+        if size <= self.settings.in_memory_upload_max:
+            return stream.read(), None
+        
+        fd, temp_path = tempfile.mkstemp(dir=self.settings.upload_folder, suffix=f'.{ext}')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                shutil.copyfileobj(stream, f)
+        except Exception:
+            # 읽다가 실패하면 (손상된 zip 항목 등) 쓰다 만 파일은 지움
+            remove_temp_file(temp_path)
+            raise
+        return temp_path, temp_path
+    
+    def iter_layouts_cached(self, source, filename, enable_pdf_ocr, progress=None, raise_errors=False):
+        """
+        OCR 결과 캐시를 거쳐 페이지별 PageLayout을 하나씩 반환 (source: bytes 또는 파일 경로)
+        
+        위치 정보까지 캐시하므로 분석한 파일을 가림 처리할 때 다시 OCR하지 않는다.
+        끝까지 다 읽은 경우에만 캐시에 저장한다. (조기 종료로 중간에 닫히면 저장 안 함)
+        추출 에러는 raise_errors면 그대로 올리고, 아니면 그때까지 읽은 페이지로 끝낸다.
+        """
+        cache_key = None
+        if self.ocr_cache:
+            with timed('cache_lookup'):
+                cache_key = self.ocr_cache.make_key(
+                    hash_content(source),
+                    ext=get_extension(filename),
+                    enable_pdf_ocr=enable_pdf_ocr,
+                    preprocess=vars(self.ocr_engine.preprocess),
+                    rotation=self.ocr_engine.rotation,
+                    backend=self.ocr_engine.backend
+                )
+                cached = self.ocr_cache.get_pages(cache_key)
+            CACHE.inc('miss' if cached is None else 'hit')
+            if cached is not None:
+                print(f"♻️ OCR 캐시 사용: {filename}")
+                page_count, pages = cached
+                if progress:
+                    progress(page_count, page_count)
+                try:
+                    for page in pages:
+                        yield PageLayout.from_dict(page)
+                finally:
+                    pages.close()
+                return
+        
+        print(f"📄 OCR 시작: {filename}")
+        # 페이지는 읽는 대로 캐시 파일에 한 줄씩 씀 (문서 전체를 메모리에 모으지 않음, 로그에는 앞부분만)
+        writer = self.ocr_cache.page_writer(cache_key) if cache_key else None
+        preview = None
+        has_text = False
+        try:
+            try:
+                for layout in self.ocr_engine.iter_layouts(source, enable_pdf_ocr, filename=filename, progress=progress):
+                    if writer:
+                        writer.write(layout.to_dict())
+                    if preview is None:
+                        preview = layout.text[:100]
+                    elif len(preview) < 100:
+                        preview = f"{preview} {layout.text}"[:100]
+                    has_text = has_text or bool(layout.text.strip())
+                    yield layout
+            except Exception as e:
+                # 분석은 추출 실패를 빈 텍스트처럼 처리 (캐시에도 저장 안 함)
+                print(f"❌ 텍스트 추출 에러: {e}")
+                if raise_errors:
+                    raise
+                return
+            
+            print(f"✅ 추출된 텍스트: {preview or ''}...")
+            
+            # 추출 실패(빈 결과)는 다음에 다시 시도하도록 저장하지 않음
+            if writer and has_text:
+                with timed('cache_write'):
+                    writer.commit()
+        finally:
+            # commit 안 된 경우 (조기 종료, 에러, 빈 결과) 쓰던 파일 삭제
+            if writer:
+                writer.close()
+    
+    def detect_source(self, source, original_filename, enable_pdf_ocr, settings, stop_early=False, progress=None,
+                      raise_errors=False, keep_layouts=True):
+        """
+        OCR + 민감정보 탐지
+        
+        Args:
+            source: bytes 또는 파일 경로
+            original_filename: 업로드된 원래 파일명
+                (secure_filename은 한글을 지우므로 형식 판단은 원래 파일명으로)
+            raise_errors: 추출 에러를 그대로 올릴지 (iter_layouts_cached 참고)
+            keep_layouts: 읽은 PageLayout을 모아서 돌려줄지
+                (응답 텍스트나 가림 처리에 필요할 때만, 아니면 페이지는 탐지 후 바로 버림)
+        
+        Returns:
+            (탐지 결과, 읽은 [PageLayout] 또는 None(keep_layouts=False), 추출 텍스트 전체 길이)
+        """
+        # OCR되는 페이지를 바로바로 탐지 (같은 내용 + 같은 옵션으로 OCR한 적 있으면 캐시 사용)
+        print("🔍 민감정보 탐지 중...")
+        layouts = [] if keep_layouts else None
+        # 페이지 텍스트는 ' '로 이어 붙인 기준 (검출 위치 positions와 같음)
+        page_lengths = []
+        
+        def collect_pages():
+            for layout in self.iter_layouts_cached(source, original_filename, enable_pdf_ocr, progress, raise_errors):
+                if layouts is not None:
+                    layouts.append(layout)
+                page_lengths.append(len(layout.text))
+                yield layout.text
+        
+        detection_result = self.pii_detector.detect_pages(collect_pages(), settings, stop_early=stop_early)
+        text_length = sum(page_lengths) + max(0, len(page_lengths) - 1)
+        return detection_result, layouts, text_length
+    
+    def analyze_source(self, source, original_filename, enable_pdf_ocr, settings, stop_early=False, progress=None,
+                       text_range=(0, None)):
+        """
+        OCR + 민감정보 탐지 (동기 API와 작업 API가 같이 사용)
+        
+        Args:
+            text_range: 응답에 넣을 추출 텍스트 범위 (시작 글자, 글자 수 또는 None(끝까지)),
+                None이면 텍스트는 넣지 않음 (get_text_range 참고)
+        
+        Returns:
+            dict: /api/analyze 응답 본문
+        """
+        # 텍스트를 넣지 않으면 페이지는 탐지 후 바로 버림
+        detection_result, layouts, text_length = self.detect_source(
+            source, original_filename, enable_pdf_ocr, settings, stop_early, progress,
+            keep_layouts=text_range is not None
+        )
+        
+        result = {
+            'success': True,
+            'filename': secure_filename(original_filename),
+        }
+        
+        # 전체 길이는 항상 알려줌 (검출 위치 positions가 이 텍스트 기준)
+        if text_range is None:
+            result['extracted_text_length'] = text_length
+        else:
+            extracted_text = ' '.join(layout.text for layout in layouts)
+            offset, limit = text_range
+            result['extracted_text'] = extracted_text[offset:None if limit is None else offset + limit]
+            result['extracted_text_length'] = text_length
+            if offset or limit is not None:
+                result['extracted_text_offset'] = offset
+        
+        result.update({
+            'detection': detection_result,
+            'classification': detection_result['classification'],
+            'risk_score': detection_result['risk_score'],
+            'detected_items': detection_result['detected_items']
+        })
+        return result
+
 
-# OCR, 탐지기 초기화
-ocr_engine = OCREngine()
-pii_detector = PIIDetector()
+def get_services(app=None):
+    """앱의 AppServices (app이 없으면 지금 요청을 처리하는 앱)"""
+    return (app or current_app).extensions['services']
 
 
 def allowed_file(filename):
@@ -29,77 +325,481 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
-@app.route('/api/health', methods=['GET'])
+def get_extension(filename):
+    """파일 확장자 (소문자)"""
+    return filename.rsplit('.', 1)[1].lower()
+
+
+def get_upload_file():
+    """
+    요청의 업로드 파일 체크
+    
+    Returns:
+        (file, None) 또는 (None, 에러 응답)
+    """
+    if 'file' not in request.files:
+        return None, (jsonify({'error': '파일이 없습니다'}), 400)
+    
+    file = request.files['file']
+    
+    if file.filename == '':
+        return None, (jsonify({'error': '파일명이 없습니다'}), 400)
+    
+    if not allowed_file(file.filename):
+        return None, (jsonify({'error': '지원하지 않는 파일 형식입니다'}), 400)
+    
+    return file, None
+
+
+def wants_timings():
+    """요청에 단계별 처리 시간을 같이 달라고 했는지 (timings=true, 폼 또는 쿼리)"""
+    return request.values.get('timings', 'false').lower() == 'true'
+
+
+def get_analyze_options():
+    """요청의 분석 설정: (enable_pdf_ocr, settings, stop_early)"""
+    enable_pdf_ocr = request.form.get("enablePdfOcr", "false").lower() == "true"
+    
+    # 민감 문서 판별만 필요할 때: 결과가 확정되면 남은 페이지는 건너뜀
+    stop_early = request.form.get("stopEarly", "false").lower() == "true"
+    
+    settings = request.form.get('settings')
+    if settings:
+        settings = json.loads(settings)
+    else:
+        settings = {}
+    
+    return enable_pdf_ocr, settings, stop_early
+
+
+def get_text_range(include_default=True):
+    """
+    응답에 넣을 추출 텍스트 범위 (폼 또는 쿼리)
+    
+    - includeText=false: 텍스트를 넣지 않음 (큰 문서의 응답 / 작업 결과 크기 줄이기)
+      (include_default=False면 includeText=true일 때만 넣음)
+    - textOffset, textLimit: 글자 단위로 나눠 받기 (extracted_text_length까지 textOffset을 늘려가며 요청)
+    
+    Returns:
+        (시작, 글자 수 또는 None) 또는 None(텍스트 생략)
+    """
+    if request.values.get('includeText', 'true' if include_default else 'false').lower() == 'false':
+        return None
+    
+    try:
+        offset = int(request.values.get('textOffset') or 0)
+        limit = request.values.get('textLimit')
+        limit = int(limit) if limit else None
+    except ValueError:
+        raise ValueError('textOffset, textLimit은 0 이상의 정수여야 합니다') from None
+    if offset < 0 or (limit is not None and limit < 0):
+        raise ValueError('textOffset, textLimit은 0 이상의 정수여야 합니다')
+    return offset, limit
+
+
+def remove_temp_file(temp_path):
+    """임시 파일 삭제"""
+    if temp_path and os.path.exists(temp_path):
+        try:
+            os.remove(temp_path)
+        except Exception as e:
+            print(f"⚠️ 파일 삭제 실패: {e}")
+
+
+class SharedTempFile:
+    """
+    여러 작업이 같이 쓰는 임시 파일 (배치의 zip 등, 잡은 몫을 마지막으로 놓는 쪽이 지움)
+    
+    만든 쪽이 한 몫을 잡은 상태로 시작한다.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self._count = 1
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        with self._lock:
+            self._count += 1
+    
+    def release(self):
+        with self._lock:
+            self._count -= 1
+            last = self._count == 0
+        if last:
+            remove_temp_file(self.path)
+
+
+@api.before_app_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@api.after_app_request
+def record_request_metrics(response):
+    """요청 수 / 처리 시간 기록 (스트리밍 응답은 본문을 보내기 전까지)"""
+    # 지표 이름은 블루프린트 이름을 뺀 함수 이름 (analyze_document 등)
+    endpoint = (request.endpoint or 'unknown').rsplit('.', 1)[-1]
+    started = g.get('request_started')
+    if started is not None:
+        REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint)
+    REQUESTS.inc(endpoint, str(response.status_code))
+    return response
+
+
+@api.route('/api/metrics', methods=['GET'])
+def metrics():
+    """처리 단계별 시간 / 요청 수 등 (Prometheus text format)"""
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+
+@api.route('/api/health', methods=['GET'])
 def health_check():
-    """헬스 체크"""
-    return jsonify({'status': 'ok'})
+    """헬스 체크 (프로세스가 살아 있는지, OCR 모델 상태와 상관없이 200)"""
+    return jsonify({'status': 'ok', 'ocr': get_services().ocr_engine.status()})
+
 
+@api.route('/api/health/ready', methods=['GET'])
+def readiness_check():
+    """
+    요청을 바로 처리할 수 있는지 (OCR 모델 로딩이 끝났으면 200, 아니면 503)
+    
+    OCR 워커가 죽어서 워커 풀을 다시 띄우는 동안(rebuilding)도 503이다.
+    
+    lazy 모드는 첫 요청 때 로딩하므로 로딩 전에도 준비된 것으로 본다.
+    """
+    status = get_services().ocr_engine.status()
+    ready = status == 'ready' or status == 'not_loaded'
+    return jsonify({'ready': ready, 'ocr': status}), 200 if ready else 503
 
-@app.route('/api/analyze', methods=['POST'])
+
+@api.route('/api/analyze', methods=['POST'])
 def analyze_document():
-    """문서 분석 API"""
-    filepath = None
+    """
+    문서 분석 API
+    
+    format=compact면 중복 없는 compact 형식 (텍스트 / 원본 값은 요청할 때만, compact_result 참고)
+    응답은 Accept / Accept-Encoding에 따라 JSON 또는 MessagePack, gzip (encode_response 참고)
+    """
+    services = get_services()
+    temp_path = None
     try:
-        # 1. 파일 체크
-        if 'file' not in request.files:
-            return jsonify({'error': '파일이 없습니다'}), 400
+        # timings=true면 단계별 처리 시간도 응답에 포함
+        timings = start_request_timings() if wants_timings() else None
         
-        file = request.files['file']
+        # 1. 파일 체크
+        file, error = get_upload_file()
+        if error:
+            return error
         
-        if file.filename == '':
-            return jsonify({'error': '파일명이 없습니다'}), 400
+        # 2. 설정 받기
+        enable_pdf_ocr, settings, stop_early = get_analyze_options()
+        compact = wants_compact()
+        try:
+            text_range = get_text_range(include_default=not compact)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        if not allowed_file(file.filename):
-            return jsonify({'error': '지원하지 않는 파일 형식입니다'}), 400
+        # 3. 파일 읽기 (큰 파일만 임시 파일로 저장)
+        source, temp_path = services.read_upload(file, get_extension(file.filename))
         
-        # 2. 설정 받기
-        enable_pdf_ocr = request.form.get("enablePdfOcr", "false").lower() == "true"
+        # 4. OCR + 탐지 후 결과 반환
+        result = services.analyze_source(source, file.filename, enable_pdf_ocr, settings, stop_early,
+                                         text_range=text_range)
+        if compact:
+            result = compact_result(result, include_raw=wants_raw())
+        if timings:
+            result['timings'] = timings.to_dict()
+        return encode_response(result)
+    
+    except Exception as e:
+        print(f"❌ 에러: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+    
+    finally:
+        # 성공/실패 상관없이 마지막에 임시 파일 삭제
+        remove_temp_file(temp_path)
 
-        settings = request.form.get('settings')
-        if settings:
-            import json
-            settings = json.loads(settings)
-        else:
-            settings = {}
+
+@api.route('/api/redact', methods=['POST'])
+def redact_document():
+    """
+    민감정보 가림 처리 API
+    
+    /api/analyze와 같은 file/settings/enablePdfOcr를 받아 검출된 위치를 검게 가린
+    파일(PDF는 가림 주석 적용, 이미지는 칠하기)을 돌려준다.
+    추출 때 기록한 위치를 쓰므로 따로 OCR하지 않고, 먼저 분석한 파일이면 캐시된 결과를 사용한다.
+    """
+    services = get_services()
+    temp_path = None
+    try:
+        file, error = get_upload_file()
+        if error:
+            return error
         
-        # 3. 파일 저장
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        # 가림 처리는 모든 검출 항목이 필요하므로 stopEarly는 무시
+        enable_pdf_ocr, settings, _ = get_analyze_options()
+        source, temp_path = services.read_upload(file, get_extension(file.filename))
         
-        # 4. OCR 실행
-        print(f"📄 OCR 시작: {filename}")
-        extracted_text = ocr_engine.extract_text(filepath, enable_pdf_ocr)
-        print(f"✅ 추출된 텍스트: {extracted_text[:100]}...")
+        # 추출 실패를 빈 텍스트로 보면 가리지 않은 원본이 그대로 나가므로 에러로 처리
+        try:
+            detection_result, layouts, _ = services.detect_source(
+                source, file.filename, enable_pdf_ocr, settings, raise_errors=True
+            )
+        except Exception as e:
+            return jsonify({'error': f'텍스트 추출에 실패해서 가림 처리할 수 없습니다: {e}'}), 500
         
-        # 5. 민감정보 탐지
-        print("🔍 민감정보 탐지 중...")
-        detection_result = pii_detector.detect(extracted_text, settings)
+        try:
+            redacted, box_count = redact(source, file.filename, layouts, detection_result)
+        except MissingPagesError as e:
+            print(f"❌ 가림 처리 불가: {e}")
+            return jsonify({'error': f'가림 처리할 수 없습니다: {e}'}), 422
+        print(f"⬛ 가림 처리 완료: {box_count}곳")
         
-        # 6. 결과 반환
-        return jsonify({
-            'success': True,
-            'filename': filename,
-            'extracted_text': extracted_text,
-            'detection': detection_result,
-            'classification': detection_result['classification'],
-            'risk_score': detection_result['risk_score'],
-            'detected_items': detection_result['detected_items']
-        })
+        # 형식은 파일명으로 판단 (한글 파일명도 그대로 내려줌)
+        response = send_file(
+            io.BytesIO(redacted),
+            as_attachment=True,
+            download_name=f"redacted_{os.path.basename(file.filename)}"
+        )
+        response.headers['X-Detected-Count'] = str(detection_result['total_count'])
+        response.headers['X-Classification'] = quote(detection_result['classification'])
+        response.headers['Access-Control-Expose-Headers'] = 'X-Detected-Count, X-Classification, Content-Disposition'
+        return response
     
     except Exception as e:
         print(f"❌ 에러: {str(e)}")
         return jsonify({'error': str(e)}), 500
     
     finally:
-        # 성공/실패 상관없이 마지막에 파일 삭제
-        if filepath and os.path.exists(filepath):
-            try:
-                os.remove(filepath)
-            except Exception as e:
-                print(f"⚠️ 파일 삭제 실패: {e}")
+        remove_temp_file(temp_path)
+
+
+def zip_member_name(info):
+    """zip 안 파일명 (UTF-8 표시가 없으면 Windows 한글 zip으로 보고 cp949로 다시 해석)"""
+    if info.flag_bits & 0x800:
+        return info.filename
+    try:
+        return info.filename.encode('cp437').decode('cp949')
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return info.filename
+
+
+def read_batch_uploads(services):
+    """
+    배치 요청의 파일들을 OCR 입력으로 준비 (zip이면 안의 파일 목록만 읽음)
+    
+    zip 안의 파일은 미리 꺼내 두지 않고 그 파일 작업이 시작될 때 꺼낸다. (extract_zip_member)
+    그래서 한 번에 메모리/디스크에 풀려 있는 파일은 동시 처리 수(BATCH_CONCURRENCY)만큼이다.
+    
+    Returns:
+        [(원래 파일명, OCR 입력(bytes 또는 경로, zip 안 파일이면 zip) 또는 None(지원하지 않는 형식),
+          zip 안 파일이면 ZipInfo 아니면 None, SharedTempFile 또는 None)]
+        임시 파일은 목록의 한 줄마다 한 몫씩 잡혀 있음
+        (중간에 에러가 나면 그때까지 만든 임시 파일은 지우고 에러를 올림)
+    """
+    uploads = []
+    unzipped = 0
+    archive_shares = []  # read_upload로 넘겨받은 zip 몫 (목록을 다 읽은 뒤 놓음)
+    
+    try:
+        for file in request.files.getlist('files') + request.files.getlist('file'):
+            if not file.filename:
+                continue
+            
+            if file.filename.lower().endswith('.zip'):
+                archive, temp_path = services.read_upload(file, 'zip')
+                shared = SharedTempFile(temp_path) if temp_path else None
+                if shared:
+                    archive_shares.append(shared)
+                
+                with zipfile.ZipFile(io.BytesIO(archive) if isinstance(archive, bytes) else archive) as zf:
+                    members = zf.infolist()
+                
+                for info in members:
+                    name = zip_member_name(info)
+                    if info.is_dir() or not allowed_file(name):
+                        continue
+                    
+                    # 압축 폭탄 방지 (헤더의 크기로 미리 확인)
+                    unzipped += info.file_size
+                    if unzipped > services.settings.batch_max_unzipped:
+                        raise ValueError('압축을 푼 파일 크기가 너무 큽니다')
+                    
+                    if shared:
+                        shared.acquire()
+                    uploads.append((name, archive, info, shared))
+            
+            elif allowed_file(file.filename):
+                source, temp_path = services.read_upload(file, get_extension(file.filename))
+                uploads.append((file.filename, source, None, SharedTempFile(temp_path) if temp_path else None))
+            
+            else:
+                uploads.append((file.filename, None, None, None))
+    except Exception:
+        for _, _, _, shared in uploads:
+            if shared:
+                shared.release()
+        raise
+    finally:
+        for shared in archive_shares:
+            shared.release()
+    
+    return uploads
+
+
+def extract_zip_member(services, archive, info):
+    """
+    zip(bytes 또는 경로) 안 파일 하나를 OCR 입력으로 꺼냄 (배치 작업이 시작될 때, 스레드마다 따로 열기)
+    
+    Returns:
+        (OCR 입력(bytes 또는 경로), 나중에 지울 임시 파일 경로 또는 None)
+    """
+    with zipfile.ZipFile(io.BytesIO(archive) if isinstance(archive, bytes) else archive) as zf:
+        with zf.open(info) as member:
+            return services.spool_stream(member, info.file_size, get_extension(zip_member_name(info)))
+
+
+@api.route('/api/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """
+    여러 파일 일괄 분석 API
+    
+    files(여러 개) 또는 zip 파일과 공통 settings/enablePdfOcr/stopEarly를 받아
+    설정은 한 번만 정리(compile)하고 파일들을 동시에 처리한다.
+    결과는 끝나는 순서대로 한 줄에 하나씩 NDJSON으로 보낸다.
+    (각 줄: index, filename + /api/analyze 응답 또는 error)
+    """
+    services = get_services()
+    try:
+        enable_pdf_ocr, settings, stop_early = get_analyze_options()
+        text_range = get_text_range()
+        config = services.pii_detector.compile(settings)
+        uploads = read_batch_uploads(services)
+    except Exception as e:
+        print(f"❌ 에러: {str(e)}")
+        return jsonify({'error': str(e)}), 400
+    
+    if not uploads:
+        return jsonify({'error': '파일이 없습니다'}), 400
+    
+    def analyze_one(name, source, member, shared):
+        temp_path = None
+        try:
+            if source is None:
+                raise ValueError('지원하지 않는 파일 형식입니다')
+            if member is not None:
+                source, temp_path = extract_zip_member(services, source, member)
+            return services.analyze_source(source, name, enable_pdf_ocr, config, stop_early, text_range=text_range)
+        finally:
+            remove_temp_file(temp_path)
+            if shared:
+                shared.release()
+    
+    def submit(executor, upload):
+        # 작업이 끝날 때(또는 취소될 때) 놓을 몫
+        if upload[3]:
+            upload[3].acquire()
+        return executor.submit(analyze_one, *upload)
+    
+    def generate():
+        executor = ThreadPoolExecutor(max_workers=services.settings.batch_concurrency, thread_name_prefix='batch')
+        futures = {
+            submit(executor, upload): (index, upload[0])
+            for index, upload in enumerate(uploads)
+        }
+        try:
+            for future in as_completed(futures):
+                index, name = futures[future]
+                try:
+                    line = {**future.result(), 'index': index, 'filename': name}
+                except Exception as e:
+                    print(f"❌ 에러 ({name}): {str(e)}")
+                    line = {'index': index, 'filename': name, 'success': False, 'error': str(e)}
+                yield json.dumps(line, ensure_ascii=False) + '\n'
+        finally:
+            # 클라이언트가 끊으면 시작 안 한 파일은 취소하고 그 몫의 임시 파일 정리
+            for future, (index, _) in futures.items():
+                if future.cancel() and uploads[index][3]:
+                    uploads[index][3].release()
+            executor.shutdown(wait=False)
+    
+    def release_uploads():
+        # 요청이 잡고 있던 몫 (generate가 시작도 안 하고 끊겨도 응답을 닫을 때 불림)
+        for _, _, _, shared in uploads:
+            if shared:
+                shared.release()
+    
+    response = Response(generate(), mimetype='application/x-ndjson')
+    response.call_on_close(release_uploads)
+    return response
+
+
+def run_analysis_job(services, source, temp_path, original_filename, enable_pdf_ocr, settings, stop_early, text_range,
+                     progress):
+    """백그라운드 분석 작업 (끝나면 임시 파일 삭제)"""
+    try:
+        return services.analyze_source(
+            source, original_filename, enable_pdf_ocr, settings, stop_early, progress, text_range
+        )
+    finally:
+        remove_temp_file(temp_path)
+
+
+@api.route('/api/jobs', methods=['POST'])
+def create_job():
+    """
+    문서 분석 작업 등록 API (큰 문서용)
+    
+    바로 job_id를 돌려주고, 진행 상황과 결과는 GET /api/jobs/<job_id>로 조회
+    """
+    services = get_services()
+    temp_path = None
+    try:
+        file, error = get_upload_file()
+        if error:
+            return error
+        
+        enable_pdf_ocr, settings, stop_early = get_analyze_options()
+        # 작업 결과는 TTL 동안 메모리에 남으므로 텍스트 범위도 등록할 때 정함
+        try:
+            text_range = get_text_range()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        source, temp_path = services.read_upload(file, get_extension(file.filename))
+        
+        job = services.job_manager.submit(
+            run_analysis_job, services, source, temp_path, file.filename, enable_pdf_ocr, settings, stop_early,
+            text_range, on_cancel=partial(remove_temp_file, temp_path)
+        )
+        # 임시 파일은 이제 작업이 지움 (시작 전에 취소되면 on_cancel로)
+        temp_path = None
+        
+        return jsonify(job.to_dict()), 202
+    
+    except JobQueueFullError as e:
+        return jsonify({'error': str(e)}), 429, {'Retry-After': '10'}
+    
+    except Exception as e:
+        print(f"❌ 에러: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+    
+    finally:
+        remove_temp_file(temp_path)
+
+
+@api.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """작업 진행 상황 / 결과 조회 API"""
+    job = get_services().job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다'}), 404
+    
+    return jsonify(job.to_dict())
 
 if __name__ == '__main__':
+    # 개발용 서버 (운영은 README의 gunicorn 실행 방법 참고)
+    app = create_app()
     print("🚀 Flask 서버 시작...")
     print("📍 http://localhost:5000")
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,295 @@
+"""
+OCR / 탐지 성능 벤치마크
+
+backend 폴더에서 실행:
+    python -m benchmarks.run --suites detect,extract,api --output result.json
+    python -m benchmarks.run --suites detect --baseline result.json   # 이전 결과와 비교
+
+결과는 JSON (케이스별 지연 시간 백분위수, 처리량, 검출 개수 / 넣은 개수, 추출 텍스트 정확도)
+
+OCR 백엔드 비교 (같은 입력):
+    OCR_BACKEND=easyocr python -m benchmarks.run --suites extract,api --output easyocr.json
+    OCR_BACKEND=onnx python -m benchmarks.run --suites extract,api --baseline easyocr.json
+"""
+import argparse
+import difflib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from . import synthetic
+
+SUITES = ('detect', 'extract', 'api')
+
+
+def percentile(sorted_values, p):
+    """정렬된 값들의 p 백분위수 (선형 보간)"""
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * p / 100
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+def measure(fn, repeat, warmup):
+    """fn을 warmup번 버리고 repeat번 실행 → (초 리스트, 마지막 반환값)"""
+    result = None
+    for _ in range(warmup):
+        result = fn()
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        seconds.append(time.perf_counter() - started)
+    return seconds, result
+
+
+def text_accuracy(expected_pages, extracted_pages):
+    """
+    추출 텍스트 정확도 (페이지별 글자 일치 비율의 평균, 0~1)
+
+    OCR은 띄어쓰기/줄바꿈이 원본과 다르게 나오므로 공백은 빼고 비교한다.
+    """
+    if not expected_pages:
+        return None
+    ratios = []
+    for i, expected in enumerate(expected_pages):
+        extracted = extracted_pages[i] if i < len(extracted_pages) else ''
+        matcher = difflib.SequenceMatcher(
+            None, ''.join(expected.split()), ''.join(extracted.split()), autojunk=False
+        )
+        ratios.append(matcher.ratio())
+    return sum(ratios) / len(ratios)
+
+
+def summarize(suite, case, pages, input_bytes, seconds, detected=None, expected=None, accuracy=None):
+    seconds = sorted(seconds)
+    mean = sum(seconds) / len(seconds)
+    row = {
+        'suite': suite,
+        'case': case,
+        'pages': pages,
+        'input_bytes': input_bytes,
+        'runs': len(seconds),
+        'latency_ms': {
+            'p50': round(percentile(seconds, 50) * 1000, 3),
+            'p90': round(percentile(seconds, 90) * 1000, 3),
+            'p99': round(percentile(seconds, 99) * 1000, 3),
+            'mean': round(mean * 1000, 3),
+            'min': round(seconds[0] * 1000, 3),
+            'max': round(seconds[-1] * 1000, 3),
+        },
+        'throughput': {
+            'docs_per_s': round(1 / mean, 3) if mean else None,
+            'pages_per_s': round(pages / mean, 3) if mean else None,
+            'mb_per_s': round(input_bytes / mean / 1e6, 3) if mean else None,
+        },
+    }
+    if expected is not None:
+        row['detected'] = detected
+        row['expected'] = expected
+    if accuracy is not None:
+        row['text_accuracy'] = round(accuracy, 4)
+
+    print(
+        f"⏱️ {suite}/{case} {pages}p: p50 {row['latency_ms']['p50']}ms, "
+        f"p90 {row['latency_ms']['p90']}ms, {row['throughput']['pages_per_s']} pages/s"
+        + (f", 검출 {detected}/{expected}" if expected is not None else '')
+        + (f", 텍스트 정확도 {accuracy:.1%}" if accuracy is not None else ''),
+        file=sys.stderr
+    )
+    return row
+
+
+def bench_detect(args):
+    """PIIDetector.detect (텍스트 크기별, 일반 문장 / 번호가 빽빽한 표)"""
+    from detector.pii_detector import PIIDetector
+
+    detector = PIIDetector()
+    rows = []
+    for pages in args.sizes:
+        cases = (
+            ('text', synthetic.make_pages(pages, args.pii_per_page, seed=args.seed)),
+            ('table', synthetic.make_table_pages(pages, seed=args.seed)),
+        )
+        for case, (texts, expected) in cases:
+            text = ' '.join(texts)
+            seconds, result = measure(lambda: detector.detect(text), args.repeat, args.warmup)
+            rows.append(summarize(
+                'detect', case, pages, len(text.encode('utf-8')), seconds,
+                result['total_count'], sum(expected.values())
+            ))
+    return rows
+
+
+def _documents(args):
+    """(케이스, 페이지 수, 파일명, bytes, OCR 필요 여부, 넣은 개수, 페이지별 원본 텍스트)"""
+    for pages in args.doc_sizes:
+        texts, expected = synthetic.make_pages(pages, args.pii_per_page, seed=args.seed)
+        total = sum(expected.values())
+        yield 'text_pdf', pages, 'bench.pdf', synthetic.text_pdf(texts), False, total, texts
+        yield 'scanned_pdf', pages, 'bench.pdf', synthetic.scanned_pdf(texts), True, total, texts
+
+    texts, expected = synthetic.make_pages(1, args.pii_per_page, seed=args.seed)
+    photo = synthetic.photo(texts[0], size=tuple(args.photo_size), seed=args.seed)
+    yield 'photo', 1, 'bench.jpg', photo, False, sum(expected.values()), texts
+
+
+@lru_cache(maxsize=1)
+def _load_app():
+    """환경 변수 설정으로 앱 생성 (OCR 캐시는 따로 지정하지 않으면 꺼서 매번 실제로 처리)"""
+    os.environ.setdefault('OCR_CACHE_MAX_MB', '0')
+    os.environ.setdefault('OCR_WARMUP', 'eager')
+    from app import create_app
+    return create_app()
+
+
+def bench_extract(args):
+    """OCREngine.extract_pages (텍스트 PDF / 스캔 PDF / 사진) + 원본 텍스트 대비 정확도"""
+    from app import get_services
+
+    ocr_engine = get_services(_load_app()).ocr_engine
+    rows = []
+    for case, pages, filename, data, enable_pdf_ocr, total, texts in _documents(args):
+        seconds, extracted = measure(
+            lambda: ocr_engine.extract_pages(data, enable_pdf_ocr, filename=filename),
+            args.repeat, args.warmup
+        )
+        rows.append(summarize(
+            'extract', case, pages, len(data), seconds, accuracy=text_accuracy(texts, extracted)
+        ))
+    return rows
+
+
+def bench_api(args):
+    """/api/analyze 전체 경로 (Flask test client)"""
+    client = _load_app().test_client()
+    rows = []
+    for case, pages, filename, data, enable_pdf_ocr, total, _ in _documents(args):
+        def call():
+            response = client.post('/api/analyze', data={
+                'file': (io.BytesIO(data), filename),
+                'enablePdfOcr': 'true' if enable_pdf_ocr else 'false',
+            })
+            if response.status_code != 200:
+                raise RuntimeError(f"/api/analyze 실패 ({response.status_code}): {response.get_data(as_text=True)}")
+            return response.get_json()
+
+        seconds, result = measure(call, args.repeat, args.warmup)
+        rows.append(summarize(
+            'api', case, pages, len(data), seconds, result['detection']['total_count'], total
+        ))
+    return rows
+
+
+def environment():
+    """결과 비교용 실행 환경 정보"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    versions = {}
+    for module in ('easyocr', 'torch', 'onnxruntime', 'fitz', 'numpy'):
+        mod = sys.modules.get(module)
+        if mod is not None:
+            versions[module] = getattr(mod, '__version__', None) or getattr(mod, 'VersionBind', None)
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'versions': versions,
+        'env': {k: v for k, v in os.environ.items() if k.startswith(('OCR_', 'JOB_', 'BATCH_'))},
+    }
+
+
+def compare(baseline, rows):
+    """이전 결과 대비 p50 / 처리량 (/ 텍스트 정확도, 검출 개수) 변화 출력"""
+    old = {(r['suite'], r['case'], r['pages']): r for r in baseline.get('results', [])}
+    print("📊 이전 결과 대비 (p50 지연 / 처리량)", file=sys.stderr)
+    for row in rows:
+        prev = old.get((row['suite'], row['case'], row['pages']))
+        if not prev:
+            continue
+        p50 = row['latency_ms']['p50'] / prev['latency_ms']['p50'] - 1 if prev['latency_ms']['p50'] else 0
+        tput = (row['throughput']['pages_per_s'] or 0) / (prev['throughput']['pages_per_s'] or 1) - 1
+        extra = ''
+        if row.get('text_accuracy') is not None and prev.get('text_accuracy') is not None:
+            extra += f", 텍스트 정확도 {prev['text_accuracy']:.1%} → {row['text_accuracy']:.1%}"
+        if row.get('expected') is not None and prev.get('expected') is not None:
+            extra += f", 검출 {prev['detected']} → {row['detected']}"
+        print(
+            f"  {row['suite']}/{row['case']} {row['pages']}p: p50 {p50:+.1%}, 처리량 {tput:+.1%}{extra}",
+            file=sys.stderr
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='OCR / 민감정보 탐지 벤치마크')
+    parser.add_argument('--suites', default='detect', help=f"쉼표로 구분 ({', '.join(SUITES)})")
+    parser.add_argument('--sizes', default='1,10,100', help='detect 텍스트 크기(페이지 수)')
+    parser.add_argument('--doc-sizes', default='1,5', help='extract/api 문서 크기(페이지 수)')
+    parser.add_argument('--photo-size', default='4000,3000', help='사진 크기 (가로,세로)')
+    parser.add_argument('--pii-per-page', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='결과 JSON 파일 (없으면 표준 출력)')
+    parser.add_argument('--baseline', help='비교할 이전 결과 JSON 파일')
+    args = parser.parse_args(argv)
+
+    args.suites = [s.strip() for s in args.suites.split(',') if s.strip()]
+    unknown = set(args.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"알 수 없는 suite: {', '.join(sorted(unknown))}")
+    args.sizes = [int(s) for s in args.sizes.split(',')]
+    args.doc_sizes = [int(s) for s in args.doc_sizes.split(',')]
+    args.photo_size = [int(s) for s in args.photo_size.split(',')]
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    runners = {'detect': bench_detect, 'extract': bench_extract, 'api': bench_api}
+
+    rows = []
+    for suite in args.suites:
+        rows.extend(runners[suite](args))
+
+    report = {
+        'environment': environment(),
+        'settings': {
+            'suites': args.suites, 'sizes': args.sizes, 'doc_sizes': args.doc_sizes,
+            'photo_size': args.photo_size, 'pii_per_page': args.pii_per_page,
+            'repeat': args.repeat, 'warmup': args.warmup, 'seed': args.seed,
+        },
+        'results': rows,
+    }
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            compare(json.load(f), rows)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
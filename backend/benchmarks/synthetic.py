@@ -0,0 +1,182 @@
+"""
+벤치마크용 가짜 문서 생성 (같은 seed면 항상 같은 문서)
+
+한국어/영어 문장 사이에 민감정보를 정해진 개수만큼 섞어 넣는다.
+넣는 번호는 검증(validators)을 통과하는 형식이라 모두 검출되어야 정상.
+"""
+import io
+import random
+
+import fitz  # pymupdf
+import numpy as np
+from PIL import Image, ImageFilter
+
+_WORDS_KO = [
+    '고객', '계약서', '담당자', '주소', '연락처', '확인', '요청', '처리', '결과', '보고서',
+    '회의', '일정', '자료', '검토', '승인', '변경', '내역', '안내', '문의', '첨부',
+]
+_WORDS_EN = [
+    'customer', 'contract', 'invoice', 'total', 'amount', 'date', 'review', 'approved',
+    'service', 'account', 'payment', 'report', 'summary', 'item', 'quantity', 'price',
+]
+_NAMES = ['kim', 'lee', 'park', 'choi', 'jung', 'kang', 'cho', 'yoon']
+
+
+def _rrn(rng):
+    year = rng.randint(1950, 2019)
+    month = rng.randint(1, 12)
+    day = rng.randint(1, 28)
+    gender = rng.choice((1, 2)) if year < 2000 else rng.choice((3, 4))
+    return f"{year % 100:02d}{month:02d}{day:02d}-{gender}{rng.randint(0, 999999):06d}"
+
+
+def _mobile(rng):
+    return f"010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"
+
+
+def _phone(rng):
+    return f"02-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}"
+
+
+def _card(rng):
+    digits = [rng.randint(0, 9) for _ in range(15)]
+    total = 0
+    for i, digit in enumerate(reversed(digits)):
+        if i % 2 == 0:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    digits.append((10 - total % 10) % 10)
+    s = ''.join(map(str, digits))
+    return '-'.join(s[i:i + 4] for i in range(0, 16, 4))
+
+
+def _business_number(rng):
+    digits = [rng.randint(0, 9) for _ in range(9)]
+    total = sum(d * w for d, w in zip(digits, (1, 3, 7, 1, 3, 7, 1, 3, 5))) + digits[8] * 5 // 10
+    digits.append((10 - total % 10) % 10)
+    s = ''.join(map(str, digits))
+    return f"{s[:3]}-{s[3:5]}-{s[5:]}"
+
+
+def _passport(rng):
+    return f"M{rng.randint(10000000, 99999999)}"
+
+
+def _email(rng):
+    return f"{rng.choice(_NAMES)}{rng.randint(1, 999)}@example.com"
+
+
+PII_GENERATORS = {
+    'residentRegistrationNumber': _rrn,
+    'mobilePhoneNumber': _mobile,
+    'phoneNumber': _phone,
+    'creditCardNumber': _card,
+    'businessRegistrationNumber': _business_number,
+    'passportNumber': _passport,
+    'emailAddress': _email,
+}
+
+
+def make_pages(pages, pii_per_page=5, words_per_page=300, seed=0):
+    """
+    페이지별 텍스트 생성
+
+    Returns:
+        (페이지 텍스트 리스트, {타입: 넣은 개수})
+    """
+    rng = random.Random(seed)
+    expected = dict.fromkeys(PII_GENERATORS, 0)
+    texts = []
+
+    for _ in range(pages):
+        words = [
+            rng.choice(_WORDS_KO if rng.random() < 0.6 else _WORDS_EN)
+            for _ in range(words_per_page)
+        ]
+        for _ in range(pii_per_page):
+            pii_type = rng.choice(list(PII_GENERATORS))
+            words.insert(rng.randint(0, len(words)), PII_GENERATORS[pii_type](rng))
+            expected[pii_type] += 1
+
+        # 한 줄에 12단어씩
+        lines = [' '.join(words[i:i + 12]) for i in range(0, len(words), 12)]
+        texts.append('\n'.join(lines))
+
+    return texts, expected
+
+
+def make_table_pages(pages, rows_per_page=60, seed=0):
+    """
+    번호가 빽빽한 표(거래 내역) 모양의 페이지별 텍스트 생성
+
+    한 줄: 순번, 계좌번호(구분자 없는 10~14자리), 금액, 잔액 (금액은 쉼표가 있어 검출되지 않음)
+
+    Returns:
+        (페이지 텍스트 리스트, {타입: 넣은 개수})
+    """
+    rng = random.Random(seed)
+    texts = []
+    for page in range(pages):
+        lines = []
+        for row in range(rows_per_page):
+            account = str(rng.randint(1, 9)) + ''.join(str(rng.randint(0, 9)) for _ in range(rng.randint(9, 13)))
+            amount = rng.randint(1, 9999) * 100
+            balance = rng.randint(1, 999999) * 100
+            lines.append(f"{page * rows_per_page + row + 1} {account} {amount:,} {balance:,}")
+        texts.append('\n'.join(lines))
+    return texts, {'bankAccountNumber': pages * rows_per_page}
+
+
+def _text_page(doc, text):
+    page = doc.new_page()  # A4
+    page.insert_textbox(page.rect + (40, 40, -40, -40), text, fontname='korea', fontsize=9)
+    return page
+
+
+def text_pdf(texts):
+    """텍스트 레이어가 있는 PDF bytes"""
+    doc = fitz.open()
+    for text in texts:
+        _text_page(doc, text)
+    return doc.tobytes()
+
+
+def scanned_pdf(texts, dpi=200):
+    """텍스트 레이어 없이 페이지 이미지만 있는 PDF bytes (스캔본 흉내)"""
+    source = fitz.open()
+    doc = fitz.open()
+    zoom = dpi / 72
+    for text in texts:
+        page = _text_page(source, text)
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY)
+        scan = doc.new_page(width=page.rect.width, height=page.rect.height)
+        scan.insert_image(scan.rect, stream=pix.tobytes('png'))
+    return doc.tobytes()
+
+
+def photo(text, size=(4000, 3000), seed=0):
+    """
+    휴대폰으로 찍은 문서 사진 흉내 (JPEG bytes)
+
+    페이지를 사진 크기에 맞게 렌더링해서 살짝 기울이고 흐리게 하고 잡음을 넣는다.
+    """
+    rng = random.Random(seed)
+    doc = fitz.open()
+    page = _text_page(doc, text)
+    zoom = min(size[0] / page.rect.width, size[1] / page.rect.height) * 0.9
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+    document = Image.frombytes('RGB', [pix.width, pix.height], pix.samples)
+
+    image = Image.new('RGB', size, (90, 85, 80))
+    image.paste(document, ((size[0] - pix.width) // 2, (size[1] - pix.height) // 2))
+    image = image.rotate(rng.uniform(-2, 2), resample=Image.BICUBIC, fillcolor=(90, 85, 80))
+    image = image.filter(ImageFilter.GaussianBlur(1))
+
+    noise = np.random.default_rng(seed).normal(0, 6, (size[1], size[0], 1))
+    pixels = np.clip(np.asarray(image, dtype=np.float32) + noise, 0, 255).astype(np.uint8)
+
+    output = io.BytesIO()
+    Image.fromarray(pixels).save(output, format='JPEG', quality=88)
+    return output.getvalue()
@@ -0,0 +1,64 @@
+class Candidate:
+    """텍스트 위치를 가진 탐지 후보 (start/end는 원문 기준 오프셋, end 미포함)"""
+
+    __slots__ = ('pii_type', 'start', 'end', 'text', 'score')
+
+    def __init__(self, pii_type, start, end, text, score=0):
+        self.pii_type = pii_type
+        self.start = start
+        self.end = end
+        self.text = text
+        self.score = score
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __repr__(self):
+        return f"Candidate({self.pii_type!r}, {self.start}, {self.end}, {self.text!r}, score={self.score})"
+
+
+def resolve_overlaps(candidates, rank):
+    """
+    겹치는 후보들 중 가장 적합한 것만 남기기 (O(n log n))
+
+    시작 위치로 정렬한 뒤 서로 겹치는 후보끼리 묶고, 묶음 안에서
+    rank가 작은 순서대로 이미 고른 후보와 겹치지 않는 것만 채택한다.
+    같은 번호가 여러 타입에 걸린 경우는 범위가 같으므로 하나만 남는다.
+
+    Args:
+        candidates: [Candidate]
+        rank: 후보 → 정렬 키 (작을수록 우선)
+
+    Returns:
+        [Candidate] (위치 순)
+    """
+    selected = []
+    cluster = []
+    cluster_end = -1
+
+    for candidate in sorted(candidates, key=lambda c: (c.start, c.end)):
+        if cluster and candidate.start >= cluster_end:
+            selected.extend(_pick_from_cluster(cluster, rank))
+            cluster = []
+
+        cluster.append(candidate)
+        cluster_end = max(cluster_end, candidate.end) if len(cluster) > 1 else candidate.end
+
+    if cluster:
+        selected.extend(_pick_from_cluster(cluster, rank))
+
+    selected.sort(key=lambda c: c.start)
+    return selected
+
+
+def _pick_from_cluster(cluster, rank):
+    """겹치는 묶음 안에서 우선순위대로 서로 겹치지 않는 후보 선택"""
+    if len(cluster) == 1:
+        return cluster
+
+    picked = []
+    for candidate in sorted(cluster, key=rank):
+        if all(candidate.end <= p.start or candidate.start >= p.end for p in picked):
+            picked.append(candidate)
+
+    return picked
@@ -0,0 +1,114 @@
+import json
+import re
+from functools import lru_cache
+
+from .keyword_matcher import get_keyword_matcher
+from .safe_regex import UnsafePatternError, compile_user_pattern
+from .scanner import get_scanner
+from .validators import get_validator
+
+
+def parse_count(max_count):
+    """최대 검출 개수 (문자열이면 숫자로 변환, 잘못된 값은 0 = 무제한)"""
+    if isinstance(max_count, str):
+        try:
+            max_count = int(max_count)
+        except:
+            max_count = 0
+    return max_count
+
+
+def keyword_limits(keywords):
+    """
+    키워드 설정에서 {검색어: 최대 검출 개수} 추출 (0 = 무제한)
+
+    같은 검색어가 여러 번 있으면 더 많이 허용하는 쪽을 따른다.
+    """
+    limits = {}
+    if not isinstance(keywords, list):
+        return limits
+
+    for keyword_obj in keywords:
+        if isinstance(keyword_obj, dict):
+            keyword = keyword_obj.get('value', '')
+            max_count = parse_count(keyword_obj.get('count', 0))
+        else:
+            keyword = keyword_obj
+            max_count = 0
+
+        if not isinstance(keyword, str) or not keyword:
+            continue
+
+        if keyword in limits and (limits[keyword] == 0 or max_count == 0):
+            limits[keyword] = 0
+        else:
+            limits[keyword] = max(limits.get(keyword, 0), max_count)
+
+    return limits
+
+
+class DetectorConfig:
+    """
+    프론트 설정을 탐지에 바로 쓸 수 있게 정리한 것
+
+    여러 파일에 같은 설정을 쓸 때(배치 분석 등) 한 번만 만들어서 재사용한다.
+    PIIDetector.compile(settings)로 생성.
+    """
+
+    def __init__(self, settings, pii_types):
+        self.settings = settings
+
+        # 활성화된 타입만 모아서 한 번에 스캔
+        self.enabled_types = [
+            pii_type for pii_type in pii_types
+            if settings.get(pii_type, {}).get('enabled', True)
+        ]
+        self.scanner = get_scanner(self.enabled_types)
+
+        # 타입별 최대 검출 개수 / 예외 패턴 (패턴이 있는 타입만)
+        self.limits = {
+            pii_type: parse_count(settings.get(pii_type, {}).get('count', 0))
+            for pii_type in self.scanner.pii_types
+        }
+        # 타입별 번호 검증 (검증번호/날짜/형식, 설정에서 'validate': False면 끔)
+        self.validators = {}
+        for pii_type in self.scanner.pii_types:
+            validator = get_validator(pii_type)
+            if validator and settings.get(pii_type, {}).get('validate', True):
+                self.validators[pii_type] = validator
+        
+        # 예외 패턴은 검사 후 미리 컴파일 (잘못되었거나 위험한 패턴은 무시하고 warnings에 기록)
+        self.warnings = []
+        self.exceptions = {}
+        for pii_type in self.scanner.pii_types:
+            pattern = settings.get(pii_type, {}).get('exceptions', '')
+            if not pattern or not isinstance(pattern, str):
+                continue
+            try:
+                self.exceptions[pii_type] = compile_user_pattern(pattern)
+            except (re.error, UnsafePatternError) as e:
+                self.warnings.append(f"{pii_type} 예외 패턴을 무시했습니다: {e}")
+
+        # 키워드별 최대 검출 개수 + 한 번에 찾는 오토마타
+        self.keyword_limits = keyword_limits(settings.get('keyword', []))
+        self.keyword_matcher = (
+            get_keyword_matcher(list(self.keyword_limits)) if self.keyword_limits else None
+        )
+
+
+@lru_cache(maxsize=64)
+def _build_config(settings_key, pii_types):
+    return DetectorConfig(json.loads(settings_key), list(pii_types))
+
+
+def get_config(settings, pii_types):
+    """
+    설정별로 만든 DetectorConfig 반환 (같은 설정이면 요청이 달라도 재사용)
+
+    JSON으로 직렬화할 수 없는 설정은 캐시 없이 새로 만든다.
+    """
+    try:
+        settings_key = json.dumps(settings, sort_keys=True, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return DetectorConfig(settings, pii_types)
+    return _build_config(settings_key, tuple(pii_types))
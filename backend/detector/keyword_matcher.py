@@ -0,0 +1,103 @@
+from collections import deque
+from functools import lru_cache
+
+# 키워드가 이 개수 이하면 str.find 반복이 (C로 돌아서) 오토마타보다 빠름
+_FIND_THRESHOLD = 8
+
+
+class KeywordMatcher:
+    """
+    여러 키워드를 한 번에 찾는 Aho-Corasick 오토마타
+
+    키워드마다 텍스트를 다시 훑지 않고 한 번만 훑어서
+    모든 키워드의 모든 등장 위치(겹치는 것 포함)를 찾는다.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(keywords)
+        self._lengths = [len(k) for k in self.keywords]
+
+        self._goto = [{}]    # 상태별 다음 글자 → 상태
+        self._fail = [0]     # 실패 시 돌아갈 상태
+        self._output = [()]  # 상태에 도달하면 끝나는 키워드 번호들
+
+        if len(self.keywords) > _FIND_THRESHOLD:
+            self._build()
+
+    def _build(self):
+        goto, fail, output = self._goto, self._fail, self._output
+
+        # 1. 트라이 구성
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    fail.append(0)
+                    output.append(())
+                state = nxt
+            output[state] += (index,)
+
+        # 2. 너비 우선으로 실패 링크 연결
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                output[nxt] += output[fail[nxt]]
+
+    def find_all(self, text):
+        """
+        모든 키워드의 모든 등장 위치
+
+        Returns:
+            [(시작, 끝, 키워드 번호)] (시작 위치 순)
+        """
+        if len(self.keywords) <= _FIND_THRESHOLD:
+            return self._find_all_simple(text)
+
+        goto, fail, output, lengths = self._goto, self._fail, self._output, self._lengths
+        root = goto[0]
+        matches = []
+        state = 0
+
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0) if state else root.get(ch, 0)
+
+            if output[state]:
+                end = i + 1
+                for index in output[state]:
+                    matches.append((end - lengths[index], end, index))
+
+        matches.sort()
+        return matches
+
+    def _find_all_simple(self, text):
+        matches = []
+        for index, keyword in enumerate(self.keywords):
+            start = text.find(keyword)
+            while start != -1:
+                matches.append((start, start + len(keyword), index))
+                start = text.find(keyword, start + 1)
+
+        matches.sort()
+        return matches
+
+
+@lru_cache(maxsize=32)
+def _build_matcher(keywords):
+    return KeywordMatcher(keywords)
+
+
+def get_keyword_matcher(keywords):
+    """키워드 목록별로 만든 오토마타 반환 (캐시)"""
+    return _build_matcher(tuple(keywords))
@@ -31,19 +31,33 @@ class PIIPatterns:
     # 사업자등록번호: 123-45-67890 또는 10자리
     BUSINESS_NUMBER = r'\b\d{3}-\d{2}-\d{5}\b|\b(?<!\d)\d{10}(?!\d)\b'
     
+    # 위 패턴들이 시작할 수 있는 문자 (통합 스캔에서 빠른 1차 거름용, 패턴 추가 시 같이 수정)
+    LEADING_CHARS = r'[A-Za-z0-9._%+-]'
+    
+    # 위 패턴들이 걸릴 수 있는 토큰 시작 위치 (패턴 추가 시 같이 수정)
+    # 모든 패턴이 \b로 시작하고, 이메일 외에는 LEADING_CHARS 글자가 9자 이상 이어짐 (가장 짧은 일반전화번호 9자)
+    TOKEN_START = rf'\b(?={LEADING_CHARS}{{9}}|{LEADING_CHARS}+@)'
+    
     @classmethod
     def get_pattern(cls, pii_type):
         """타입별 패턴 반환"""
-        patterns = {
-            'residentRegistrationNumber': cls.RESIDENT_NUMBER,
-            'foreignResidentRegistrationNumber': cls.FOREIGN_NUMBER,
-            'passportNumber': cls.PASSPORT,
-            'driverLicenseNumber': cls.DRIVER_LICENSE,
-            'mobilePhoneNumber': cls.MOBILE_PHONE,
-            'phoneNumber': cls.PHONE,
-            'bankAccountNumber': cls.ACCOUNT,
-            'creditCardNumber': cls.CREDIT_CARD,
-            'emailAddress': cls.EMAIL,
-            'businessRegistrationNumber': cls.BUSINESS_NUMBER,
-        }
-        return patterns.get(pii_type)
\ No newline at end of file
+        return cls.type_patterns().get(pii_type)
+
+    @classmethod
+    def type_patterns(cls):
+        """{타입: 패턴} 전체 매핑 (클래스 속성을 그대로 참조하므로 매번 만들 필요 없음)"""
+        return _TYPE_PATTERNS
+
+
+_TYPE_PATTERNS = {
+    'residentRegistrationNumber': PIIPatterns.RESIDENT_NUMBER,
+    'foreignResidentRegistrationNumber': PIIPatterns.FOREIGN_NUMBER,
+    'passportNumber': PIIPatterns.PASSPORT,
+    'driverLicenseNumber': PIIPatterns.DRIVER_LICENSE,
+    'mobilePhoneNumber': PIIPatterns.MOBILE_PHONE,
+    'phoneNumber': PIIPatterns.PHONE,
+    'bankAccountNumber': PIIPatterns.ACCOUNT,
+    'creditCardNumber': PIIPatterns.CREDIT_CARD,
+    'emailAddress': PIIPatterns.EMAIL,
+    'businessRegistrationNumber': PIIPatterns.BUSINESS_NUMBER,
+}
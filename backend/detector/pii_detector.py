@@ -1,5 +1,9 @@
-import re
+import time
+from metrics import observe_stage, timed
 from .patterns import PIIPatterns
+from .candidates import resolve_overlaps
+from .config import DetectorConfig, get_config
+from .safe_regex import TimeBudget
 
 class PIIDetector:
     """민감정보 탐지기 (개선 버전)"""
@@ -7,6 +11,16 @@ class PIIDetector:
     def __init__(self):
         self.patterns = PIIPatterns()
         
+        # 탐지 대상 타입 (결과 순서)
+        self.pii_types = [
+            'residentRegistrationNumber', 'foreignResidentRegistrationNumber', 
+            'passportNumber', 'driverLicenseNumber',
+            'mobilePhoneNumber', 'phoneNumber',
+            'bankAccountNumber', 'creditCardNumber', 
+            'emailAddress', 'businessRegistrationNumber',
+            'corporateRegistrationNumber'
+        ]
+        
         # 우선순위 정의 (낮을수록 우선)
         self.priority = {
             'residentRegistrationNumber': 1,
@@ -22,17 +36,26 @@ class PIIDetector:
             'emailAddress': 7,
         }
     
+    def compile(self, settings=None):
+        """설정을 DetectorConfig로 정리 (같은 설정이면 캐시된 것을 재사용)"""
+        if isinstance(settings, DetectorConfig):
+            return settings
+        if not settings:
+            settings = self._get_default_settings()
+        return get_config(settings, self.pii_types)
+    
     def detect(self, text, settings=None):
         """
         텍스트에서 민감정보 탐지
         
         Args:
             text: OCR로 추출한 텍스트
-            settings: 프론트에서 보낸 설정
+            settings: 프론트에서 보낸 설정 (또는 compile()로 만든 DetectorConfig)
                 {
                     'emailAddress': {
                         'enabled': True,
                         'count': 3,  # 최대 검출 개수 (0 = 무제한)
+                        'validate': True,  # 검증번호/형식 검사 (기본 True)
                         'exceptions': '정규식'  # 예외 패턴
                     },
                     'keyword': ['검색어1', '검색어2']
@@ -41,93 +64,179 @@ class PIIDetector:
         Returns:
             dict: 탐지 결과
         """
-        if not settings:
-            settings = self._get_default_settings()
+        return self._detect_pages([text], settings)[0]
+    
+    def detect_pages(self, pages, settings=None, stop_early=False):
+        """
+        페이지 텍스트를 하나씩 받아 가며 탐지 (OCREngine.iter_pages를 그대로 넘기면 됨)
         
-        # 1단계: 모든 후보 수집
-        all_candidates = {}  # {번호: [타입들]}
+        stop_early=True면 남은 페이지를 읽지 않고 멈춘다.
+        - 활성화된 모든 타입/키워드가 최대 검출 개수(count)를 채운 경우 (더 읽어도 결과 동일)
+        - 지금까지 검출된 것만으로 '민감' 분류가 확정된 경우 (결과는 읽은 페이지까지만 반영)
+        멈추면 페이지 제너레이터를 close()해서 남은 페이지의 OCR도 하지 않는다.
         
-        pii_types = [
-            'residentRegistrationNumber', 'foreignResidentRegistrationNumber', 
-            'passportNumber', 'driverLicenseNumber',
-            'mobilePhoneNumber', 'phoneNumber',
-            'bankAccountNumber', 'creditCardNumber', 
-            'emailAddress', 'businessRegistrationNumber',
-            'corporateRegistrationNumber'
-        ]
+        Returns:
+            dict: detect 결과 + pages_scanned(읽은 페이지 수), stopped_early
+        """
+        result, pages_scanned, stopped_early = self._detect_pages(pages, settings, stop_early)
+        result['pages_scanned'] = pages_scanned
+        result['stopped_early'] = stopped_early
+        return result
+    
+    def _detect_pages(self, pages, settings, stop_early=False):
+        """
+        페이지별 후보 수집 → 결과 생성
         
-        for pii_type in pii_types:
-            # 설정 가져오기
-            type_setting = settings.get(pii_type, {})
-            
-            # 활성화 여부 확인
-            if not type_setting.get('enabled', True):
-                continue
-            
-            # 패턴으로 검출
-            pattern = self.patterns.get_pattern(pii_type)
-            if pattern:
-                matches = re.findall(pattern, text)
+        페이지는 ' '로 이어 붙인 텍스트 기준 위치로 기록한다.
+        (패턴에 공백이 없으므로 페이지 경계에 걸치는 매칭은 없어서
+         페이지마다 따로 스캔해도 전체를 한 번에 스캔한 것과 결과가 같음)
+        
+        Returns:
+            (결과 dict, 읽은 페이지 수, 중간에 멈췄는지)
+        """
+        config = self.compile(settings)
+        
+        # 타입별로 지금까지 채택된 개수 (페이지를 넘어가며 누적)
+        counts = dict.fromkeys(config.scanner.pii_types, 0)
+        
+        # 키워드별로 지금까지 검출된 개수
+        keyword_counts = dict.fromkeys(config.keyword_limits, 0)
+        
+        # 예외 패턴 검사 시간 (문서 전체 누적)
+        budget = TimeBudget()
+        
+        all_candidates = []  # [Candidate]
+        all_keywords = []    # [(시작, 끝, 키워드)]
+        pages_read = 0       # 페이지 텍스트는 다 쓰면 버림 (큰 문서도 전체 텍스트를 들고 있지 않도록)
+        offset = 0
+        stopped_early = False
+        
+        page_iter = iter(pages)
+        try:
+            for page_text in page_iter:
+                # 1~2단계: 후보 수집 + 겹치는 후보 정리 (원문 위치 포함)
+                candidates = self._collect_candidates(page_text, config, counts, budget)
+                for candidate in candidates:
+                    candidate.start += offset
+                    candidate.end += offset
+                all_candidates.extend(candidates)
                 
-                # 예외 패턴 적용
-                exception_pattern = type_setting.get('exceptions', '')
-                filtered_matches = []
+                # 3단계: 키워드 검출
+                with timed('detect_keywords'):
+                    for start, end, keyword in self._detect_keywords(page_text, config, keyword_counts):
+                        all_keywords.append((start + offset, end + offset, keyword))
                 
-                for match in matches:
-                    # 마스킹 데이터 제외
-                    if '*' in match:
-                        continue
-                    
-                    # 예외 패턴 체크
-                    if exception_pattern and self._is_exception(match, exception_pattern):
-                        continue
-                    
-                    filtered_matches.append(match)
+                pages_read += 1
+                offset += len(page_text) + 1
                 
-                # 개수 제한 적용
-                max_count = type_setting.get('count', 0)
+                if not stop_early:
+                    continue
                 
-                # 문자열이면 숫자로 변환
-                if isinstance(max_count, str):
-                    try:
-                        max_count = int(max_count)
-                    except:
-                        max_count = 0
-
-                if max_count > 0:
-                    filtered_matches = filtered_matches[:max_count]
+                # 모든 타입/키워드가 최대 개수를 채움
+                all_capped = all(
+                    limit > 0 and counts[pii_type] >= limit
+                    for pii_type, limit in config.limits.items()
+                ) and all(
+                    limit > 0 and keyword_counts[keyword] >= limit
+                    for keyword, limit in config.keyword_limits.items()
+                )
+                # 지금까지 개수만으로 '민감' 확정
+                sensitive = self._classify(len(all_candidates) + len(all_keywords), None) == '민감'
                 
-                # 후보에 추가
-                for match in filtered_matches:
-                    if match not in all_candidates:
-                        all_candidates[match] = []
-                    all_candidates[match].append(pii_type)
-        
-        # 2단계: 중복 제거 (가장 적합한 타입만 선택)
-        detected_items = self._remove_duplicates(all_candidates)
-        
-        # 3단계: 키워드 검출
-        keywords = settings.get('keyword', [])
-        if keywords:
-            keyword_matches = self._detect_keywords(text, keywords)
-            if keyword_matches:
-                detected_items['keyword'] = keyword_matches
+                if all_capped or sensitive:
+                    stopped_early = True
+                    break
+        finally:
+            # 제너레이터면 닫아서 남은 페이지 처리 중단
+            close = getattr(page_iter, 'close', None)
+            if close:
+                close()
+        
+        with timed('detect_result'):
+            result = self._build_result(all_candidates, all_keywords)
+        
+        warnings = list(config.warnings)
+        if budget.exhausted:
+            warnings.append("예외 패턴 검사 시간이 초과되어 일부 검출 항목은 예외 패턴을 적용하지 않았습니다")
+        if warnings:
+            result['warnings'] = warnings
+        
+        return result, pages_read, stopped_early
+    
+    def _collect_candidates(self, text, config, counts, budget):
+        """
+        텍스트 한 덩어리(페이지)에서 후보 수집
+        
+        타입별로 마스킹 데이터/검증 실패/예외 패턴을 거르고, counts에 누적된 개수 기준으로
+        최대 검출 개수를 적용한 뒤 겹치는 후보를 정리한다.
+        예외 패턴 검사 시간은 budget에 누적된다.
+        
+        Returns:
+            [Candidate] (text 기준 위치)
+        """
+        started = time.perf_counter()
+        candidates = []
+        
+        for candidate in config.scanner.scan(text):
+            pii_type = candidate.pii_type
+            
+            # 개수 제한 적용
+            if 0 < config.limits[pii_type] <= counts[pii_type]:
+                continue
+            
+            # 마스킹 데이터 제외
+            if '*' in candidate.text:
+                continue
+            
+            # 검증번호/형식이 맞지 않는 번호 제외
+            validator = config.validators.get(pii_type)
+            if validator and not validator(candidate.text):
+                continue
+            
+            # 예외 패턴 체크
+            exception_pattern = config.exceptions.get(pii_type)
+            if exception_pattern and self._is_exception(candidate.text, exception_pattern, budget):
+                continue
+            
+            counts[pii_type] += 1
+            candidates.append(candidate)
+        
+        observe_stage('detect_scan', time.perf_counter() - started)
+        
+        # 겹치는 후보 정리 (영역마다 가장 적합한 타입만 선택)
+        with timed('detect_dedupe'):
+            return self._resolve_overlaps(candidates)
+    
+    def _build_result(self, candidates, keyword_matches):
+        """정리된 후보 + 키워드 검출 결과로 최종 결과 생성"""
+        detected_items = {}
+        for pii_type in self.pii_types:
+            items = [c for c in candidates if c.pii_type == pii_type]
+            if items:
+                detected_items[pii_type] = items
+        
+        if keyword_matches:
+            detected_items['keyword'] = keyword_matches
         
         # 4단계: 마스킹 처리
         for pii_type, items in detected_items.items():
             if pii_type == 'keyword':
                 # 키워드는 마스킹 안 함
+                found = [keyword for _, _, keyword in items]
                 detected_items[pii_type] = {
                     'count': len(items),
-                    'items': items,
-                    'raw': items
+                    'items': found,
+                    'raw': found,
+                    'positions': [[start, end] for start, end, _ in items]
                 }
             else:
-                masked = [self._mask(item, pii_type) for item in items]
+                raw = [item.text for item in items]
+                masked = [self._mask(item, pii_type) for item in raw]
                 detected_items[pii_type] = {
                     'count': len(items),
                     'items': masked,
-                    'raw': items
+                    'raw': raw,
+                    'positions': [[item.start, item.end] for item in items]
                 }
         
         total_count = sum(d['count'] for d in detected_items.values())
@@ -143,13 +252,14 @@ class PIIDetector:
             'detected_items': detected_items
         }
     
-    def _is_exception(self, text, exception_pattern):
+    def _is_exception(self, text, exception_pattern, budget):
         """
         예외 패턴 체크
         
         Args:
             text: 검출된 텍스트
-            exception_pattern: 예외 정규식
+            exception_pattern: 컴파일된 예외 정규식 (DetectorConfig.exceptions)
+            budget: TimeBudget (다 썼으면 예외 아님으로 처리)
         
         Returns:
             True if 예외에 해당, False otherwise
@@ -157,92 +267,57 @@ class PIIDetector:
         if not exception_pattern:
             return False
         
-        try:
-            return bool(re.search(exception_pattern, text))
-        except re.error:
-            # 잘못된 정규식이면 무시
-            return False
+        return bool(budget.search(exception_pattern, text))
     
-    def _detect_keywords(self, text, keywords):
-        found = []
-        
-        if not isinstance(keywords, list):
-            return found
-        
-        for keyword_obj in keywords:
-            if isinstance(keyword_obj, dict):
-                keyword = keyword_obj.get('value', '')
-                max_count = keyword_obj.get('count', 0)
-                
-                if isinstance(max_count, str):
-                    try:
-                        max_count = int(max_count)
-                    except:
-                        max_count = 0
-                
-                if keyword and keyword in text:
-                    # ✅ 전체 found 길이가 아닌, 해당 키워드가 이미 found에 몇 개 있는지 체크
-                    keyword_count = found.count(keyword)
-                    if max_count == 0 or keyword_count < max_count:
-                        found.append(keyword)
-            
-            elif isinstance(keyword_obj, str) and keyword_obj and keyword_obj in text:
-                found.append(keyword_obj)
-        
-        return found
-
-
-    def _remove_duplicates(self, candidates):
+    def _detect_keywords(self, text, config, counts):
         """
-        중복 제거: 같은 번호가 여러 타입에 걸릴 때 가장 적합한 것만 선택
+        키워드 검출 (키워드 수와 상관없이 텍스트를 한 번만 훑음)
         
-        Args:
-            candidates: {번호: [타입들]}
+        키워드마다 counts에 누적된 개수 기준으로 최대 검출 개수를 적용한다.
         
         Returns:
-            {타입: [번호들]}
+            [(시작, 끝, 키워드)] (text 기준 위치)
         """
-        result = {}
+        found = []
+        if not config.keyword_matcher:
+            return found
         
-        for number, types in candidates.items():
-            if len(types) == 1:
-                # 중복 없으면 그대로
-                pii_type = types[0]
-            else:
-                # 중복 있으면 가장 적합한 타입 선택
-                pii_type = self._select_best_type(number, types)
-            
-            if pii_type not in result:
-                result[pii_type] = []
-            result[pii_type].append(number)
+        keywords = config.keyword_matcher.keywords
+        for start, end, index in config.keyword_matcher.find_all(text):
+            keyword = keywords[index]
+            max_count = config.keyword_limits[keyword]
+            if max_count > 0 and counts[keyword] >= max_count:
+                continue
+            counts[keyword] += 1
+            found.append((start, end, keyword))
         
-        return result
+        return found
     
-    def _select_best_type(self, number, types):
+    def _resolve_overlaps(self, candidates):
         """
-        같은 번호가 여러 타입에 걸릴 때 가장 적합한 타입 선택
+        겹치는 후보 정리: 같은 영역에 여러 후보가 걸리면 가장 적합한 것만 선택
+        
+        더 긴 매칭 → 신뢰도 점수 → 타입 우선순위 순으로 고른다.
+        (같은 번호가 여러 타입에 걸린 경우는 길이가 같으므로 점수/우선순위로 결정)
         
         Args:
-            number: 검출된 번호
-            types: 매칭된 타입들
+            candidates: [Candidate]
         
         Returns:
-            가장 적합한 타입
+            [Candidate] (위치 순)
         """
-        # 각 타입별 점수 계산
-        scores = {}
-        for pii_type in types:
-            scores[pii_type] = self._calculate_confidence(number, pii_type)
-        
-        # 점수 같으면 우선순위로
-        max_score = max(scores.values())
-        candidates = [t for t, s in scores.items() if s == max_score]
-        
-        if len(candidates) == 1:
-            return candidates[0]
-        
-        # 우선순위 높은 것 선택
-        return min(candidates, key=lambda t: self.priority.get(t, 99))
+        for candidate in candidates:
+            candidate.score = self._calculate_confidence(candidate.text, candidate.pii_type)
+        
+        def rank(candidate):
+            return (
+                -len(candidate),
+                -candidate.score,
+                self.priority.get(candidate.pii_type, 99),
+                candidate.start
+            )
+        
+        return resolve_overlaps(candidates, rank)
     
 
     def _calculate_confidence(self, number, pii_type):
@@ -0,0 +1,217 @@
+import re
+import time
+
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # Python 3.10 이하
+    import sre_constants
+    import sre_parse
+
+try:
+    import regex
+except ImportError:  # 선택 설치 (pip install regex), 없으면 검사 시간을 끊을 수 없음
+    regex = None
+
+# 사용자 예외 패턴 최대 길이
+MAX_PATTERN_LENGTH = 200
+
+# 한 번의 탐지에서 예외 패턴 검사에 쓸 수 있는 최대 시간(초), 넘으면 나머지는 검사 안 함
+DEFAULT_TIME_BUDGET = 0.2
+
+# 반복 횟수가 이보다 크면 무제한(*, +)처럼 취급
+_LARGE_REPEAT = 16
+
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+_BACKREFS = (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS)
+
+# 반복 문맥: 반복(최대 2회 이상) 안인지, 그 반복이 큰 반복인지
+_BOUNDED = 'bounded'
+_LARGE = 'large'
+
+# 이어진 반복 두 개가 같은 글자를 받을 수 있는지 확인해 보는 글자들
+_PROBE_CHARS = ''.join(chr(c) for c in range(32, 127)) + '\t\n가é０'
+
+_CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: r'\d',
+    sre_constants.CATEGORY_NOT_DIGIT: r'\D',
+    sre_constants.CATEGORY_SPACE: r'\s',
+    sre_constants.CATEGORY_NOT_SPACE: r'\S',
+    sre_constants.CATEGORY_WORD: r'\w',
+    sre_constants.CATEGORY_NOT_WORD: r'\W',
+}
+
+
+class UnsafePatternError(ValueError):
+    """백트래킹이 폭발할 수 있는 정규식"""
+
+
+def compile_user_pattern(pattern):
+    """
+    사용자가 입력한 정규식을 검사 후 컴파일
+
+    잘못된 정규식이나 (a+)+, ((a*){1,10}){1,10}, a*a*, (a|aa)*, \\1 처럼 입력 길이에 따라
+    검사 시간이 기하급수적으로 늘 수 있는 구조는 받지 않는다.
+    regex 모듈이 설치돼 있으면 그 엔진으로 컴파일해서 검사 하나하나에 시간 제한을 건다. (TimeBudget)
+
+    Raises:
+        re.error: 문법 오류
+        UnsafePatternError: 위험한 구조
+    """
+    if len(pattern) > MAX_PATTERN_LENGTH:
+        raise UnsafePatternError(f"패턴이 너무 깁니다 (최대 {MAX_PATTERN_LENGTH}자)")
+
+    _check(sre_parse.parse(pattern), repeat=None)
+    if regex is None:
+        return re.compile(pattern)
+    try:
+        return regex.compile(pattern)
+    except regex.error as e:
+        raise re.error(str(e)) from None
+
+
+def _is_large(max_repeat):
+    return max_repeat == sre_constants.MAXREPEAT or max_repeat > _LARGE_REPEAT
+
+
+def _check(subpattern, repeat):
+    """
+    패턴 구조를 따라가며 위험한 구조를 찾음
+
+    repeat: 바깥 반복 문맥 (None, _BOUNDED: 최대 2회 이상 반복 안, _LARGE: 큰 반복 안)
+    - 반복 안의 큰 반복 (바깥 반복이 작아도 경우의 수가 곱해짐)
+    - 반복 안에서 빈 문자열도 되는 가변 반복, 큰 반복 안의 가변 반복
+    - 같은 글자를 받는 큰 반복이 바로 이어진 것 (\\d*\\d*)
+    - 큰 반복 안의 | 분기, 역참조
+    """
+    _check_adjacent(subpattern)
+    for op, av in subpattern:
+        if op in _REPEATS:
+            min_repeat, max_repeat, body = av
+            if max_repeat <= 1:
+                _check(body, repeat)
+                continue
+            large = _is_large(max_repeat)
+            variable = min_repeat != max_repeat
+            if repeat and large:
+                raise UnsafePatternError("반복 안에 다시 반복이 중첩된 패턴은 사용할 수 없습니다")
+            if repeat and variable and (repeat == _LARGE or min_repeat == 0):
+                raise UnsafePatternError("반복 안에 다시 반복이 중첩된 패턴은 사용할 수 없습니다")
+            _check(body, _LARGE if large or repeat == _LARGE else _BOUNDED)
+
+        elif op == sre_constants.BRANCH:
+            if repeat == _LARGE:
+                raise UnsafePatternError("반복되는 그룹 안의 | 분기는 사용할 수 없습니다")
+            for branch in av[1]:
+                _check(branch, repeat)
+
+        elif op in _BACKREFS:
+            raise UnsafePatternError("역참조(\\1 등)는 사용할 수 없습니다")
+
+        elif op == sre_constants.SUBPATTERN:
+            _check(av[-1], repeat)
+
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            _check(av[1], repeat)
+
+        elif op == getattr(sre_constants, 'ATOMIC_GROUP', None):
+            # 원자 그룹은 되돌아가지 않으므로 안쪽만 확인
+            _check(av, None)
+
+
+def _check_adjacent(subpattern):
+    """바로 이어진 큰 반복 두 개가 같은 글자를 받을 수 있으면 거부 (글자를 나눠 갖는 경우의 수가 많음)"""
+    previous = None
+    for item in subpattern:
+        item = _unwrap(item)
+        op, av = item
+        if op in _REPEATS and _is_large(av[1]):
+            if previous is not None and _overlaps(previous, av[2]):
+                raise UnsafePatternError("같은 글자를 받는 반복을 이어 쓸 수 없습니다 (예: \\d*\\d*)")
+            previous = av[2]
+        else:
+            previous = None
+
+
+def _unwrap(item):
+    """글자 하나짜리 그룹 (\\d*)은 안쪽 항목으로"""
+    while item[0] == sre_constants.SUBPATTERN and len(item[1][-1]) == 1:
+        item = item[1][-1][0]
+    return item
+
+
+def _overlaps(body_a, body_b):
+    """두 반복 대상이 같은 글자를 받을 수 있는지 (글자 하나짜리가 아니면 그렇다고 봄)"""
+    test_a = _char_test(body_a)
+    test_b = _char_test(body_b)
+    if test_a is None or test_b is None:
+        return True
+    return any(test_a(c) and test_b(c) for c in _PROBE_CHARS)
+
+
+def _char_test(body):
+    """글자 하나를 받는 반복 대상이면 그 글자를 받는지 확인하는 함수, 아니면 None"""
+    if len(body) != 1:
+        return None
+    op, av = _unwrap(body[0])
+    if op == sre_constants.LITERAL:
+        return lambda c: ord(c) == av
+    if op == sre_constants.NOT_LITERAL:
+        return lambda c: ord(c) != av
+    if op == sre_constants.ANY:
+        return lambda c: c != '\n'
+    if op == sre_constants.IN:
+        return lambda c: _in_class(av, c)
+    return None
+
+
+def _in_class(items, c):
+    """[...] 글자 집합에 c가 들어가는지"""
+    negate = False
+    found = False
+    for op, av in items:
+        if op == sre_constants.NEGATE:
+            negate = True
+        elif op == sre_constants.LITERAL:
+            found = found or ord(c) == av
+        elif op == sre_constants.RANGE:
+            found = found or av[0] <= ord(c) <= av[1]
+        elif op == sre_constants.CATEGORY:
+            category = _CATEGORIES.get(av)
+            found = found or category is None or bool(re.fullmatch(category, c))
+        else:
+            found = True
+    return found != negate
+
+
+class TimeBudget:
+    """
+    탐지 한 번 동안 예외 패턴 검사에 쓴 시간 누적
+
+    누적 시간이 예산을 넘으면 그 뒤의 검사를 건너뛴다 (검출 결과는 그대로 유지).
+    regex 모듈로 컴파일한 패턴은 남은 예산을 timeout으로 넘겨 검사 도중에도 끊는다.
+    (re 모듈 패턴은 검사 하나를 중간에 멈출 수 없어서 compile_user_pattern의 구조 검사에만 의존)
+    """
+
+    def __init__(self, seconds=DEFAULT_TIME_BUDGET):
+        self.seconds = seconds
+        self.spent = 0.0
+        self.exhausted = False
+
+    def search(self, pattern, text):
+        """예산 안에서 pattern.search (예산을 다 썼으면 None)"""
+        if self.exhausted:
+            return None
+
+        started = time.perf_counter()
+        try:
+            if isinstance(pattern, re.Pattern):
+                return pattern.search(text)
+            return pattern.search(text, timeout=max(self.seconds - self.spent, 0.001))
+        except TimeoutError:
+            self.exhausted = True
+            return None
+        finally:
+            self.spent += time.perf_counter() - started
+            if self.spent > self.seconds:
+                self.exhausted = True
@@ -0,0 +1,120 @@
+import re
+from functools import lru_cache
+from .candidates import Candidate
+from .patterns import PIIPatterns
+
+# 글자당 후보 토큰(TOKEN_START) 수가 이보다 많은 텍스트(번호만 늘어선 표 등)는 타입별 정규식으로 훑음
+# (거의 모든 토큰이 관문을 통과하면 관문 + 타입별 전방탐색을 모두 도는 통합 스캔이 더 느림)
+CANDIDATE_DENSITY_THRESHOLD = 1 / 20
+
+# 후보 토큰 밀도를 잴 때 뽑아 보는 구간 (긴 텍스트는 고르게 떨어진 구간 몇 개로 추정)
+_SAMPLE_WINDOW = 1024
+_SAMPLE_WINDOWS = 4
+
+
+class PatternScanner:
+    """
+    활성화된 타입의 패턴을 하나의 정규식으로 합쳐 텍스트를 한 번만 훑는 스캐너
+
+    타입마다 re.findall을 돌리면 텍스트를 타입 수만큼 반복해서 읽게 되므로,
+    각 패턴을 이름 붙은 그룹의 전방탐색(lookahead)으로 묶어 한 번의 finditer로
+    같은 위치에서 걸리는 모든 타입을 동시에 확인한다.
+    (같은 번호가 여러 타입에 걸려야 _select_best_type이 고를 수 있으므로
+     단순 alternation처럼 첫 번째 타입만 잡히면 안 됨)
+
+    관문 앞에서 패턴이 시작할 수 없는 위치(토큰 중간, 짧은 숫자/단어)는 싼 조건(TOKEN_START)으로
+    먼저 걸러서 후보 토큰 시작 위치에서만 관문을 확인한다.
+    번호만 빽빽한 텍스트는 토큰 대부분이 후보라 관문이 오히려 일을 늘리므로
+    타입별로 컴파일한 정규식의 finditer로 바꿔 훑는다. (CANDIDATE_DENSITY_THRESHOLD)
+    """
+
+    def __init__(self, pii_types):
+        self.pii_types = tuple(t for t in pii_types if PIIPatterns.get_pattern(t))
+        self.regex = None
+        self.group_index = ()
+        self.type_regexes = ()
+        self.token_start = re.compile(PIIPatterns.TOKEN_START)
+
+        if not self.pii_types:
+            return
+
+        patterns = [PIIPatterns.get_pattern(t) for t in self.pii_types]
+        self.type_regexes = tuple((t, re.compile(p)) for t, p in zip(self.pii_types, patterns))
+
+        # 어느 하나라도 걸리는 위치에서만 멈추도록 하는 관문
+        # (한글/공백, 토큰 중간, 짧은 토큰은 TOKEN_START에서 바로 탈락)
+        gate = '|'.join(f'(?:{p})' for p in patterns)
+
+        # 관문을 통과한 위치에서 타입별로 매칭 범위를 기록
+        probes = ''.join(
+            f'(?:(?=(?P<{t}>{p})))?' for t, p in zip(self.pii_types, patterns)
+        )
+
+        self.regex = re.compile(f'{PIIPatterns.TOKEN_START}(?=(?:{gate})){probes}')
+        self.group_index = tuple(
+            (t, self.regex.groupindex[t]) for t in self.pii_types
+        )
+
+    def scan(self, text):
+        """
+        텍스트를 한 번 훑어서 모든 후보 반환
+
+        타입별로는 re.findall과 같은 결과가 나오도록 같은 타입끼리 겹치는
+        매칭은 건너뛴다.
+
+        Returns:
+            [Candidate] (위치 순)
+        """
+        if self.regex is None or not text:
+            return []
+
+        if self._candidate_density(text) > CANDIDATE_DENSITY_THRESHOLD:
+            return self._scan_per_type(text)
+
+        candidates = []
+        last_end = dict.fromkeys(self.pii_types, 0)
+
+        for match in self.regex.finditer(text):
+            for pii_type, index in self.group_index:
+                start, end = match.span(index)
+                if start < 0 or start < last_end[pii_type]:
+                    continue
+
+                last_end[pii_type] = end
+                candidates.append(Candidate(pii_type, start, end, text[start:end]))
+
+        return candidates
+
+    def _scan_per_type(self, text):
+        """타입마다 finditer로 훑기 (scan과 같은 결과, 같은 위치면 타입 순서대로)"""
+        candidates = [
+            Candidate(pii_type, match.start(), match.end(), match.group())
+            for pii_type, regex in self.type_regexes
+            for match in regex.finditer(text)
+        ]
+        candidates.sort(key=lambda c: c.start)
+        return candidates
+
+    def _candidate_density(self, text):
+        """글자당 후보 토큰 시작 위치 수 (긴 텍스트는 고르게 떨어진 구간 몇 개로 추정)"""
+        if len(text) <= _SAMPLE_WINDOW * _SAMPLE_WINDOWS:
+            windows = [text]
+        else:
+            step = (len(text) - _SAMPLE_WINDOW) // (_SAMPLE_WINDOWS - 1)
+            windows = [text[i * step:i * step + _SAMPLE_WINDOW] for i in range(_SAMPLE_WINDOWS)]
+        hits = sum(len(self.token_start.findall(window)) for window in windows)
+        return hits / sum(len(window) for window in windows)
+
+
+# 타입 순서는 패턴 정의 순서로 고정 (캐시 키와 결과 순서를 일정하게 유지)
+_TYPE_ORDER = {t: i for i, t in enumerate(PIIPatterns.type_patterns())}
+
+
+@lru_cache(maxsize=64)
+def _build_scanner(pii_types):
+    return PatternScanner(sorted(pii_types, key=lambda t: _TYPE_ORDER.get(t, len(_TYPE_ORDER))))
+
+
+def get_scanner(pii_types):
+    """활성화된 타입 집합별로 컴파일된 스캐너 반환 (캐시)"""
+    return _build_scanner(frozenset(pii_types))
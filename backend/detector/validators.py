@@ -0,0 +1,103 @@
+from datetime import date
+
+# {타입: 검증 함수} - 검증 함수는 매칭된 원문을 받아 진짜 번호일 수 있으면 True
+_VALIDATORS = {}
+
+
+def register(pii_type):
+    """검증 함수 등록 데코레이터 (타입당 하나, 다시 등록하면 교체)"""
+    def decorator(fn):
+        _VALIDATORS[pii_type] = fn
+        return fn
+    return decorator
+
+
+def get_validator(pii_type):
+    """타입별 검증 함수 (없으면 None)"""
+    return _VALIDATORS.get(pii_type)
+
+
+def _digits(text):
+    return [int(ch) for ch in text if ch.isdigit()]
+
+
+def _valid_birth_date(digits, century):
+    """주민/외국인등록번호 앞 6자리(YYMMDD)가 실제 날짜인지"""
+    year = century + digits[0] * 10 + digits[1]
+    month = digits[2] * 10 + digits[3]
+    day = digits[4] * 10 + digits[5]
+    try:
+        date(year, month, day)
+    except ValueError:
+        return False
+    return True
+
+
+# 주민/외국인등록번호 7번째 자리 → 출생 세기
+_CENTURY = {
+    1: 1900, 2: 1900, 3: 2000, 4: 2000,
+    5: 1900, 6: 1900, 7: 2000, 8: 2000,
+}
+
+
+@register('residentRegistrationNumber')
+@register('foreignResidentRegistrationNumber')
+def validate_registration_number(text):
+    """
+    주민/외국인등록번호: 생년월일이 실제 날짜인지
+
+    2020년 10월 이후 발급된 번호는 뒷자리가 임의 번호라 검증번호(마지막 자리)가
+    맞지 않으므로 검증번호는 확인하지 않는다.
+    """
+    digits = _digits(text)
+    if len(digits) != 13:
+        return False
+
+    century = _CENTURY.get(digits[6])
+    if century is None:
+        return False
+    return _valid_birth_date(digits, century)
+
+
+@register('creditCardNumber')
+def validate_credit_card(text):
+    """신용카드: Luhn 검사"""
+    digits = _digits(text)
+    if not 13 <= len(digits) <= 19:
+        return False
+
+    total = 0
+    for i, digit in enumerate(reversed(digits)):
+        if i % 2 == 1:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+
+_BUSINESS_WEIGHTS = (1, 3, 7, 1, 3, 7, 1, 3, 5)
+
+
+@register('businessRegistrationNumber')
+def validate_business_number(text):
+    """사업자등록번호: 가중치 1,3,7,1,3,7,1,3,5 검증번호"""
+    digits = _digits(text)
+    if len(digits) != 10:
+        return False
+
+    total = sum(d * w for d, w in zip(digits, _BUSINESS_WEIGHTS))
+    total += digits[8] * 5 // 10
+    return (10 - total % 10) % 10 == digits[9]
+
+
+# 여권 종류 첫 글자 (M: 복수, S: 단수, R: 거주, O: 관용, D: 외교관, G: 긴급 등)
+_PASSPORT_TYPES = frozenset('MSRODG')
+
+
+@register('passportNumber')
+def validate_passport(text):
+    """여권번호: 여권 종류 글자 + 8자리 숫자 (숫자가 전부 0이면 제외)"""
+    if len(text) != 9 or text[0] not in _PASSPORT_TYPES:
+        return False
+    return text[1:].isdigit() and text[1:] != '00000000'
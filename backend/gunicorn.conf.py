@@ -0,0 +1,42 @@
+"""
+gunicorn 설정 (backend 폴더에서 `gunicorn wsgi:app` 실행 시 자동으로 읽음)
+
+프로세스 구성 (따로 정하지 않으면 코어 수에 맞춤)
+- 마스터: OCR 모델을 한 번 올린 뒤 fork (preload_app, copy-on-write로 모델 메모리 공유)
+- 웹 워커 WEB_WORKERS개 (기본 1): 요청마다 스레드 하나 (gthread, WEB_THREADS개)
+- 웹 워커마다 OCR 워커 프로세스 OCR_WORKERS개 (기본: 코어 수 / 2 / 웹 워커 수)
+  OCR 워커 하나는 torch 스레드 OCR_TORCH_THREADS개 (기본: 코어 수 / 전체 OCR 워커 수)
+
+/api/jobs 작업 결과는 웹 워커 메모리에 있으므로 WEB_WORKERS를 늘리면 조회가 다른 워커로
+가서 404가 날 수 있다. 보통은 웹 워커 1개 + OCR 워커 여러 개로 코어를 채운다.
+"""
+import os
+
+cpu_count = os.cpu_count() or 1
+
+workers = int(os.environ.get('WEB_WORKERS', '1'))
+
+# 여기서 정한 기본값을 wsgi.py의 Settings.from_env()가 읽음
+os.environ.setdefault('OCR_WORKERS', str(max(1, cpu_count // 2 // workers)))
+ocr_workers = int(os.environ['OCR_WORKERS'])
+os.environ.setdefault('OCR_TORCH_THREADS', str(max(1, cpu_count // (workers * max(1, ocr_workers)))))
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '5000')}"
+worker_class = 'gthread'
+# OCR 워커 수 + 대기열(× 2)만큼 요청을 받고, 헬스 체크 / 작업 조회용으로 몇 개 더
+threads = int(os.environ.get('WEB_THREADS', str(max(1, ocr_workers) * 3 + 4)))
+# 큰 스캔 PDF는 몇 분 걸릴 수 있음 (기본 30초면 처리 중인 워커가 재시작됨)
+timeout = int(os.environ.get('WEB_TIMEOUT', '300'))
+graceful_timeout = 30
+preload_app = True
+
+
+def post_fork(server, worker):
+    """
+    웹 워커가 요청 스레드를 띄우기 전에 OCR 준비
+    (미리 올린 Reader를 쓰도록 스레드 수를 정하거나, 그 Reader를 물려받는 OCR 워커 풀을 fork)
+    """
+    from app import get_services
+    from wsgi import app
+
+    get_services(app).ocr_engine.load()
@@ -0,0 +1,141 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobQueueFullError(RuntimeError):
+    """대기 중인 작업이 너무 많아서 새 작업을 받을 수 없을 때"""
+
+
+class Job:
+    """백그라운드 분석 작업 상태"""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.status = Job.QUEUED
+        self.pages_done = 0
+        self.pages_total = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    def update_progress(self, done, total):
+        """OCREngine progress 콜백"""
+        self.pages_done = done
+        self.pages_total = total
+
+    def to_dict(self):
+        data = {
+            'job_id': self.id,
+            'status': self.status,
+            'progress': {
+                'pages_done': self.pages_done,
+                'pages_total': self.pages_total
+            }
+        }
+        if self.status == Job.DONE:
+            data['result'] = self.result
+        elif self.status == Job.FAILED:
+            data['error'] = self.error
+        return data
+
+
+class JobManager:
+    """
+    큰 문서 분석을 요청 스레드 밖에서 처리하는 작업 관리자
+
+    - 실행 중 + 대기 중 작업이 max_pending을 넘으면 JobQueueFullError (429로 응답)
+    - 끝난 작업 결과는 ttl초 동안만 보관
+    """
+
+    def __init__(self, workers=2, max_pending=16, ttl=600):
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+        self._jobs = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, on_cancel=None, **kwargs):
+        """
+        작업 등록
+
+        fn은 job.update_progress를 progress 인자로 받아서 결과(dict)를 반환해야 함
+        on_cancel은 작업이 시작되기 전에 취소되면(서버 종료 등) 대신 호출됨 (임시 파일 정리 등)
+
+        Returns:
+            Job
+        """
+        self._purge_expired()
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise JobQueueFullError("처리 대기 중인 작업이 너무 많습니다")
+            self._pending += 1
+            job = Job()
+            self._jobs[job.id] = job
+
+        try:
+            future = self._executor.submit(self._run, job, fn, args, kwargs)
+            future.add_done_callback(lambda f: self._on_done(job, f, on_cancel))
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+                del self._jobs[job.id]
+            raise
+
+        return job
+
+    def get(self, job_id):
+        """작업 조회 (없거나 만료되면 None)"""
+        self._purge_expired()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self):
+        """대기 중인 작업은 취소 (submit의 on_cancel 호출), 실행 중인 작업은 기다리지 않음"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job, fn, args, kwargs):
+        job.status = Job.RUNNING
+        try:
+            job.result = fn(*args, progress=job.update_progress, **kwargs)
+            job.status = Job.DONE
+        except Exception as e:
+            print(f"❌ 작업 실패 ({job.id}): {e}")
+            job.error = str(e)
+            job.status = Job.FAILED
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._pending -= 1
+
+    def _on_done(self, job, future, on_cancel):
+        """시작 전에 취소된 작업 정리 (실행된 작업은 _run에서 정리)"""
+        if not future.cancelled():
+            return
+        job.error = "서버가 종료되어 작업이 취소되었습니다"
+        job.status = Job.FAILED
+        job.finished_at = time.time()
+        with self._lock:
+            self._pending -= 1
+        if on_cancel:
+            on_cancel()
+
+    def _purge_expired(self):
+        """ttl이 지난 완료 작업 정리"""
+        now = time.time()
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished_at is not None and now - job.finished_at > self.ttl
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
@@ -0,0 +1,153 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# 처리 단계 시간 구간 (초)
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+class Counter:
+    """누적 카운터 (Prometheus counter)"""
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.labelnames, labels)} {value}')
+        return lines
+
+
+class Histogram:
+    """구간별 분포 (Prometheus histogram)"""
+
+    def __init__(self, name, help_text, labelnames=(), buckets=STAGE_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}  # 라벨 → [구간별 개수..., 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            data = self._values.get(labels)
+            if data is None:
+                data = self._values[labels] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[i] += 1
+                    break
+            data[-2] += value
+            data[-1] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for labels, data in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, data):
+                    cumulative += count
+                    le = _format_labels(self.labelnames, labels, [('le', bound)])
+                    lines.append(f'{self.name}_bucket{le} {cumulative}')
+                le = _format_labels(self.labelnames, labels, [('le', '+Inf')])
+                lines.append(f'{self.name}_bucket{le} {data[-1]}')
+                label_str = _format_labels(self.labelnames, labels)
+                lines.append(f'{self.name}_sum{label_str} {data[-2]}')
+                lines.append(f'{self.name}_count{label_str} {data[-1]}')
+        return lines
+
+
+STAGE_SECONDS = Histogram('pii_stage_seconds', '처리 단계별 소요 시간(초)', ['stage'])
+REQUEST_SECONDS = Histogram('pii_request_seconds', 'API 요청 처리 시간(초)', ['endpoint'])
+REQUESTS = Counter('pii_requests_total', 'API 요청 수', ['endpoint', 'status'])
+PAGES = Counter('pii_pages_total', '처리한 페이지 수', ['mode'])
+CACHE = Counter('pii_ocr_cache_total', 'OCR 결과 캐시 조회 수', ['result'])
+
+_METRICS = (STAGE_SECONDS, REQUEST_SECONDS, REQUESTS, PAGES, CACHE)
+
+
+def render_metrics():
+    """/api/metrics 응답 본문 (Prometheus text format)"""
+    lines = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+class RequestTimings:
+    """요청 하나의 단계별 시간 합계 (페이지마다 반복되는 단계는 더해짐)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        with self._lock:
+            self._stages[stage] = self._stages.get(stage, 0.0) + seconds
+
+    def to_dict(self):
+        """
+        {단계: 초, total: 요청 시작부터 경과 시간}
+
+        PDF OCR은 렌더링과 OCR이 동시에 진행되므로 단계 합계가 total보다 클 수 있다.
+        """
+        with self._lock:
+            data = {stage: round(seconds, 4) for stage, seconds in self._stages.items()}
+        data['total'] = round(time.perf_counter() - self.started, 4)
+        return data
+
+
+_current_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+def start_request_timings():
+    """이 요청(현재 컨텍스트)의 단계별 시간 기록 시작"""
+    timings = RequestTimings()
+    _current_timings.set(timings)
+    return timings
+
+
+def current_timings():
+    return _current_timings.get()
+
+
+def observe_stage(stage, seconds, timings=None):
+    """단계 시간 기록 (timings를 안 주면 현재 요청의 것)"""
+    STAGE_SECONDS.observe(seconds, stage)
+    timings = timings or _current_timings.get()
+    if timings:
+        timings.add(stage, seconds)
+
+
+@contextmanager
+def timed(stage):
+    """with timed('detect_scan'): ... 블록 시간을 단계 시간으로 기록"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started)
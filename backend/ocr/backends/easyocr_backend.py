@@ -0,0 +1,15 @@
+def create_reader(model_dir=None):
+    """
+    EasyOCR Reader 생성 (한국어 + 영어, CPU, PyTorch 모델)
+
+    Args:
+        model_dir: 모델 파일 폴더 (지정하면 모델을 내려받지 않고 이 폴더의 파일만 사용)
+    """
+    import easyocr
+
+    if model_dir:
+        return easyocr.Reader(
+            ['ko', 'en'], gpu=False,
+            model_storage_directory=str(model_dir), download_enabled=False
+        )
+    return easyocr.Reader(['ko', 'en'], gpu=False)
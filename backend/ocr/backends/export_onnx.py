@@ -0,0 +1,119 @@
+"""
+EasyOCR 모델(craft_mga.pth, korean_g2.pth)을 ONNX로 변환 + int8 양자화 (onnx 백엔드용)
+
+backend 폴더에서 실행 (torch, onnx, onnxruntime 필요):
+    python -m ocr.backends.export_onnx --model-dir models --output onnx_models
+
+양자화는 onnxruntime dynamic quantization (가중치 int8, 활성값은 실행 시 int8로 변환)
+- recognizer(기본): 인식 모델만 int8, 검출 모델은 float32
+- all: 검출 모델(CRAFT, 합성곱)도 int8 (CPU에 따라 더 느리거나 정확도가 떨어질 수 있으니 벤치마크로 확인)
+- none: 둘 다 float32
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from .onnx_backend import DETECTOR_FILE, RECOGNIZER_FILE
+
+QUANTIZE_MODES = ('recognizer', 'all', 'none')
+OPSET = 17
+
+
+def export_detector(reader, path):
+    """CRAFT 검출 모델 → ONNX (입력 크기 가변)"""
+    import torch
+
+    dummy = torch.randn(1, 3, 640, 640)
+    torch.onnx.export(
+        reader.detector, dummy, str(path),
+        input_names=['image'], output_names=['y', 'feature'],
+        dynamic_axes={
+            'image': {0: 'batch', 2: 'height', 3: 'width'},
+            'y': {0: 'batch', 1: 'out_height', 2: 'out_width'},
+            'feature': {0: 'batch', 2: 'out_height', 3: 'out_width'},
+        },
+        opset_version=OPSET
+    )
+
+
+def export_recognizer(reader, path):
+    """인식 모델 → ONNX (배치 크기, 이미지 폭 가변, 높이는 imgH 고정)"""
+    import torch
+    from easyocr import easyocr
+
+    class Recognizer(torch.nn.Module):
+        # CTC 모델은 text 입력을 쓰지 않으므로 이미지만 받도록
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, image):
+            return self.model(image, None)
+
+    dummy = torch.randn(2, 1, easyocr.imgH, 256)
+    torch.onnx.export(
+        Recognizer(reader.recognizer).eval(), dummy, str(path),
+        input_names=['image'], output_names=['preds'],
+        dynamic_axes={'image': {0: 'batch', 3: 'width'}, 'preds': {0: 'batch', 1: 'length'}},
+        opset_version=OPSET
+    )
+
+
+def quantize(source, target):
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(str(source), str(target), weight_type=QuantType.QInt8)
+
+
+def export(model_dir, output, quantize_mode='recognizer'):
+    """
+    Returns:
+        {파일명: 크기(바이트)}
+    """
+    import easyocr
+
+    # 내보낼 때는 양자화하지 않은 float32 PyTorch 모델 (EasyOCR 기본은 CPU에서 동적 양자화)
+    options = {'model_storage_directory': str(model_dir), 'download_enabled': False} if model_dir else {}
+    reader = easyocr.Reader(['ko', 'en'], gpu=False, quantize=False, **options)
+
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    targets = {
+        DETECTOR_FILE: (export_detector, quantize_mode == 'all'),
+        RECOGNIZER_FILE: (export_recognizer, quantize_mode in ('recognizer', 'all')),
+    }
+
+    sizes = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for filename, (export_model, int8) in targets.items():
+            print(f"🔧 {filename} 변환 중..." + (" (int8)" if int8 else ""), file=sys.stderr)
+            exported = Path(work_dir) / filename
+            export_model(reader, exported)
+            if int8:
+                quantize(exported, output / filename)
+            else:
+                shutil.copyfile(exported, output / filename)
+            sizes[filename] = os.path.getsize(output / filename)
+    return sizes
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='EasyOCR 모델을 ONNX(int8)로 변환')
+    parser.add_argument('--model-dir', help='EasyOCR 모델 파일 폴더 (없으면 EasyOCR 기본 위치, 내려받기 허용)')
+    parser.add_argument('--output', required=True, help='ONNX 모델을 저장할 폴더 (OCR_ONNX_DIR)')
+    parser.add_argument('--quantize', choices=QUANTIZE_MODES, default='recognizer', help='int8로 양자화할 모델')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = export(args.model_dir, args.output, args.quantize)
+    for filename, size in sizes.items():
+        print(f"✅ {Path(args.output) / filename} ({size / 1024 / 1024:.1f}MB)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import os
+import threading
+from pathlib import Path
+
+# export_onnx가 만드는 파일 이름
+DETECTOR_FILE = 'craft.onnx'
+RECOGNIZER_FILE = 'recognizer.onnx'
+
+
+class OnnxModel:
+    """
+    EasyOCR이 torch 모델 대신 호출하는 ONNX Runtime 세션
+
+    EasyOCR 검출(test_net)은 net(x), 인식(recognizer_predict)은 model(image, text)로 부르고
+    결과를 torch 텐서로 받으므로 입력은 numpy로 바꿔서 실행하고 결과는 다시 텐서로 돌려준다.
+
+    세션은 처음 호출할 때 그 프로세스에서 만든다. (fork 전에 만든 세션의 스레드 풀은
+    자식 프로세스에 없으므로 preload 후 fork된 워커는 세션을 새로 만듦)
+    스레드 수는 그때의 torch 스레드 수를 따른다. (OCR_TORCH_THREADS, 워커 풀은 워커별 값)
+    """
+
+    def __init__(self, path, outputs):
+        """
+        Args:
+            path: .onnx 파일
+            outputs: 돌려줄 출력 이름들 (하나면 텐서 하나, 여러 개면 튜플)
+        """
+        self.path = str(path)
+        self.outputs = list(outputs)
+        self._session = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def eval(self):
+        return self
+
+    def session(self):
+        if self._session is None or self._pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._pid != os.getpid():
+                    import onnxruntime as ort
+                    import torch
+
+                    options = ort.SessionOptions()
+                    options.intra_op_num_threads = torch.get_num_threads()
+                    options.inter_op_num_threads = 1
+                    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                    self._session = ort.InferenceSession(
+                        self.path, options, providers=['CPUExecutionProvider']
+                    )
+                    self._pid = os.getpid()
+        return self._session
+
+    def __call__(self, image, *unused):
+        import torch
+
+        session = self.session()
+        results = session.run(self.outputs, {session.get_inputs()[0].name: image.cpu().numpy()})
+        tensors = tuple(torch.from_numpy(result) for result in results)
+        return tensors[0] if len(tensors) == 1 else tensors
+
+
+def create_reader(model_dir=None, onnx_dir=None):
+    """
+    검출/인식 모델을 ONNX Runtime으로 돌리는 EasyOCR Reader 생성 (한국어 + 영어, CPU)
+
+    글자 집합, 이미지 전처리, 박스 후처리, CTC 디코딩은 EasyOCR 코드를 그대로 쓰고
+    CRAFT 검출 모델과 인식 모델만 export_onnx로 변환한(int8 양자화) ONNX 모델로 바꾼다.
+    Reader 설정(글자 집합)을 읽기 위해 EasyOCR 모델 파일(model_dir)도 있어야 한다. (PyTorch 모델은 올리지 않음)
+
+    Args:
+        model_dir: EasyOCR 모델 파일 폴더 (create_reader 참고)
+        onnx_dir: export_onnx로 만든 craft.onnx, recognizer.onnx가 있는 폴더
+    """
+    import easyocr
+    from easyocr.config import BASE_PATH
+    from easyocr.detection import get_textbox
+    from easyocr.utils import CTCLabelConverter
+
+    onnx_dir = Path(onnx_dir or '')
+    for filename in (DETECTOR_FILE, RECOGNIZER_FILE):
+        if not (onnx_dir / filename).is_file():
+            raise FileNotFoundError(
+                f"ONNX 모델이 없습니다: {onnx_dir / filename} "
+                "(python -m ocr.backends.export_onnx로 먼저 변환)"
+            )
+
+    lang_list = ['ko', 'en']
+    options = {'model_storage_directory': str(model_dir), 'download_enabled': False} if model_dir else {}
+    reader = easyocr.Reader(lang_list, gpu=False, detector=False, recognizer=False, **options)
+
+    # Reader(detector=False)가 채우지 않는 검출 설정
+    reader.detect_network = 'craft'
+    reader.get_textbox = get_textbox
+    reader.detector = OnnxModel(onnx_dir / DETECTOR_FILE, ['y', 'feature'])
+
+    dict_list = {lang: os.path.join(BASE_PATH, 'dict', f'{lang}.txt') for lang in lang_list}
+    reader.converter = CTCLabelConverter(reader.character, {}, dict_list)
+    reader.recognizer = OnnxModel(onnx_dir / RECOGNIZER_FILE, ['preds'])
+    return reader
@@ -0,0 +1,144 @@
+import math
+
+from .orientation import (
+    MIN_CONFIDENCE, SWEEP_ROTATION, detect_rotation, mean_confidence, run_readtext, unrotate_box
+)
+
+# 인식 배치 하나에 넣는 글자 영역 수 기본값
+DEFAULT_BATCH_SIZE = 32
+
+
+def run_readtext_batch(reader, images, options):
+    """
+    이미지 여러 장을 OCR (로컬 Reader와 워커 풀이 같이 사용)
+
+    options에 batch_size가 있으면 readtext_batch로 모든 이미지의 글자 영역을 모아서 인식하고,
+    없으면(0) 이미지마다 run_readtext를 실행한다.
+
+    Returns:
+        이미지별 결과 리스트 (reader.readtext와 같은 형식)
+    """
+    options = dict(options)
+    batch_size = options.pop('batch_size', 0)
+    if batch_size:
+        return readtext_batch(reader, images, options, batch_size)
+    return [run_readtext(reader, image, options) for image in images]
+
+
+def readtext_batch(reader, images, options, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    여러 이미지(페이지)의 글자 영역을 한꺼번에 인식
+
+    EasyOCR readtext는 CPU에서 글자 영역을 하나씩 인식해서 모델의 배치 차원을 거의 쓰지 못한다.
+    여기서는 글자 영역 검출만 이미지마다 하고, 모든 이미지에서 잘라낸 영역을 폭이 비슷한 것끼리
+    batch_size개씩 묶어 EasyOCR get_text로 인식한 뒤 이미지별로 다시 나눈다.
+    (폭순으로 묶어야 짧은 영역이 긴 영역 폭만큼 패딩되어 낭비되지 않음)
+
+    Args:
+        options: run_readtext와 같은 옵션 (auto_rotate, rotation_info, paragraph)
+        batch_size: 인식 배치 하나에 넣을 글자 영역 수
+
+    Returns:
+        이미지별 결과 리스트 [(box, text, confidence)] (좌표는 원본 이미지 기준)
+    """
+    from easyocr.utils import get_image_list, get_paragraph, make_rotated_img_list, reformat_input
+    import numpy as np
+
+    options = dict(options)
+    auto_rotate = options.pop('auto_rotate', False)
+    rotation_info = options.pop('rotation_info', None)
+    paragraph = options.pop('paragraph', False)
+    model_height = _model_height()
+
+    # 인식할 조각: (글자 영역 번호, 잘라낸 회색조 이미지)
+    # 4방향 인식(rotation_info)이면 영역 하나에 돌린 조각이 여러 개
+    pieces = []
+    regions = []  # 글자 영역: (이미지 번호, box)
+    rotations = []  # 이미지별 (반시계 90° 회전 수, 원본 폭, 원본 높이)
+
+    for index, image in enumerate(images):
+        img, img_grey = reformat_input(image)
+        height, width = img_grey.shape[:2]
+        k = detect_rotation(reader, img_grey) if auto_rotate else 0
+        if k:
+            img = np.ascontiguousarray(np.rot90(img, k))
+            img_grey = np.ascontiguousarray(np.rot90(img_grey, k))
+        rotations.append((k, width, height))
+
+        horizontal_list, free_list = reader.detect(img, reformat=False)
+        image_list, _ = get_image_list(horizontal_list[0], free_list[0], img_grey, model_height=model_height)
+        if rotation_info and image_list:
+            # [원본 전부, 90° 전부, 180° 전부, ...] 순서
+            image_list = make_rotated_img_list(rotation_info, image_list)
+        regions_per_image = len(image_list) // (len(rotation_info) + 1 if rotation_info else 1)
+
+        first = len(regions)
+        for i, (box, crop) in enumerate(image_list):
+            if i < regions_per_image:
+                regions.append((index, box))
+            pieces.append((first + i % regions_per_image, crop))
+        img = img_grey = image_list = None
+
+    # 영역별로 신뢰도가 가장 높은 조각의 결과
+    best = [None] * len(regions)
+    for region, text, confidence in _recognize(reader, pieces, batch_size, model_height):
+        if best[region] is None or confidence > best[region][1]:
+            best[region] = (text, confidence)
+
+    results = [[] for _ in images]
+    for (index, box), (text, confidence) in zip(regions, best):
+        k, width, height = rotations[index]
+        if k:
+            box = unrotate_box(box, k, width, height)
+        results[index].append((box, text, confidence))
+
+    if auto_rotate:
+        for index, result in enumerate(results):
+            if not result or mean_confidence(result) < MIN_CONFIDENCE:
+                # 방향 판단이 틀렸거나 글자가 섞여 있는 경우 (드물어서 이 이미지만 따로)
+                swept = reader.readtext(images[index], rotation_info=SWEEP_ROTATION, paragraph=False)
+                if not result or mean_confidence(swept) > mean_confidence(result):
+                    results[index] = swept
+
+    if paragraph:
+        results = [get_paragraph(result) for result in results]
+    return results
+
+
+def _recognize(reader, pieces, batch_size, model_height):
+    """
+    조각들을 폭순으로 batch_size개씩 인식
+
+    Returns:
+        [(글자 영역 번호, text, confidence)] (순서는 폭순)
+    """
+    from easyocr.recognition import get_text
+
+    ignore_char = ''.join(set(reader.character) - set(reader.lang_char))
+    pieces = sorted(pieces, key=lambda piece: _scaled_width(piece[1], model_height))
+
+    recognized = []
+    for start in range(0, len(pieces), batch_size):
+        batch = pieces[start:start + batch_size]
+        # 배치 안에서 가장 긴 조각 폭에 맞춤 (EasyOCR recognize와 같은 방식으로 올림)
+        widest = _scaled_width(batch[-1][1], model_height)
+        max_width = max(1, math.ceil(widest / model_height)) * model_height
+        result = get_text(
+            reader.character, model_height, int(max_width), reader.recognizer, reader.converter,
+            batch, ignore_char, batch_size=len(batch), workers=0, device=reader.device
+        )
+        recognized.extend(result)
+    return recognized
+
+
+def _scaled_width(crop, model_height):
+    """높이를 model_height로 맞췄을 때 폭"""
+    height, width = crop.shape[:2]
+    return width * model_height / max(1, height)
+
+
+def _model_height():
+    """인식 모델 입력 높이 (사용자 모델이면 Reader 생성 시 EasyOCR이 바꿔 둠)"""
+    from easyocr import easyocr
+
+    return easyocr.imgH
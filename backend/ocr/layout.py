@@ -0,0 +1,68 @@
+class PageLayout:
+    """
+    페이지 텍스트 + 텍스트 조각별 위치 (검출 위치를 다시 OCR하지 않고 가리기 위함)
+
+    words: [(텍스트 안 시작, 끝, x0, y0, x1, y1)]
+        좌표는 PDF면 회전 전 페이지 기준 포인트, 이미지면 픽셀
+        OCR 결과는 한 줄이 한 조각이라 공백이 들어 있을 수 있음
+    """
+
+    __slots__ = ('text', 'words')
+
+    def __init__(self, text='', words=None):
+        self.text = text
+        self.words = words if words is not None else []
+
+    def add(self, text, box=None):
+        """텍스트 조각을 공백으로 이어 붙이고 위치(box)가 있으면 기록"""
+        if self.text:
+            self.text += ' '
+        start = len(self.text)
+        self.text += text
+        if box is not None:
+            self.words.append((start, len(self.text), *box))
+
+    def add_pdf_words(self, words):
+        """
+        page.get_text('words') 결과를 이미 있는 텍스트(page.get_text()) 위치에 맞춰 기록
+
+        두 결과는 같은 순서로 나오므로 앞에서부터 차례로 찾는다. (못 찾은 단어는 버림)
+        """
+        pos = 0
+        for x0, y0, x1, y1, word, *_ in words:
+            start = self.text.find(word, pos)
+            if start == -1:
+                continue
+            pos = start + len(word)
+            self.words.append((start, pos, x0, y0, x1, y1))
+
+    def boxes(self, start, end):
+        """
+        텍스트 [start, end) 를 덮는 영역들
+
+        조각 일부만 걸치면 글자 수 비율로 가로 범위를 잘라서 계산한다.
+        """
+        boxes = []
+        for w_start, w_end, x0, y0, x1, y1 in self.words:
+            if w_end <= start or w_start >= end:
+                continue
+            length = w_end - w_start
+            width = x1 - x0
+            left = x0 + width * (max(start, w_start) - w_start) / length
+            right = x0 + width * (min(end, w_end) - w_start) / length
+            boxes.append((left, y0, right, y1))
+        return boxes
+
+    def to_dict(self):
+        """캐시 저장용 (좌표는 소수점 한 자리, 평평한 리스트로)"""
+        flat = []
+        for w_start, w_end, *box in self.words:
+            flat.extend((w_start, w_end))
+            flat.extend(round(v, 1) for v in box)
+        return {'text': self.text, 'words': flat}
+
+    @classmethod
+    def from_dict(cls, data):
+        flat = data.get('words', [])
+        words = [tuple(flat[i:i + 6]) for i in range(0, len(flat), 6)]
+        return cls(data['text'], words)
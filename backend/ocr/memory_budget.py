@@ -0,0 +1,35 @@
+import threading
+
+
+class MemoryBudget:
+    """
+    요청 하나가 동시에 들고 있을 수 있는 OCR 입력 이미지 크기 (바이트)
+
+    렌더링했지만 OCR이 끝나지 않은 이미지들의 합이 max_bytes를 넘으면 렌더링이 기다린다.
+    들고 있는 이미지가 없으면 max_bytes보다 큰 이미지도 하나는 받는다. (멈추지 않도록)
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.used = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, nbytes, stop=None):
+        """
+        nbytes만큼 자리가 날 때까지 대기
+
+        Returns:
+            True, 기다리는 중에 stop(Event)이 set되면 False
+        """
+        with self._cond:
+            while self.used and self.used + nbytes > self.max_bytes:
+                if stop is not None and stop.is_set():
+                    return False
+                self._cond.wait(timeout=0.1)
+            self.used += nbytes
+            return True
+
+    def release(self, nbytes):
+        with self._cond:
+            self.used -= nbytes
+            self._cond.notify_all()
@@ -1,69 +1,556 @@
-import easyocr
-import fitz  # pymupdf
-import numpy as np
+import contextvars
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
 from PIL import Image
+from metrics import PAGES, current_timings, observe_stage, timed
+from .batch_recognition import DEFAULT_BATCH_SIZE, run_readtext_batch
+from .layout import PageLayout
+from .memory_budget import MemoryBudget
+from .orientation import SWEEP_ROTATION
+from .pdf_strategy import PageOCRPlan, plan_page_ocr
+from .preprocess import PreprocessOptions, pdf_zoom, prepare_image, render_pdf_region
+from .worker_pool import OCRWorkerPool, preload_reader
 
 if not hasattr(Image, "ANTIALIAS"):
     Image.ANTIALIAS = Image.Resampling.LANCZOS
 
+
+# OCR 백엔드 (검출/인식 모델을 돌리는 방식, 전후 처리는 모두 EasyOCR 코드)
+# easyocr: PyTorch 모델 그대로, onnx: ONNX Runtime + int8 양자화 모델 (backends/export_onnx로 변환)
+BACKENDS = ('easyocr', 'onnx')
+
+
+def create_reader(model_dir=None, backend='easyocr', onnx_dir=None):
+    """
+    EasyOCR Reader 생성 (한국어 + 영어, CPU)
+    
+    easyocr(torch)는 불러오는 데만 몇 초 걸리므로 Reader가 필요할 때 import한다.
+    (fitz/numpy도 같은 이유로 쓰는 함수 안에서 import)
+    
+    Args:
+        model_dir: 모델 파일 폴더 (지정하면 모델을 내려받지 않고 이 폴더의 파일만 사용)
+        backend: BACKENDS 중 하나
+        onnx_dir: onnx 백엔드의 ONNX 모델 폴더
+    """
+    if backend == 'onnx':
+        from .backends.onnx_backend import create_reader as create_onnx_reader
+        return create_onnx_reader(model_dir, onnx_dir)
+    
+    from .backends.easyocr_backend import create_reader as create_easyocr_reader
+    return create_easyocr_reader(model_dir)
+
+
+def _no_progress(done, total):
+    pass
+
+
+# 회전된 글자 처리 방식
+# auto: 페이지마다 방향을 한 번 정해서 그 방향으로만 인식 (신뢰도가 낮으면 4방향 전체)
+# sweep: 글자 영역마다 4방향 모두 인식 (느림)
+# none: 회전 고려 안 함
+ROTATION_OPTIONS = {
+    'auto': {'auto_rotate': True},
+    'sweep': {'rotation_info': SWEEP_ROTATION},
+    'none': {},
+}
+
+
+def _bbox(points):
+    """readtext 결과의 네 꼭짓점 → (x0, y0, x1, y1)"""
+    xs = [float(p[0]) for p in points]
+    ys = [float(p[1]) for p in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+# 모델 로딩 시점
+# eager: 생성할 때 바로, background: 생성 후 백그라운드 스레드에서, lazy: 처음 OCR할 때
+# preload: 생성할 때 Reader만 올려두고 워커 풀/스레드 설정은 fork 후 load()에서 (preload() 참고)
+WARMUP_MODES = ('eager', 'background', 'lazy', 'preload')
+
+
 class OCREngine:
-    def __init__(self):
-        print("🔧 EasyOCR 초기화 중...")
-        self.reader = easyocr.Reader(['ko', 'en'], gpu=False)
-        print("✅ EasyOCR 초기화 완료!")
+    def __init__(self, workers=0, max_backlog=None, pdf_render_ahead=4, preprocess=None, rotation='auto',
+                 warmup='eager', model_dir=None, torch_threads=None, memory_budget=None,
+                 batch_size=DEFAULT_BATCH_SIZE, backend='easyocr', onnx_dir=None):
+        """
+        Args:
+            workers: 0이면 이 프로세스의 Reader 하나로 처리,
+                     1 이상이면 Reader를 하나씩 가진 워커 프로세스 풀로 처리
+            max_backlog: 풀 모드에서 실행 중인 작업 외에 대기할 수 있는 작업 수
+            pdf_render_ahead: PDF OCR 시 미리 렌더링해 둘 최대 페이지 수
+            preprocess: OCR 전 이미지 전처리 설정 (PreprocessOptions, 없으면 기본값)
+            rotation: 회전된 글자 처리 방식 ('auto', 'sweep', 'none' - ROTATION_OPTIONS 참고)
+            warmup: 모델 로딩 시점 ('eager', 'background', 'lazy' - WARMUP_MODES 참고)
+            model_dir: 모델 파일 폴더 (지정하면 내려받지 않음)
+            torch_threads: OCR 한 건이 쓰는 torch 스레드 수
+                           (풀 모드는 워커별, 기본: 풀 모드면 코어 수 / 워커 수, 아니면 torch 기본값)
+            memory_budget: PDF 하나를 OCR할 때 렌더링해서 들고 있을 수 있는 이미지 크기 합 (바이트, 없으면 제한 없음)
+            batch_size: 글자 영역 인식 배치 크기 (여러 페이지의 글자 영역을 모아서 인식,
+                        0이면 EasyOCR readtext로 이미지마다 따로 - batch_recognition 참고)
+            backend: 검출/인식 모델 실행 방식 ('easyocr', 'onnx' - BACKENDS 참고)
+            onnx_dir: onnx 백엔드의 ONNX 모델 폴더
+        """
+        self.reader = None
+        self.pool = None
+        self.workers = workers
+        self.max_backlog = max_backlog
+        self.model_dir = model_dir
+        if backend not in BACKENDS:
+            raise ValueError(f"지원하지 않는 backend 값입니다: {backend}")
+        self.backend = backend
+        self.onnx_dir = onnx_dir
+        self.torch_threads = torch_threads
+        self.pdf_render_ahead = max(1, pdf_render_ahead)
+        self.memory_budget = memory_budget
+        self.preprocess = preprocess or PreprocessOptions()
+        if rotation not in ROTATION_OPTIONS:
+            raise ValueError(f"지원하지 않는 rotation 값입니다: {rotation}")
+        self.rotation = rotation
+        self.batch_size = batch_size
+        self.ocr_options = {'paragraph': False, **ROTATION_OPTIONS[rotation], 'batch_size': batch_size}
+        
+        if warmup not in WARMUP_MODES:
+            raise ValueError(f"지원하지 않는 warmup 값입니다: {warmup}")
+        self.warmup = warmup
+        self._ready = threading.Event()
+        self._load_lock = threading.Lock()
+        self._load_error = None
+        
+        if warmup == 'eager':
+            self.load()
+        elif warmup == 'preload':
+            self.preload()
+        elif warmup == 'background':
+            threading.Thread(target=self._load_in_background, name='ocr-warmup', daemon=True).start()
+    
+    def load(self):
+        """모델 로딩 (이미 로딩됐으면 바로 반환, 다른 스레드가 로딩 중이면 끝날 때까지 대기)"""
+        with self._load_lock:
+            if self._ready.is_set():
+                return
+            try:
+                if self.workers > 0:
+                    print(f"🔧 OCR 워커 풀 초기화 중... (워커 {self.workers}개)")
+                    self.pool = OCRWorkerPool(
+                        self.workers, max_backlog=self.max_backlog,
+                        threads_per_worker=self.torch_threads, model_dir=self.model_dir,
+                        backend=self.backend, onnx_dir=self.onnx_dir
+                    )
+                    print("✅ OCR 워커 풀 초기화 완료!")
+                else:
+                    if self.reader is None:
+                        print(f"🔧 EasyOCR 초기화 중... ({self.backend})")
+                        self.reader = create_reader(self.model_dir, self.backend, self.onnx_dir)
+                        print("✅ EasyOCR 초기화 완료!")
+                    if self.torch_threads:
+                        import torch
+                        torch.set_num_threads(self.torch_threads)
+            except Exception as e:
+                self._load_error = e
+                raise
+            self._load_error = None
+            self._ready.set()
+    
+    def preload(self):
+        """
+        fork하기 전 부모 프로세스에서 Reader만 만들어 둠 (gunicorn preload_app용)
+        
+        워커 풀은 띄우지 않는다. fork된 프로세스에서 load()를 부르면 이 Reader를
+        (풀 모드면 풀 워커들도) 다시 로드하지 않고 copy-on-write로 나눠 쓴다.
+        모델을 만들 때 torch가 스레드 풀을 띄우면 fork된 쪽에서 멈출 수 있으므로
+        1 스레드로 만들고, 스레드 수는 load()에서 다시 정한다.
+        """
+        with self._load_lock:
+            if self.reader is not None:
+                return
+            import torch
+            torch.set_num_threads(1)
+            
+            print(f"🔧 EasyOCR 미리 로딩 중... (fork 전, {self.backend})")
+            self.reader = create_reader(self.model_dir, self.backend, self.onnx_dir)
+            print("✅ EasyOCR 미리 로딩 완료!")
+            if self.workers > 0:
+                preload_reader(self.reader)
+    
+    def _load_in_background(self):
+        try:
+            self.load()
+        except Exception as e:
+            # 다음 OCR 요청 때 다시 시도
+            print(f"❌ OCR 모델 로딩 실패: {e}")
+    
+    def status(self):
+        """
+        모델 상태
+        
+        Returns:
+            'ready' | 'loading'(background 로딩 중) | 'failed' | 'not_loaded'(lazy/preload, 아직 안 씀)
+            | 'rebuilding'(워커가 죽어서 워커 풀을 다시 띄우는 중)
+        """
+        if self._ready.is_set():
+            pool = self.pool
+            return 'rebuilding' if pool and pool.broken else 'ready'
+        if self._load_error is not None:
+            return 'failed'
+        if self.warmup in ('lazy', 'preload') and not self._load_lock.locked():
+            return 'not_loaded'
+        return 'loading'
+    
+    def close(self):
+        """워커 풀 종료 (서버 종료 시 호출)"""
+        if self.pool:
+            self.pool.shutdown()
+            self.pool = None
+    
+    def _submit_readtext_batch(self, images, **options):
+        """
+        이미지 여러 장의 readtext를 이미지별 Future로 실행
+        풀 모드면 이미지마다 워커에 나눠 병렬로 돌고,
+        아니면 글자 영역을 모아 한 번에 인식(run_readtext_batch)한 결과를 담아 반환
+        (ocr 단계 시간은 넘긴 시점부터 끝날 때까지라 풀 모드에서는 대기 시간 포함)
+        """
+        self.load()
+        timings = current_timings()
+        started = time.perf_counter()
+        
+        if self.pool:
+            futures = [self.pool.submit(image, **options) for image in images]
+        else:
+            futures = [Future() for _ in images]
+            try:
+                results = run_readtext_batch(self.reader, images, options)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+            else:
+                for future, result in zip(futures, results):
+                    future.set_result(result)
+        
+        def record(f):
+            if not f.cancelled():
+                observe_stage('ocr', time.perf_counter() - started, timings)
+        
+        # 로컬 모드는 한 번에 처리했으므로 한 번만 기록
+        for future in (futures if self.pool else futures[:1]):
+            future.add_done_callback(record)
+        return futures
+    
+    def readtext_batch(self, images):
+        """
+        이미지(페이지 배열) 여러 장을 한 번에 OCR
+        
+        글자 영역 검출은 이미지마다, 인식은 모든 이미지의 글자 영역을 모아 batch_size씩 한다.
+        풀 모드면 이미지들을 워커 수만큼 나눠 워커마다 한 묶음씩 처리한다.
+        
+        Returns:
+            이미지별 readtext 결과 리스트 [(box, text, confidence)]
+        """
+        if not images:
+            return []
+        self.load()
+        with timed('ocr'):
+            if not self.pool:
+                return run_readtext_batch(self.reader, images, self.ocr_options)
+            
+            chunk = -(-len(images) // self.workers)
+            futures = [
+                self.pool.submit_batch(images[start:start + chunk], **self.ocr_options)
+                for start in range(0, len(images), chunk)
+            ]
+            try:
+                return [result for future in futures for result in future.result()]
+            finally:
+                for future in futures:
+                    future.cancel()
+    
+    def extract_images(self, sources, raise_errors=False):
+        """
+        이미지 여러 개에서 텍스트 추출 (readtext_batch로 한 번에 OCR, 좌표는 원본 픽셀)
+        
+        Args:
+            sources: 이미지 파일 경로 또는 bytes 리스트
+            raise_errors: 읽을 수 없는 이미지나 OCR 실패를 에러로 올릴지
+        
+        Returns:
+            이미지별 PageLayout 리스트 (raise_errors=False면 읽을 수 없는 이미지나 OCR 실패는 빈 PageLayout)
+        """
+        layouts = [PageLayout() for _ in sources]
+        prepared = []  # (순서, 이미지, 축소 비율)
+        for index, source in enumerate(sources):
+            try:
+                with timed('image_prepare'):
+                    image, scale = prepare_image(source, self.preprocess)
+                prepared.append((index, image, scale))
+            except Exception as e:
+                print(f"❌ 이미지 OCR 에러: {e}")
+                if raise_errors:
+                    raise
+        
+        try:
+            results = self.readtext_batch([image for _, image, _ in prepared])
+        except Exception as e:
+            print(f"❌ 이미지 OCR 에러: {e}")
+            if raise_errors:
+                raise
+            return layouts
+        
+        for (index, _, scale), result in zip(prepared, results):
+            for box, text, _ in result:
+                layouts[index].add(text, tuple(v / scale for v in _bbox(box)))
+            PAGES.inc('image')
+            print(f"✅ 이미지 텍스트 추출 완료: {layouts[index].text[:100]}...")
+        return layouts
     
-    def extract_text(self, file_path, enable_pdf_ocr = False):
+    def extract_text(self, source, enable_pdf_ocr = False, filename = None, progress = None):
         """파일에서 텍스트 추출"""
+        return ' '.join(self.extract_pages(source, enable_pdf_ocr, filename, progress))
+    
+    def extract_pages(self, source, enable_pdf_ocr = False, filename = None, progress = None):
+        """파일에서 페이지별 텍스트 추출 (이미지는 한 페이지, 실패하면 빈 리스트)"""
+        try:
+            page_texts = list(self.iter_pages(source, enable_pdf_ocr, filename, progress))
+        except Exception as e:
+            print(f"❌ PDF 텍스트 추출 에러: {e}")
+            return []
+        
+        full_text = ' '.join(page_texts)
+        print(f"✅ 텍스트 추출 완료: {full_text[:100]}...")
+        return page_texts
+    
+    def iter_pages(self, source, enable_pdf_ocr = False, filename = None, progress = None):
+        """페이지별 텍스트를 추출되는 대로 하나씩 반환 (iter_layouts에서 텍스트만)"""
+        layouts = self.iter_layouts(source, enable_pdf_ocr, filename, progress)
+        try:
+            for layout in layouts:
+                yield layout.text
+        finally:
+            layouts.close()
+    
+    def iter_layouts(self, source, enable_pdf_ocr = False, filename = None, progress = None):
+        """
+        페이지별 PageLayout(텍스트 + 조각별 위치)을 추출되는 대로 하나씩 반환 (제너레이터)
+        
+        중간에 그만 읽고 close()하면 남은 페이지는 렌더링/OCR하지 않는다.
+        추출 중 에러는 그대로 올라감.
+        
+        Args:
+            source: 파일 경로, bytes, 또는 read() 가능한 스트림
+            enable_pdf_ocr: PDF 페이지도 OCR할지
+            filename: source가 bytes/스트림일 때 형식 판단용 파일명
+            progress: 진행 상황 콜백 progress(끝난 페이지 수, 전체 페이지 수)
+        """
+        if progress is None:
+            progress = _no_progress
+        
+        if hasattr(source, 'read'):
+            source = source.read()
+        
+        name = filename or (source if isinstance(source, (str, os.PathLike)) else '')
         
         # PDF면 텍스트 직접 추출
-        if file_path.lower().endswith('.pdf'):
-            return self._extract_from_pdf(file_path, enable_pdf_ocr)
+        if str(name).lower().endswith('.pdf'):
+            yield from self._iter_pdf_pages(source, enable_pdf_ocr, progress)
         
         # 이미지면 OCR
         else:
-            return self._extract_from_image(file_path)
+            progress(0, 1)
+            layout = self._extract_from_image(source)
+            progress(1, 1)
+            yield layout
+    
+    def _iter_pdf_pages(self, source, enable_pdf_ocr, progress):
+        """PDF에서 페이지별 텍스트 직접 추출 (OCR 불필요!)"""
+        import fitz  # pymupdf
+
+        if isinstance(source, (bytes, bytearray)):
+            doc = fitz.open(stream=source, filetype='pdf')
+        else:
+            doc = fitz.open(source)
+        
+        try:
+            progress(0, len(doc))
+            if enable_pdf_ocr:
+                yield from self._ocr_pdf_pages(doc, progress)
+            else:
+                for page_num in range(len(doc)):
+                    page = doc[page_num]
+                    with timed('pdf_text'):
+                        layout = PageLayout(page.get_text())  # 텍스트 직접 추출!
+                        layout.add_pdf_words(page.get_text('words'))
+                    # 탐지하는 동안 페이지 객체를 붙잡고 있지 않도록
+                    del page
+                    PAGES.inc('text')
+                    progress(page_num + 1, len(doc))
+                    yield layout
+        finally:
+            doc.close()
+            if enable_pdf_ocr:
+                # 렌더링하면서 MuPDF 캐시에 쌓인 폰트/이미지 해제
+                fitz.TOOLS.store_shrink(100)
     
-    def _extract_from_pdf(self, pdf_path, enable_pdf_ocr):
-        """PDF에서 텍스트 직접 추출 (OCR 불필요!)"""
+    def _ocr_pdf_pages(self, doc, progress):
+        """
+        PDF 페이지 렌더링과 OCR을 파이프라인으로 처리 (제너레이터)
+        
+        렌더링 스레드가 페이지마다 OCR 방식을 정하고(plan_page_ocr) 필요한 부분만
+        미리 래스터화해서 크기가 정해진 큐에 넣고, 여기서는 큐에 쌓인 만큼 꺼내서 OCR에 넘긴다.
+        (풀 모드면 워커들이 페이지를 동시에 처리, 아니면 OCR하는 동안 렌더링된 페이지들의
+        글자 영역을 모아서 한 번에 인식)
+        OCR이 끝난 페이지는 페이지 순서대로 바로바로 내보낸다.
+        
+        memory_budget이 있으면 OCR이 끝나지 않은 렌더링 이미지의 합이 넘지 않도록
+        렌더링을 멈추고, 한 장이 넘는 페이지는 배율을 낮춰서 렌더링한다.
+        """
+        import fitz  # pymupdf
+
+        page_count = len(doc)
+        layer_layouts = [None] * page_count
+        futures = [[] for _ in range(page_count)]  # 페이지별 [(Future, 픽셀 → 페이지 좌표 변환)]
+        ocr_pages = 0
+        
+        budget = MemoryBudget(self.memory_budget) if self.memory_budget else None
+        rendered = queue.Queue(maxsize=self.pdf_render_ahead)
+        stop = threading.Event()
+        render_error = []
+        
+        def render():
+            # fitz 문서는 이 스레드에서만 만짐
+            try:
+                for page_num in range(page_count):
+                    if stop.is_set():
+                        break
+                    page = doc[page_num]
+                    with timed('pdf_text'):
+                        text = page.get_text()  # 텍스트 직접 추출!
+                        plan = plan_page_ocr(page, text)
+                        
+                        if plan.mode == PageOCRPlan.FULL:
+                            # 텍스트 레이어가 없거나 성김 → OCR 결과만 사용 (중복 방지)
+                            clips = [None]
+                        else:
+                            layer = PageLayout(text)
+                            layer.add_pdf_words(page.get_text('words'))
+                            layer_layouts[page_num] = layer
+                            clips = plan.clips
+                    
+                    for clip in clips:
+                        # 영역 안 스캔 이미지의 원본 해상도에 맞춘 배율
+                        zoom = pdf_zoom(page, clip, self.preprocess, self.memory_budget)
+                        
+                        # clips는 회전 전 좌표, get_pixmap의 clip은 회전된 화면 좌표
+                        if clip is not None:
+                            clip = clip * page.rotation_matrix
+                        
+                        # 렌더링하기 전에 OCR이 끝난 이미지가 자리를 비울 때까지 대기
+                        area = clip if clip is not None else page.rect
+                        channels = 1 if self.preprocess.grayscale else 3
+                        nbytes = int(area.width * zoom + 1) * int(area.height * zoom + 1) * channels
+                        if budget and not budget.acquire(nbytes, stop):
+                            return
+                        
+                        with timed('pdf_render'):
+                            img_array = render_pdf_region(page, clip, zoom, self.preprocess)
+                        
+                        # 렌더링 이미지 픽셀 → 회전 전 페이지 좌표
+                        origin = clip.tl if clip is not None else fitz.Point(0, 0)
+                        to_page = (
+                            fitz.Matrix(1 / zoom, 1 / zoom)
+                            * fitz.Matrix(1, 0, 0, 1, origin.x, origin.y)
+                            * page.derotation_matrix
+                        )
+                        rendered.put((page_num, img_array, to_page, nbytes))
+                        img_array = None
+                    
+                    # 이 페이지 작업은 다 넘겼다는 표시
+                    del page
+                    rendered.put((page_num, None, None, 0))
+            except Exception as e:
+                render_error.append(e)
+            finally:
+                rendered.put(None)
+        
+        def page_layout(page_num):
+            nonlocal ocr_pages
+            layout = layer_layouts[page_num] or PageLayout()
+            for future, to_page in futures[page_num]:
+                for box, text, _ in future.result():
+                    rect = fitz.Rect(_bbox(box)) * to_page
+                    layout.add(text, (rect.x0, rect.y0, rect.x1, rect.y1))
+            if futures[page_num]:
+                ocr_pages += 1
+            PAGES.inc('ocr' if futures[page_num] else 'text')
+            # 내보낸 페이지의 OCR 결과는 더 들고 있지 않음
+            layer_layouts[page_num] = None
+            futures[page_num] = []
+            progress(page_num + 1, page_count)
+            return layout
+        
+        # 요청별 단계 시간이 렌더링 스레드에서도 기록되도록 현재 컨텍스트에서 실행
+        renderer = threading.Thread(target=contextvars.copy_context().run, args=(render,), daemon=True)
+        renderer.start()
+        
         try:
-            doc = fitz.open(pdf_path)
-            all_texts = []
+            submitted_pages = 0  # 작업을 다 넘긴 페이지 수
+            next_page = 0        # 다음에 내보낼 페이지
             
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                text = page.get_text()  # 텍스트 직접 추출!
-                all_texts.append(text)
-
-                if (enable_pdf_ocr):
-                    pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-                    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                    img_array = np.array(img)
-                    result = self.reader.readtext(img_array, paragraph=False, rotation_info=[90, 180, 270])
-                    texts = [text[1] for text in result]
-                    all_texts.extend(texts)
+            finished = False
+            while not finished:
+                # 하나를 기다렸다가 그동안 렌더링된 것까지 모두 꺼냄
+                items = [rendered.get()]
+                while items[-1] is not None:
+                    try:
+                        items.append(rendered.get_nowait())
+                    except queue.Empty:
+                        break
+                if items[-1] is None:
+                    items.pop()
+                    finished = True
+                
+                images = [item for item in items if item[1] is not None]
+                if images:
+                    # 풀이 가득 차면 여기서 대기 → 렌더링 큐도 차서 렌더링도 멈춤
+                    batch = self._submit_readtext_batch([img for _, img, _, _ in images], **self.ocr_options)
+                    for (page_num, _, to_page, nbytes), future in zip(images, batch):
+                        if budget:
+                            # 워커에 넘어가서 처리가 끝나면 이미지 자리 반납
+                            future.add_done_callback(lambda _, nbytes=nbytes: budget.release(nbytes))
+                        futures[page_num].append((future, to_page))
+                    batch = None
+                for page_num, img_array, _, _ in items:
+                    if img_array is None:
+                        submitted_pages = page_num + 1
+                # 넘긴 이미지를 큐에서 꺼낸 뒤에도 붙잡고 있지 않도록
+                items = images = None
+                
+                # OCR이 끝난 앞쪽 페이지는 바로 내보냄
+                while next_page < submitted_pages and all(f.done() for f, _ in futures[next_page]):
+                    yield page_layout(next_page)
+                    next_page += 1
             
-            doc.close()
+            if render_error:
+                raise render_error[0]
             
-            full_text = ' '.join(all_texts)
-            print(f"✅ PDF 텍스트 추출 완료: {full_text[:100]}...")
-            return full_text
-        
-        except Exception as e:
-            print(f"❌ PDF 텍스트 추출 에러: {e}")
-            return ""
+            for page_num in range(next_page, page_count):
+                yield page_layout(page_num)
+            
+            print(f"🔍 PDF OCR: 전체 {page_count}페이지 중 {ocr_pages}페이지 OCR")
         
-    def _extract_from_image(self, image_path):
-        """이미지에서 텍스트 추출 (OCR)"""
-        try:
-            result = self.reader.readtext(
-                image_path,
-                rotation_info=[90, 180, 270]
-            )
-            texts = [text[1] for text in result]
-            full_text = ' '.join(texts)
-            print(f"✅ 이미지 텍스트 추출 완료: {full_text[:100]}...")
-            return full_text
+        finally:
+            # 중간에 실패하거나 그만 읽으면 렌더링 스레드를 멈추고 남은 작업 취소
+            stop.set()
+            while renderer.is_alive():
+                try:
+                    rendered.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            for page_futures in futures:
+                for future, _ in page_futures:
+                    future.cancel()
         
-        except Exception as e:
-            print(f"❌ 이미지 OCR 에러: {e}")
-            return ""
\ No newline at end of file
+    def _extract_from_image(self, source):
+        """이미지에서 텍스트 추출 (OCR, 큰 이미지는 줄여서 처리, 좌표는 원본 픽셀, 실패하면 에러)"""
+        return self.extract_images([source], raise_errors=True)[0]
\ No newline at end of file
@@ -0,0 +1,124 @@
+# 방향 판단용 글자 영역 검출 시 이미지 긴 변 크기 (작게 줄여서 한 번만 검출)
+DETECT_SIDE = 1024
+
+# 0°/180° (또는 90°/270°) 중 고를 때 인식해 볼 글자 영역 수 (큰 것부터)
+SAMPLE_BOXES = 3
+
+# 선택한 방향의 평균 인식 신뢰도가 이보다 낮으면 4방향 전부 시도 (기존 rotation_info 방식)
+MIN_CONFIDENCE = 0.4
+
+SWEEP_ROTATION = [90, 180, 270]
+
+
+def run_readtext(reader, image, options):
+    """
+    reader.readtext 실행 (로컬 Reader와 워커 풀이 같이 사용)
+
+    options에 auto_rotate=True가 있으면 방향을 먼저 정하고 그 방향으로만 인식한다.
+    batch_size가 있으면 글자 영역들을 배치로 묶어 인식한다. (batch_recognition.readtext_batch)
+    """
+    options = dict(options)
+    batch_size = options.pop('batch_size', 0)
+    if batch_size:
+        from .batch_recognition import readtext_batch
+        return readtext_batch(reader, [image], options, batch_size)[0]
+    if options.pop('auto_rotate', False):
+        return readtext_auto_rotate(reader, image, **options)
+    return reader.readtext(image, **options)
+
+
+def readtext_auto_rotate(reader, image, **options):
+    """
+    페이지 방향을 한 번 판단한 뒤 그 방향으로만 OCR
+
+    rotation_info=[90, 180, 270]은 글자 영역마다 4방향을 모두 인식해서 인식 비용이 약 4배.
+    대부분 문서는 똑바로 스캔되어 있으므로 방향을 먼저 정하고, 결과 신뢰도가 낮을 때만
+    4방향 전체 시도로 돌아간다. 반환하는 좌표는 원본 이미지 기준.
+    """
+    from easyocr.utils import reformat_input
+    import numpy as np
+
+    img, img_grey = reformat_input(image)
+    k = detect_rotation(reader, img_grey)
+
+    upright = np.ascontiguousarray(np.rot90(img, k)) if k else img
+    result = reader.readtext(upright, **options)
+    if k:
+        height, width = img_grey.shape[:2]
+        result = [(unrotate_box(box, k, width, height), *rest) for box, *rest in result]
+
+    if result and mean_confidence(result) >= MIN_CONFIDENCE:
+        return result
+
+    # 방향 판단이 틀렸거나 글자가 섞여 있는 경우
+    swept = reader.readtext(img, rotation_info=SWEEP_ROTATION, **options)
+    if not result or mean_confidence(swept) > mean_confidence(result):
+        return swept
+    return result
+
+
+def detect_rotation(reader, img_grey):
+    """
+    이미지를 똑바로 세우려면 반시계 방향으로 몇 번 90° 돌려야 하는지 (0~3)
+
+    1. 줄인 이미지에서 글자 영역만 검출 → 세로로 긴 영역이 많으면 90°/270°, 아니면 0°/180°
+    2. 두 후보 방향으로 큰 글자 영역 몇 개만 인식해 보고 신뢰도가 높은 쪽 선택
+    """
+    import numpy as np
+
+    height, width = img_grey.shape[:2]
+    step = max(1, -(-max(height, width) // DETECT_SIDE))
+    small = np.ascontiguousarray(img_grey[::step, ::step])
+
+    horizontal_list, free_list = reader.detect(small)
+    boxes = [
+        (x_min * step, x_max * step, y_min * step, y_max * step)
+        for x_min, x_max, y_min, y_max in horizontal_list[0]
+    ]
+    for points in free_list[0]:
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        boxes.append((min(xs) * step, max(xs) * step, min(ys) * step, max(ys) * step))
+
+    boxes = [box for box in boxes if box[1] > box[0] and box[3] > box[2]]
+    if not boxes:
+        return 0
+
+    tall = sum(1 for x_min, x_max, y_min, y_max in boxes if y_max - y_min > x_max - x_min)
+    candidates = (1, 3) if tall > len(boxes) / 2 else (0, 2)
+
+    # 면적이 큰 글자 영역부터 몇 개만 잘라서 두 방향으로 인식
+    boxes.sort(key=lambda b: (b[1] - b[0]) * (b[3] - b[2]), reverse=True)
+    crops = [
+        img_grey[max(0, int(y_min)):int(y_max), max(0, int(x_min)):int(x_max)]
+        for x_min, x_max, y_min, y_max in boxes[:SAMPLE_BOXES]
+    ]
+    crops = [crop for crop in crops if crop.size]
+    if not crops:
+        return candidates[0]
+
+    def score(k):
+        total = 0.0
+        for crop in crops:
+            result = reader.recognize(np.ascontiguousarray(np.rot90(crop, k)))
+            total += max((conf for _, _, conf in result), default=0.0)
+        return total
+
+    return max(candidates, key=score)
+
+
+def unrotate_box(box, k, width, height):
+    """돌린 이미지 좌표의 꼭짓점들을 원본 이미지(width × height) 좌표로"""
+    points = []
+    for x, y in box:
+        if k == 1:
+            points.append([width - y, x])
+        elif k == 2:
+            points.append([width - x, height - y])
+        else:
+            points.append([y, height - x])
+    return points
+
+
+def mean_confidence(result):
+    return sum(conf for *_, conf in result) / len(result) if result else 0.0
@@ -0,0 +1,92 @@
+# 텍스트 레이어가 이보다 성기면(1제곱인치당 글자 수) 페이지 전체를 OCR
+MIN_TEXT_DENSITY = 2.0
+
+# 페이지 면적 대비 이보다 작은 이미지(로고, 아이콘 등)는 무시
+MIN_IMAGE_COVERAGE = 0.03
+
+# 이미지 영역 안에 이미 이만큼 텍스트가 있으면(스캔본 + OCR 텍스트 레이어) 다시 OCR하지 않음
+COVERED_TEXT_DENSITY = 2.0
+
+_POINTS_PER_INCH = 72
+
+
+class PageOCRPlan:
+    """페이지별 OCR 방식"""
+
+    NONE = 'none'        # 텍스트 레이어만 사용
+    FULL = 'full'        # 페이지 전체 OCR (텍스트 레이어 대신 사용)
+    REGIONS = 'regions'  # 텍스트 레이어 + 이미지 영역만 OCR
+
+    __slots__ = ('mode', 'clips')
+
+    def __init__(self, mode, clips=None):
+        self.mode = mode
+        self.clips = clips or []
+
+
+def _density(char_count, rect):
+    """1제곱인치당 글자 수"""
+    area = rect.width * rect.height / (_POINTS_PER_INCH ** 2)
+    return char_count / area if area > 0 else 0
+
+
+def _chars_inside(words, rect):
+    """단어 중심이 rect 안에 있는 단어들의 글자 수"""
+    count = 0
+    for word in words:
+        cx = (word[0] + word[2]) / 2
+        cy = (word[1] + word[3]) / 2
+        if rect.x0 <= cx <= rect.x1 and rect.y0 <= cy <= rect.y1:
+            count += len(word[4])
+    return count
+
+
+def plan_page_ocr(page, text):
+    """
+    텍스트 레이어 밀도와 이미지 면적으로 페이지 OCR 방식 결정
+
+    - 텍스트 레이어가 비었거나 성김 → 페이지 전체 OCR
+    - 텍스트는 충분하지만 텍스트가 없는 이미지가 있음 → 그 이미지 영역만 OCR
+    - 그 외 (일반 전자문서 페이지) → OCR 안 함
+
+    Args:
+        page: fitz.Page
+        text: page.get_text() 결과
+
+    Returns:
+        PageOCRPlan
+    """
+    import fitz  # pymupdf
+
+    page_rect = page.rect
+    page_area = page_rect.width * page_rect.height
+    if page_area <= 0:
+        return PageOCRPlan(PageOCRPlan.NONE)
+
+    char_count = len(''.join(text.split()))
+    if _density(char_count, page_rect) < MIN_TEXT_DENSITY:
+        return PageOCRPlan(PageOCRPlan.FULL)
+
+    # 이미지/단어 좌표는 회전 전 페이지 기준
+    unrotated_rect = page_rect * page.derotation_matrix
+    image_rects = []
+    for info in page.get_image_info():
+        rect = fitz.Rect(info['bbox']) & unrotated_rect
+        if rect.is_empty or rect.width * rect.height < page_area * MIN_IMAGE_COVERAGE:
+            continue
+        image_rects.append(rect)
+
+    if not image_rects:
+        return PageOCRPlan(PageOCRPlan.NONE)
+
+    # 이미지 안의 글자가 이미 텍스트 레이어에 있으면 OCR 불필요
+    words = page.get_text('words')
+    clips = [
+        rect for rect in image_rects
+        if _density(_chars_inside(words, rect), rect) < COVERED_TEXT_DENSITY
+    ]
+
+    if not clips:
+        return PageOCRPlan(PageOCRPlan.NONE)
+
+    return PageOCRPlan(PageOCRPlan.REGIONS, clips)
@@ -0,0 +1,203 @@
+import io
+
+from PIL import Image, ImageOps
+
+# EasyOCR 글자 영역 검출기가 긴 변을 이 크기로 줄여서 보므로 더 큰 해상도는 속도만 느려짐
+DEFAULT_MAX_SIDE = 2560
+
+# 렌더링했을 때 글자 줄 높이(픽셀) 목표 - 이보다 크게 그려도 인식률은 그대로고 느려지기만 함
+TARGET_LINE_HEIGHT = 24
+
+# 글자 높이를 재려고 미리 그려 보는 배율 (1.0 = 72dpi, 페이지 하나에 수 ms)
+_PROBE_ZOOM = 1.0
+
+
+class PreprocessOptions:
+    """
+    OCR 전 이미지 전처리 설정
+
+    Args:
+        max_side: 이미지/렌더링 결과의 긴 변 최대 픽셀 (넘으면 줄임)
+        min_zoom, max_zoom: PDF 렌더링 배율 범위
+        default_zoom: 글자 높이를 잴 수 없고 페이지에 이미지도 없을 때 배율
+        grayscale: 흑백으로 변환 (PDF는 처음부터 흑백으로 렌더링)
+        binarize: 흑백 + Otsu 이진화 (배경이 얼룩진 스캔본용)
+    """
+
+    def __init__(self, max_side=DEFAULT_MAX_SIDE, min_zoom=1.0, max_zoom=2.0, default_zoom=2.0,
+                 grayscale=False, binarize=False):
+        self.max_side = max_side
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.default_zoom = default_zoom
+        self.grayscale = grayscale or binarize
+        self.binarize = binarize
+
+
+def pdf_zoom(page, clip, options, max_bytes=None):
+    """
+    PDF 페이지(또는 clip 영역) 렌더링 배율
+
+    낮은 배율로 먼저 그려서 잰 글자 줄 높이가 TARGET_LINE_HEIGHT 픽셀이 되도록 맞추되,
+    영역 안 이미지의 원본 해상도보다 크게 그리지는 않는다. (스캔 이미지를 원본보다 크게 그려도
+    글자가 선명해지지 않음) 글자 높이를 잴 수 없으면 이미지 원본 해상도, 그것도 없으면 default_zoom.
+
+    Args:
+        clip: 회전 전 페이지 좌표 영역 또는 None(페이지 전체)
+        max_bytes: 렌더링 결과가 이 크기(바이트)를 넘지 않도록 배율을 낮춤
+    """
+    import fitz  # pymupdf
+
+    area = clip if clip is not None else page.rect * page.derotation_matrix
+
+    native = []
+    for info in page.get_image_info():
+        bbox = fitz.Rect(info['bbox'])
+        if bbox.is_empty or not bbox.intersects(area):
+            continue
+        native.append(max(info['width'] / bbox.width, info['height'] / bbox.height))
+
+    line_height = text_line_height(page, clip, options)
+    if line_height:
+        zoom = TARGET_LINE_HEIGHT / line_height
+        if native:
+            zoom = min(zoom, max(native))
+    else:
+        zoom = max(native) if native else options.default_zoom
+    zoom = min(max(zoom, options.min_zoom), options.max_zoom)
+
+    long_side = max(area.width, area.height)
+    if long_side > 0:
+        zoom = min(zoom, options.max_side / long_side)
+
+    if max_bytes and area.width * area.height > 0:
+        channels = 1 if options.grayscale else 3
+        zoom = min(zoom, (max_bytes / (area.width * area.height * channels)) ** 0.5)
+    return zoom
+
+
+def text_line_height(page, clip, options):
+    """
+    PDF 영역을 낮은 배율로 흑백 렌더링해서 잰 글자 줄 높이 (포인트, 잴 수 없으면 None)
+
+    가로 방향으로 어두운 픽셀이 있는 행이 이어진 구간을 글자 줄로 보고 (projection profile),
+    줄 간격이 좁아 붙은 줄이나 그림에 끌려가지 않도록 중앙값 대신 하위 25% 값을 쓴다.
+
+    Args:
+        clip: 회전 전 페이지 좌표 영역 또는 None(페이지 전체)
+    """
+    import fitz  # pymupdf
+    import numpy as np
+
+    area = clip * page.rotation_matrix if clip is not None else page.rect
+    long_side = max(area.width, area.height)
+    if long_side <= 0:
+        return None
+    zoom = min(_PROBE_ZOOM, options.max_side / long_side)
+
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=area, colorspace=fitz.csGRAY, alpha=False)
+    gray = np.asarray(_PixmapBuffer(pix))
+    if gray.size == 0:
+        return None
+
+    # 행마다 어두운 픽셀 수 (스캔 잡티는 무시하도록 너비의 0.5% 이상일 때만 글자 행)
+    dark = (gray < 128).sum(axis=1)
+    ink = np.concatenate(([False], dark >= max(2, gray.shape[1] // 200), [False]))
+    edges = np.flatnonzero(ink[1:] != ink[:-1])
+    runs = edges[1::2] - edges[::2]
+    runs = runs[runs >= 3]  # 표 선, 밑줄
+    if len(runs) == 0:
+        return None
+    return float(np.percentile(runs, 25)) / zoom
+
+
+class _PixmapBuffer:
+    """
+    pixmap 픽셀 메모리를 복사하지 않고 numpy 배열로 보여주는 래퍼
+
+    pix.samples_mv로 만든 배열은 pixmap이 먼저 지워지면 해제된 메모리를 가리키므로,
+    배열의 base가 이 객체(→ pixmap)를 붙잡고 있도록 __array_interface__로 넘긴다.
+    """
+
+    def __init__(self, pix):
+        self.pix = pix
+        if pix.n == 1:
+            shape, strides = (pix.height, pix.width), (pix.stride, 1)
+        else:
+            shape, strides = (pix.height, pix.width, pix.n), (pix.stride, pix.n, 1)
+        self.__array_interface__ = {
+            'shape': shape,
+            'typestr': '|u1',
+            'data': (pix.samples_ptr, False),
+            'strides': strides,
+            'version': 3,
+        }
+
+
+def render_pdf_region(page, clip, zoom, options):
+    """
+    PDF 페이지(clip은 회전된 화면 좌표)를 OCR 입력 배열로 렌더링
+
+    배열은 pixmap 메모리를 그대로 쓴다. (복사 없음, 배열이 지워질 때 pixmap도 해제)
+    """
+    import fitz  # pymupdf
+    import numpy as np
+
+    colorspace = fitz.csGRAY if options.grayscale else fitz.csRGB
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip, colorspace=colorspace, alpha=False)
+    img_array = np.asarray(_PixmapBuffer(pix))
+    if options.binarize:
+        img_array = binarize(img_array)
+    return img_array
+
+
+def prepare_image(source, options):
+    """
+    이미지 파일을 OCR 입력으로 준비
+
+    줄이거나 변환할 필요가 없으면 원본(경로/bytes)을 그대로 돌려줘서 readtext가 직접 디코딩한다.
+
+    Returns:
+        (readtext 입력, 배율) - 배율은 입력 이미지 크기 / 원본 크기 (좌표를 원본 기준으로 되돌릴 때 사용)
+    """
+    import numpy as np
+
+    image = Image.open(io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source)
+    scale = min(1.0, options.max_side / max(image.size))
+    if scale == 1.0 and not options.grayscale:
+        return source, 1.0
+
+    # OpenCV(readtext)와 같은 방향으로 (EXIF 회전 적용)
+    image = ImageOps.exif_transpose(image)
+    image = image.convert("L" if options.grayscale else "RGB")
+    if scale < 1.0:
+        # 회전 후 크기 기준으로 다시 계산
+        scale = min(1.0, options.max_side / max(image.size))
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        image = image.resize(size, Image.LANCZOS)
+
+    img_array = np.asarray(image)
+    if options.binarize:
+        img_array = binarize(img_array)
+    return img_array, scale
+
+
+def binarize(gray):
+    """흑백 배열을 Otsu 임계값으로 이진화 (0 / 255)"""
+    import numpy as np
+
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+
+    weight_bg = np.cumsum(hist)
+    weight_fg = gray.size - weight_bg
+    sum_bg = np.cumsum(hist * levels)
+    total_sum = sum_bg[-1]
+
+    valid = (weight_bg > 0) & (weight_fg > 0)
+    between = np.zeros(256)
+    between[valid] = (total_sum * weight_bg[valid] / gray.size - sum_bg[valid]) ** 2 / (
+        weight_bg[valid] * weight_fg[valid]
+    )
+    threshold = int(np.argmax(between))
+    return np.where(gray > threshold, 255, 0).astype(np.uint8)
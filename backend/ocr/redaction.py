@@ -0,0 +1,118 @@
+import io
+
+from PIL import Image, ImageDraw, ImageOps
+
+# 가림 색 (검정)
+FILL_COLOR = (0, 0, 0)
+
+# 가림 영역을 조금 넓혀서 글자 가장자리가 남지 않게 (PDF 포인트 / 이미지 픽셀)
+PDF_PADDING = 1
+IMAGE_PADDING = 2
+
+_IMAGE_FORMATS = {'png': 'PNG', 'jpg': 'JPEG', 'jpeg': 'JPEG'}
+
+
+class MissingPagesError(ValueError):
+    """추출한 페이지가 문서 페이지 수보다 적을 때 (빠진 페이지는 가릴 수 없으므로 가린 파일을 만들지 않음)"""
+
+
+def detected_spans(detection):
+    """탐지 결과(detect 반환값)의 모든 검출 위치 [(시작, 끝)] (전체 텍스트 기준)"""
+    spans = []
+    for data in detection.get('detected_items', {}).values():
+        spans.extend((start, end) for start, end in data.get('positions', []))
+    return sorted(spans)
+
+
+def page_boxes(layouts, spans):
+    """
+    전체 텍스트 기준 위치를 페이지별 가림 영역으로 변환
+
+    페이지 텍스트는 ' '로 이어 붙어 있다고 보고(detect_pages와 같은 기준) 위치를 나눈다.
+
+    Returns:
+        [[(x0, y0, x1, y1)]] (페이지 순)
+    """
+    boxes = [[] for _ in layouts]
+    offset = 0
+    for page_num, layout in enumerate(layouts):
+        page_end = offset + len(layout.text)
+        for start, end in spans:
+            if end <= offset or start >= page_end:
+                continue
+            boxes[page_num].extend(layout.boxes(max(start, offset) - offset, min(end, page_end) - offset))
+        offset = page_end + 1
+    return boxes
+
+
+def redact(source, filename, layouts, detection):
+    """
+    검출 위치를 가린 파일 생성 (OCR 없이 추출 때 기록한 위치만 사용)
+
+    Args:
+        source: 파일 경로 또는 bytes
+        filename: 형식 판단용 파일명
+        layouts: 추출한 [PageLayout]
+        detection: layouts 텍스트로 탐지한 결과
+
+    Returns:
+        (가린 파일 bytes, 가린 영역 수)
+
+    Raises:
+        MissingPagesError: layouts가 문서의 모든 페이지를 담고 있지 않을 때
+    """
+    boxes = page_boxes(layouts, detected_spans(detection))
+    count = sum(len(page) for page in boxes)
+    ext = str(filename).rsplit('.', 1)[-1].lower()
+
+    if ext == 'pdf':
+        return redact_pdf(source, boxes), count
+    if not boxes:
+        raise MissingPagesError('이미지에서 추출한 결과가 없습니다')
+    return redact_image(source, boxes[0], ext), count
+
+
+def redact_pdf(source, boxes):
+    """PDF 가림 주석을 달고 적용 (가린 부분의 글자/이미지 픽셀은 실제로 지워짐)"""
+    import fitz  # pymupdf
+
+    if isinstance(source, (bytes, bytearray)):
+        doc = fitz.open(stream=source, filetype='pdf')
+    else:
+        doc = fitz.open(source)
+
+    try:
+        if len(boxes) < doc.page_count:
+            raise MissingPagesError(f'{doc.page_count}페이지 중 {len(boxes)}페이지만 추출되었습니다')
+        for page_num, page_rects in enumerate(boxes):
+            if not page_rects:
+                continue
+            page = doc[page_num]
+            for box in page_rects:
+                rect = fitz.Rect(box) + (-PDF_PADDING, -PDF_PADDING, PDF_PADDING, PDF_PADDING)
+                page.add_redact_annot(rect, fill=FILL_COLOR)
+            page.apply_redactions(images=fitz.PDF_REDACT_IMAGE_PIXELS)
+        return doc.tobytes(garbage=3, deflate=True)
+    finally:
+        doc.close()
+
+
+def redact_image(source, boxes, ext):
+    """이미지에 가림 사각형을 칠해서 같은 형식으로 저장"""
+    image = Image.open(io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source)
+    # OCR(OpenCV)과 같은 방향으로 (EXIF 회전 적용)
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    draw = ImageDraw.Draw(image)
+    fill = FILL_COLOR if image.mode == 'RGB' else 0
+    for x0, y0, x1, y1 in boxes:
+        draw.rectangle(
+            [x0 - IMAGE_PADDING, y0 - IMAGE_PADDING, x1 + IMAGE_PADDING, y1 + IMAGE_PADDING],
+            fill=fill
+        )
+
+    output = io.BytesIO()
+    image.save(output, format=_IMAGE_FORMATS.get(ext, 'PNG'))
+    return output.getvalue()
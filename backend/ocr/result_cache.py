@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+# 추출 방식이 바뀌면 올려서 이전 캐시를 무효화
+CACHE_VERSION = 3  # 2: 페이지 텍스트 대신 PageLayout 저장, 3: 한 줄에 한 페이지(NDJSON)
+
+_CHUNK_SIZE = 1024 * 1024
+
+# max_bytes를 넘으면 이 비율까지 지움 (꽉 찬 뒤 저장할 때마다 폴더 전체를 훑지 않도록)
+_EVICT_TARGET = 0.9
+
+
+def hash_content(source):
+    """파일 내용 SHA-256 (bytes 또는 파일 경로, 큰 파일은 조금씩 읽어서 계산)"""
+    if isinstance(source, (bytes, bytearray)):
+        return hashlib.sha256(source).hexdigest()
+
+    digest = hashlib.sha256()
+    with open(source, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OCRResultCache:
+    """
+    파일 내용 기준 OCR 결과 캐시 (로컬 디스크)
+
+    같은 파일을 다시 올리면 OCR을 건너뛰고 저장해 둔 페이지별 결과를 돌려준다.
+    키는 파일 내용 해시 + OCR 옵션이라 파일명이 달라도 같은 내용이면 재사용하고,
+    탐지 설정은 키에 들어가지 않으므로 설정이 바뀌어도 탐지만 다시 하면 된다.
+    항목 하나는 한 줄에 한 페이지인 NDJSON 파일이라 쓸 때도 읽을 때도 문서 전체를 메모리에 올리지 않는다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 안 쓴 항목부터 지운다 (LRU, 파일 mtime 기준).
+
+    전체 크기는 처음 저장할 때 한 번 훑어서 구하고 이후에는 저장할 때마다 더해 가며 추정한다.
+    추정값이 max_bytes를 넘을 때만 폴더를 다시 훑어서 지우고 추정값도 실제 크기로 맞춘다.
+    (같은 폴더를 쓰는 다른 프로세스가 저장한 만큼은 그때 반영됨)
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = str(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None  # 캐시 폴더 전체 크기 추정값 (처음 저장할 때 구함)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(content_hash, **options):
+        """파일 해시 + OCR 옵션으로 캐시 키 생성"""
+        payload = json.dumps(
+            {'v': CACHE_VERSION, 'hash': content_hash, 'options': options},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f'{key}.ndjson')
+
+    def get_pages(self, key):
+        """
+        캐시 조회
+
+        Returns:
+            (페이지 수, 페이지 dict를 하나씩 읽어 주는 제너레이터) 또는 None
+        """
+        path = self._path(key)
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            return None
+
+        # 최근 사용 시각 갱신 (LRU)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        # 연 파일로 읽으므로 그 사이 지워져도(eviction) 끝까지 읽을 수 있음
+        page_count = sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''))
+        f.seek(0)
+        return page_count, _read_pages(f)
+
+    def page_writer(self, key):
+        """페이지를 하나씩 쓰는 CacheWriter (commit해야 캐시에 들어감)"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return CacheWriter(self, path)
+
+    def _commit(self, tmp_path, path):
+        """다 쓴 임시 파일을 항목으로 교체 (읽는 쪽이 쓰다 만 파일을 보지 않도록) + 크기 정리"""
+        old_size = _file_size(path)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._size is not None:
+                self._size += _file_size(path) - old_size
+            if self._size is None or self._size > self.max_bytes:
+                self._size = self._evict()
+
+    def _evict(self):
+        """
+        폴더를 훑어서 전체 크기가 max_bytes를 넘으면 오래 안 쓴 것부터 삭제 (_lock 안에서 호출)
+
+        Returns:
+            남은 전체 크기
+        """
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                # .json은 이전 버전 항목 (쓰이지 않으므로 오래된 것부터 지워짐)
+                if not name.endswith(('.ndjson', '.json')):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        if total <= self.max_bytes:
+            return total
+
+        target = self.max_bytes * _EVICT_TARGET
+        entries.sort()
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        return total
+
+
+class CacheWriter:
+    """
+    캐시 항목 하나를 페이지별로 쓰기 (OCRResultCache.page_writer)
+
+    임시 파일에 한 줄씩 쓰고 commit()하면 항목으로 교체한다.
+    commit하지 않고 close()하면 (중간에 멈추거나 실패) 쓰던 파일은 지운다.
+    """
+
+    def __init__(self, cache, path):
+        self._cache = cache
+        self._path = path
+        fd, self._tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        self._file = os.fdopen(fd, 'w', encoding='utf-8')
+
+    def write(self, page):
+        """페이지 dict 하나 추가"""
+        self._file.write(json.dumps(page, ensure_ascii=False))
+        self._file.write('\n')
+
+    def commit(self):
+        self._file.close()
+        try:
+            self._cache._commit(self._tmp_path, self._path)
+        finally:
+            self.close()
+
+    def close(self):
+        """commit 안 했으면 쓰던 파일 삭제 (여러 번 불러도 됨)"""
+        self._file.close()
+        if os.path.exists(self._tmp_path):
+            try:
+                os.remove(self._tmp_path)
+            except OSError:
+                pass
+
+
+def _read_pages(f):
+    """열린 NDJSON 파일에서 페이지 dict를 하나씩 (다 읽거나 중간에 닫히면 파일도 닫음)"""
+    with f:
+        for line in f:
+            yield json.loads(line)
+
+
+def _file_size(path):
+    """파일 크기 (없으면 0)"""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
@@ -0,0 +1,195 @@
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from .batch_recognition import run_readtext_batch
+from .orientation import run_readtext
+
+# 워커 프로세스마다 하나씩 보유하는 EasyOCR Reader
+_reader = None
+
+
+class OCRPoolBusyError(RuntimeError):
+    """대기열이 가득 차서 작업을 받을 수 없을 때"""
+
+
+def _init_worker(threads, model_dir=None, backend='easyocr', onnx_dir=None):
+    """워커 프로세스 시작 시 한 번 실행: 모델 로드 + 스레드 수 제한"""
+    global _reader
+
+    import torch
+    torch.set_num_threads(threads)
+
+    if _reader is None:
+        from .ocr_engine import create_reader
+        _reader = create_reader(model_dir, backend, onnx_dir)
+
+
+def preload_reader(reader):
+    """
+    fork 전에 이 프로세스에서 만든 Reader를 등록 (OCREngine.preload)
+
+    이후 만드는 풀의 워커들은 모델을 다시 로드하지 않고 이 Reader를 물려받는다.
+    """
+    global _reader
+    _reader = reader
+
+
+def _ping():
+    return os.getpid()
+
+
+def _run_readtext(image, options):
+    return run_readtext(_reader, image, options)
+
+
+def _run_readtext_batch(images, options):
+    return run_readtext_batch(_reader, images, options)
+
+
+class OCRWorkerPool:
+    """
+    EasyOCR Reader를 미리 올려둔 워커 프로세스 풀
+
+    Flask 요청 스레드들이 하나의 Reader를 나눠 쓰면 CPU를 한 코어밖에 못 쓰므로
+    워커마다 Reader를 하나씩 들고 작업(이미지 경로 / 페이지 배열)을 나눠 처리한다.
+
+    워커가 죽으면 (메모리 부족 등) 그때 풀에 있던 작업만 실패하고 풀은 같은 설정으로 다시 띄운다.
+    다시 띄우는 동안은 broken이 True (준비 안 됨으로 보고)이고, 그 사이 들어온 작업은 새 풀에 넣는다.
+    """
+
+    def __init__(self, workers, max_backlog=None, threads_per_worker=None, model_dir=None,
+                 backend='easyocr', onnx_dir=None):
+        """
+        Args:
+            workers: 워커 프로세스 수
+            max_backlog: 실행 중인 작업 외에 대기할 수 있는 최대 작업 수 (기본: 워커 수 × 2)
+            threads_per_worker: 워커별 torch 스레드 수 (기본: 코어 수 / 워커 수)
+            model_dir: EasyOCR 모델 폴더 (create_reader 참고)
+            backend, onnx_dir: OCR 백엔드 (create_reader 참고)
+        """
+        if 'fork' not in mp.get_all_start_methods():
+            # spawn 방식은 app.py를 다시 import하므로 fork가 되는 환경에서만 지원
+            raise RuntimeError("OCR 워커 풀은 fork를 지원하는 환경(Linux)에서만 사용할 수 있습니다")
+
+        self.workers = workers
+        self.max_backlog = max_backlog if max_backlog is not None else workers * 2
+        threads = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_backlog)
+        self._initargs = (threads, model_dir, backend, onnx_dir)
+        self._rebuild_lock = threading.Lock()
+        self._closed = False
+        self.broken = False  # 워커가 죽어서 풀을 다시 띄우는 중 (또는 다시 띄우지 못함)
+
+        # 요청 스레드가 생기기 전에 워커를 모두 띄워둠 (첫 요청에서 모델 로딩 안 하도록)
+        self._executor = self._create_executor()
+
+    def _create_executor(self):
+        """워커 프로세스 풀을 띄우고 모든 워커가 준비될 때까지 대기"""
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp.get_context('fork'),
+            initializer=_init_worker,
+            initargs=self._initargs
+        )
+        try:
+            executor.submit(_ping).result()
+        except Exception:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        return executor
+
+    def _rebuild(self, broken_executor):
+        """
+        죽은 풀(broken_executor)을 같은 설정으로 다시 띄움 (다른 스레드가 이미 바꿨으면 그대로)
+
+        Returns:
+            다시 띄웠거나 이미 바뀐 풀이 있으면 True, 다시 띄우지 못했으면 False (다음 작업 때 다시 시도)
+        """
+        with self._rebuild_lock:
+            if self._closed:
+                return False
+            if self._executor is not broken_executor:
+                return True
+
+            self.broken = True
+            print("⚠️ OCR 워커가 종료되어 워커 풀을 다시 띄웁니다")
+            try:
+                executor = self._create_executor()
+            except Exception as e:
+                print(f"❌ OCR 워커 풀을 다시 띄우지 못함: {e}")
+                return False
+
+            self._executor = executor
+            self.broken = False
+            print("✅ OCR 워커 풀 복구 완료")
+        broken_executor.shutdown(wait=False)
+        return True
+
+    def _on_done(self, executor, future):
+        self._slots.release()
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            # 완료 콜백은 풀의 관리 스레드에서 불리므로 다시 띄우는 건 다른 스레드에서
+            self.broken = True
+            threading.Thread(target=self._rebuild, args=(executor,), name='ocr-pool-rebuild', daemon=True).start()
+
+    def submit(self, image, timeout=None, **options):
+        """
+        OCR 작업 제출
+
+        대기열이 가득 차 있으면 자리가 날 때까지 기다리고,
+        timeout 안에 자리가 나지 않으면 OCRPoolBusyError
+
+        Returns:
+            Future (결과는 reader.readtext와 동일)
+        """
+        return self._submit(_run_readtext, image, options, timeout)
+
+    def submit_batch(self, images, timeout=None, **options):
+        """
+        이미지 여러 장을 워커 하나에서 한 번에 OCR (글자 영역을 모아 배치로 인식, run_readtext_batch)
+
+        Returns:
+            Future (결과는 이미지별 readtext 결과 리스트)
+        """
+        return self._submit(_run_readtext_batch, images, options, timeout)
+
+    def _submit(self, fn, payload, options, timeout):
+        if self._closed:
+            raise RuntimeError("OCR 워커 풀이 이미 종료되었습니다")
+
+        if not self._slots.acquire(timeout=timeout):
+            raise OCRPoolBusyError("OCR 대기열이 가득 찼습니다")
+
+        try:
+            executor = self._executor
+            try:
+                future = executor.submit(fn, payload, options)
+            except BrokenProcessPool:
+                # 워커가 죽은 걸 아직 못 본 풀 → 다시 띄우고 한 번만 다시 넣음
+                if not self._rebuild(executor):
+                    raise
+                executor = self._executor
+                future = executor.submit(fn, payload, options)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(partial(self._on_done, executor))
+        return future
+
+    def readtext(self, image, **options):
+        """reader.readtext와 같은 방식으로 호출 (결과가 나올 때까지 대기)"""
+        return self.submit(image, **options).result()
+
+    def shutdown(self, wait=True):
+        """대기 중인 작업은 취소하고 워커 종료"""
+        if self._closed:
+            return
+        with self._rebuild_lock:
+            self._closed = True
+        self._executor.shutdown(wait=wait, cancel_futures=True)
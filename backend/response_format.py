@@ -0,0 +1,99 @@
+import gzip
+import json
+
+from flask import Response, request
+
+from metrics import timed
+
+try:
+    import msgpack
+except ImportError:  # 선택 설치 (pip install msgpack)
+    msgpack = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack')
+
+# 이보다 작은 응답은 gzip 하지 않음 (압축 이득보다 CPU가 아까움)
+GZIP_MIN_SIZE = 1024
+GZIP_LEVEL = 5
+
+# 탐지 결과 중 compact 형식에서 최상위로 올리는 항목 (detection / 중복 최상위 항목 대신)
+_DUPLICATED_KEYS = ('detection', 'classification', 'risk_score', 'detected_items')
+
+
+def wants_compact():
+    """
+    compact 응답 형식을 요청했는지 (format=compact, 폼 또는 쿼리)
+
+    compact 형식은 detection과 최상위 항목의 중복이 없고,
+    추출 텍스트(includeText=true)와 원본 값(includeRaw=true)은 요청할 때만 넣는다.
+    """
+    return request.values.get('format', 'full').lower() == 'compact'
+
+
+def wants_raw():
+    """compact 형식에서 마스킹 전 원본 값(raw)도 달라고 했는지 (includeRaw=true)"""
+    return request.values.get('includeRaw', 'false').lower() == 'true'
+
+
+def compact_result(result, include_raw=False):
+    """
+    analyze_source 결과 → compact 형식
+
+    detection 안의 항목(classification, risk_score, total_count, pages_scanned 등)을 최상위에 한 번만 두고,
+    타입별 검출 결과는 count, items(마스킹), positions만 (include_raw면 raw도)
+
+    예: {"success": true, "filename": "a.pdf", "extracted_text_length": 1234,
+         "classification": "주의", "risk_score": 40, "total_count": 2, "pages_scanned": 3, ...,
+         "detected_items": {"phoneNumber": {"count": 2, "items": [...], "positions": [[10, 23], ...]}}}
+    """
+    detection = result['detection']
+    compact = {key: value for key, value in result.items() if key not in _DUPLICATED_KEYS}
+    compact.update((key, value) for key, value in detection.items() if key != 'detected_items')
+
+    detected_items = {}
+    for pii_type, data in detection['detected_items'].items():
+        item = {'count': data['count'], 'items': data['items'], 'positions': data['positions']}
+        if include_raw:
+            item['raw'] = data['raw']
+        detected_items[pii_type] = item
+    compact['detected_items'] = detected_items
+    return compact
+
+
+def encode_response(payload, status=200):
+    """
+    요청의 Accept / Accept-Encoding에 맞춰 응답 생성
+
+    - Accept: application/msgpack (또는 application/x-msgpack)이고 msgpack이 설치돼 있으면 MessagePack,
+      아니면 JSON (한글을 \\uXXXX로 바꾸지 않아 jsonify보다 작음)
+    - msgpack이 설치돼 있지 않은데 Accept가 MessagePack만 받으면 (JSON은 안 받으면) 406
+    - Accept-Encoding에 gzip이 있고 GZIP_MIN_SIZE 이상이면 gzip 압축
+    """
+    accept = request.accept_mimetypes
+    if msgpack is not None:
+        mimetype = accept.best_match((JSON_MIMETYPE, *MSGPACK_MIMETYPES), JSON_MIMETYPE)
+    elif accept.best_match((JSON_MIMETYPE,)) is None and accept.best_match(MSGPACK_MIMETYPES) is not None:
+        # 모르게 JSON으로 보내면 클라이언트가 MessagePack으로 풀다가 실패하므로
+        error = {'error': 'MessagePack 응답을 쓰려면 서버에 msgpack을 설치해야 합니다 (pip install msgpack)'}
+        response = Response(json.dumps(error, ensure_ascii=False), status=406, mimetype=JSON_MIMETYPE)
+        response.vary.add('Accept')
+        return response
+    else:
+        mimetype = JSON_MIMETYPE
+
+    with timed('response_encode'):
+        if mimetype == JSON_MIMETYPE:
+            body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        else:
+            body = msgpack.packb(payload, use_bin_type=True)
+
+        gzipped = len(body) >= GZIP_MIN_SIZE and request.accept_encodings['gzip'] > 0
+        if gzipped:
+            body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+    response = Response(body, status=status, mimetype=mimetype)
+    if gzipped:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.vary.update(('Accept', 'Accept-Encoding'))
+    return response
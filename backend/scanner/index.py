@@ -0,0 +1,168 @@
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT,
+    config TEXT NOT NULL,
+    status TEXT NOT NULL,
+    classification TEXT,
+    risk_score REAL,
+    total_count INTEGER,
+    detected TEXT,
+    pages INTEGER,
+    error TEXT,
+    scanned_at REAL NOT NULL,
+    run_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_sha256 ON files (sha256, config);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    roots TEXT NOT NULL,
+    config TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    stats TEXT
+);
+"""
+
+# 결과 상태
+OK = 'ok'
+ERROR = 'error'
+SKIPPED = 'skipped'  # 너무 큰 파일 등
+
+
+class ScanIndex:
+    """
+    파일별 스캔 결과 인덱스 (SQLite)
+
+    경로, 크기, 수정 시각, 내용 해시와 분류/위험도/타입별 검출 개수를 기록한다.
+    (검출된 값 자체는 저장하지 않음)
+    다시 스캔할 때 크기 + 수정 시각 + 탐지 설정(config)이 같으면 바뀌지 않은 파일로 보고 건너뛴다.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._conn = sqlite3.connect(self.path)
+        # 스캔 중에도 워커(ScanIndexReader)가 읽을 수 있도록
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+    def start_run(self, roots, config):
+        cursor = self._conn.execute(
+            'INSERT INTO runs (roots, config, started_at) VALUES (?, ?, ?)',
+            (json.dumps(roots, ensure_ascii=False), config, time.time())
+        )
+        self._conn.commit()
+        return cursor.lastrowid
+
+    def finish_run(self, run_id, stats):
+        self._conn.execute(
+            'UPDATE runs SET finished_at = ?, stats = ? WHERE id = ?',
+            (time.time(), json.dumps(stats), run_id)
+        )
+        self._conn.commit()
+
+    def lookup(self, path):
+        """
+        Returns:
+            (size, mtime_ns, sha256, config, status) 또는 None
+        """
+        return self._conn.execute(
+            'SELECT size, mtime_ns, sha256, config, status FROM files WHERE path = ?', (path,)
+        ).fetchone()
+
+    def mark_seen(self, paths, run_id):
+        """바뀌지 않아서 건너뛴 파일도 이번 실행에서 본 것으로 기록 (prune 대상에서 제외)"""
+        self._conn.executemany('UPDATE files SET run_id = ? WHERE path = ?', [(run_id, p) for p in paths])
+
+    def record(self, rows):
+        """
+        스캔 결과 저장
+
+        Args:
+            rows: [dict] (path, size, mtime_ns, sha256, config, status, run_id 필수,
+                  classification, risk_score, total_count, detected, pages, error 선택)
+        """
+        self._conn.executemany(
+            'INSERT OR REPLACE INTO files (path, size, mtime_ns, sha256, config, status, classification, '
+            'risk_score, total_count, detected, pages, error, scanned_at, run_id) '
+            'VALUES (:path, :size, :mtime_ns, :sha256, :config, :status, :classification, '
+            ':risk_score, :total_count, :detected, :pages, :error, :scanned_at, :run_id)',
+            [_row_defaults(row) for row in rows]
+        )
+
+    def commit(self):
+        self._conn.commit()
+
+    def prune(self, roots, run_id):
+        """
+        roots 아래에서 이번 실행에 안 보인 파일(삭제/이동) 기록 삭제
+
+        Returns:
+            지운 개수
+        """
+        removed = 0
+        for root in roots:
+            prefix = os.path.join(root, '')
+            # LIKE는 _ % 를 특수 문자로 보므로 앞부분 비교로
+            cursor = self._conn.execute(
+                'DELETE FROM files WHERE run_id != ? AND substr(path, 1, ?) = ?',
+                (run_id, len(prefix), prefix)
+            )
+            removed += cursor.rowcount
+        self._conn.commit()
+        return removed
+
+
+class ScanIndexReader:
+    """
+    스캔 워커 프로세스용 읽기 전용 연결
+
+    같은 내용(해시)의 파일을 같은 설정으로 이미 스캔했으면 그 결과를 재사용하기 위함
+    (공유 드라이브에는 같은 파일의 사본이 많음)
+    """
+
+    def __init__(self, path):
+        self._conn = sqlite3.connect(f'{Path(path).resolve().as_uri()}?mode=ro', uri=True)
+
+    def find_by_hash(self, sha256, config):
+        """
+        Returns:
+            결과 dict (classification, risk_score, total_count, detected, pages) 또는 None
+        """
+        row = self._conn.execute(
+            'SELECT classification, risk_score, total_count, detected, pages FROM files '
+            'WHERE sha256 = ? AND config = ? AND status = ? LIMIT 1',
+            (sha256, config, OK)
+        ).fetchone()
+        if row is None:
+            return None
+        classification, risk_score, total_count, detected, pages = row
+        return {
+            'classification': classification,
+            'risk_score': risk_score,
+            'total_count': total_count,
+            'detected': detected,
+            'pages': pages,
+        }
+
+
+def _row_defaults(row):
+    return {
+        'classification': None, 'risk_score': None, 'total_count': None,
+        'detected': None, 'pages': None, 'error': None, 'scanned_at': time.time(),
+        **row
+    }
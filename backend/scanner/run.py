@@ -0,0 +1,332 @@
+"""
+공유 드라이브 민감정보 일괄 스캔 (증분)
+
+backend 폴더에서 실행:
+    python -m scanner.run /mnt/share1 /mnt/share2 --index scan_index.db
+    python -m scanner.run /mnt/share --enable-pdf-ocr --settings settings.json --prune
+
+폴더를 돌면서 파일마다 OCR + 탐지 결과를 SQLite 인덱스에 기록한다.
+다시 실행하면 크기/수정 시각이 그대로인 파일은 건너뛰고, 내용이 같은 파일(사본)은
+이전 결과를 재사용해서 새로 생기거나 바뀐 파일만 처리한다.
+OCR 설정(OCR_MAX_SIDE 등)은 서버와 같은 환경 변수를 읽는다.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from detector.pii_detector import PIIDetector
+from ocr.ocr_engine import OCREngine
+from ocr.result_cache import hash_content
+from settings import Settings
+from .index import ERROR, OK, SKIPPED, ScanIndex, ScanIndexReader
+
+# app.py ALLOWED_EXTENSIONS와 같음
+EXTENSIONS = ('.png', '.jpg', '.jpeg', '.pdf')
+
+# 결과 형식이 바뀌면 올려서 이전 인덱스 기록을 다시 스캔
+SCAN_VERSION = 1
+
+# 결과를 이 개수 또는 시간(초)마다 인덱스에 저장
+FLUSH_ROWS = 500
+FLUSH_SECONDS = 5
+
+PROGRESS_SECONDS = 10
+
+# 워커 프로세스마다 하나씩 (fork면 부모가 미리 올린 OCREngine을 물려받음)
+_engine = None
+_detector = None
+_index = None
+_options = None
+
+
+def walk(roots):
+    """roots 아래 스캔 대상 파일 (경로, stat) 을 하나씩 반환 (심볼릭 링크는 따라가지 않음)"""
+    stack = list(reversed(roots))
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                entries = sorted(entries, key=lambda entry: entry.name)
+        except OSError as e:
+            print(f"⚠️ 폴더를 읽을 수 없음: {directory} ({e})", file=sys.stderr)
+            continue
+
+        subdirectories = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                elif entry.is_file(follow_symlinks=False) and entry.name.lower().endswith(EXTENSIONS):
+                    yield entry.path, entry.stat(follow_symlinks=False)
+            except OSError as e:
+                print(f"⚠️ 파일 정보를 읽을 수 없음: {entry.path} ({e})", file=sys.stderr)
+        stack.extend(reversed(subdirectories))
+
+
+def config_key(settings, enable_pdf_ocr, stop_early, engine_options):
+    """결과에 영향을 주는 설정 해시 (바뀌면 모든 파일을 다시 스캔)"""
+    payload = json.dumps({
+        'v': SCAN_VERSION,
+        'settings': settings,
+        'enable_pdf_ocr': enable_pdf_ocr,
+        'stop_early': stop_early,
+        'preprocess': vars(engine_options['preprocess']),
+        'rotation': engine_options['rotation'],
+        # 기본 백엔드는 넣지 않음 (백엔드 설정 전에 만든 인덱스를 다시 스캔하지 않도록)
+        **({'backend': engine_options['backend']} if engine_options['backend'] != 'easyocr' else {}),
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def is_unchanged(previous, stat, config, max_size, retry_errors=False):
+    """
+    인덱스 기록(previous, ScanIndex.lookup 결과) 이후 다시 스캔할 필요가 없는지
+
+    크기/수정 시각/설정이 그대로여도 크기 때문에 건너뛴 파일은 지금 제한(max_size)으로 다시 보고,
+    retry_errors면 실패한 파일도 다시 스캔한다.
+    """
+    size, mtime_ns, _, previous_config, status = previous
+    if (size, mtime_ns, previous_config) != (stat.st_size, stat.st_mtime_ns, config):
+        return False
+    if status == SKIPPED:
+        return stat.st_size > max_size
+    return status != ERROR or not retry_errors
+
+
+def _init_worker(index_path, options, engine_options, torch_threads):
+    """워커 프로세스 시작 시 한 번: OCR 모델 준비 + 인덱스 읽기 연결"""
+    global _engine, _detector, _index, _options
+
+    if _engine is None:
+        # spawn 방식(Windows 등)은 모델을 직접 로드
+        _engine = OCREngine(**{**engine_options, 'warmup': 'lazy'})
+    _engine.torch_threads = torch_threads
+    _engine.load()
+
+    _detector = PIIDetector()
+    _index = ScanIndexReader(index_path)
+    _options = options
+
+
+def _scan_file(path):
+    """파일 하나 스캔 (워커에서 실행) → 인덱스에 저장할 값"""
+    try:
+        sha256 = hash_content(path)
+    except OSError as e:
+        return {'status': ERROR, 'sha256': None, 'error': str(e)}
+
+    # 같은 내용을 같은 설정으로 스캔한 적 있음 (사본, 또는 수정 시각만 바뀐 파일)
+    previous = _index.find_by_hash(sha256, _options['config'])
+    if previous is not None:
+        return {'status': OK, 'sha256': sha256, 'reused': True, **previous}
+
+    try:
+        pages = _engine.iter_pages(path, _options['enable_pdf_ocr'], filename=path)
+        result = _detector.detect_pages(pages, _options['settings'], stop_early=_options['stop_early'])
+    except Exception as e:
+        return {'status': ERROR, 'sha256': sha256, 'error': str(e)}
+
+    detected = {
+        pii_type: item['count']
+        for pii_type, item in result['detected_items'].items()
+        if item.get('count')
+    }
+    return {
+        'status': OK,
+        'sha256': sha256,
+        'classification': result['classification'],
+        'risk_score': result['risk_score'],
+        'total_count': result['total_count'],
+        'detected': json.dumps(detected, ensure_ascii=False),
+        'pages': result['pages_scanned'],
+    }
+
+
+def _create_pool(args, index_path, options, engine_options):
+    """
+    스캔 워커 프로세스 풀
+
+    fork가 되면 부모에서 OCR 모델을 한 번 올리고 fork해서 워커들이 모델 메모리를 나눠 쓴다.
+    """
+    torch_threads = max(1, (os.cpu_count() or 1) // args.workers)
+    initargs = (index_path, options, engine_options, torch_threads)
+
+    if 'fork' in mp.get_all_start_methods():
+        global _engine
+        _engine = OCREngine(**{**engine_options, 'warmup': 'preload'})
+        return ProcessPoolExecutor(
+            max_workers=args.workers, mp_context=mp.get_context('fork'),
+            initializer=_init_worker, initargs=initargs
+        )
+    return ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=initargs)
+
+
+def scan(args):
+    roots = [os.path.abspath(root) for root in args.roots]
+    settings = {}
+    if args.settings:
+        with open(args.settings, encoding='utf-8') as f:
+            settings = json.load(f)
+
+    # 스캔 워커가 각자 OCR하므로 서버의 OCR 워커 풀은 쓰지 않음
+    engine_options = {**Settings.from_env().ocr_engine_options(), 'workers': 0}
+    config = config_key(settings, args.enable_pdf_ocr, args.stop_early, engine_options)
+    options = {
+        'config': config,
+        'settings': settings,
+        'enable_pdf_ocr': args.enable_pdf_ocr,
+        'stop_early': args.stop_early,
+    }
+    max_size = args.max_size_mb * 1024 * 1024
+
+    index = ScanIndex(args.index)
+    run_id = index.start_run(roots, config)
+    stats = dict.fromkeys(('found', 'unchanged', 'scanned', 'reused', 'errors', 'skipped'), 0)
+
+    rows = []   # 저장할 결과
+    seen = []   # 바뀌지 않은 파일 경로
+    last_flush = last_progress = started = time.monotonic()
+
+    def flush(force=False):
+        nonlocal last_flush
+        if not force and len(rows) + len(seen) < FLUSH_ROWS and time.monotonic() - last_flush < FLUSH_SECONDS:
+            return
+        index.record(rows)
+        index.mark_seen(seen, run_id)
+        index.commit()
+        rows.clear()
+        seen.clear()
+        last_flush = time.monotonic()
+
+    def report_progress(force=False):
+        nonlocal last_progress
+        now = time.monotonic()
+        if not force and now - last_progress < PROGRESS_SECONDS:
+            return
+        last_progress = now
+        processed = stats['scanned'] + stats['reused'] + stats['errors']
+        print(
+            f"📂 {stats['found']:,}개 확인: 변경 없음 {stats['unchanged']:,}, 스캔 {stats['scanned']:,}, "
+            f"재사용 {stats['reused']:,}, 오류 {stats['errors']:,}, 건너뜀 {stats['skipped']:,} "
+            f"({processed / max(now - started, 1e-9):.1f}개/s)",
+            file=sys.stderr
+        )
+
+    def collect(done):
+        for future in done:
+            path, size, mtime_ns = in_flight.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                # 워커 프로세스가 죽은 경우 등
+                result = {'status': ERROR, 'sha256': None, 'error': str(e)}
+
+            if result['status'] == ERROR:
+                stats['errors'] += 1
+                print(f"❌ 스캔 실패: {path} ({result['error']})", file=sys.stderr)
+            elif result.pop('reused', False):
+                stats['reused'] += 1
+            else:
+                stats['scanned'] += 1
+            rows.append({
+                **result, 'path': path, 'size': size, 'mtime_ns': mtime_ns, 'config': config, 'run_id': run_id,
+            })
+
+    print(f"🔎 스캔 시작: {', '.join(roots)} (워커 {args.workers}개, 인덱스 {args.index})", file=sys.stderr)
+    in_flight = {}  # Future → (경로, 크기, 수정 시각)
+    interrupted = False
+    pool = _create_pool(args, index.path, options, engine_options)
+    try:
+        for path, stat in walk(roots):
+            stats['found'] += 1
+
+            previous = index.lookup(path)
+            if previous is not None:
+                if is_unchanged(previous, stat, config, max_size, args.retry_errors):
+                    stats['unchanged'] += 1
+                    seen.append(path)
+                    flush()
+                    report_progress()
+                    continue
+
+            if stat.st_size > max_size:
+                stats['skipped'] += 1
+                rows.append({
+                    'path': path, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': None,
+                    'config': config, 'status': SKIPPED, 'error': f'{args.max_size_mb}MB 초과', 'run_id': run_id,
+                })
+                continue
+
+            in_flight[pool.submit(_scan_file, path)] = (path, stat.st_size, stat.st_mtime_ns)
+
+            # 수백만 개를 한꺼번에 넣지 않도록 워커 수의 몇 배만 넘겨둠
+            if len(in_flight) >= args.workers * 4:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+                flush()
+                report_progress()
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            collect(done)
+            flush()
+            report_progress()
+
+    except KeyboardInterrupt:
+        # 끝난 결과까지는 저장 (다음 실행 때 이어서)
+        interrupted = True
+        print("⏹️ 중단: 끝난 결과까지 저장합니다", file=sys.stderr)
+        for future in in_flight:
+            future.cancel()
+
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        if interrupted:
+            collect([f for f in list(in_flight) if f.done() and not f.cancelled()])
+        flush(force=True)
+
+    if args.prune and not interrupted:
+        stats['pruned'] = index.prune(roots, run_id)
+
+    stats['interrupted'] = interrupted
+    stats['seconds'] = round(time.monotonic() - started, 1)
+    index.finish_run(run_id, stats)
+    index.close()
+
+    report_progress(force=True)
+    if stats.get('pruned'):
+        print(f"🧹 없어진 파일 기록 {stats['pruned']:,}개 삭제", file=sys.stderr)
+    print(f"✅ 스캔 완료 ({stats['seconds']}초)", file=sys.stderr)
+    return stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='폴더 민감정보 일괄 스캔 (증분, SQLite 인덱스)')
+    parser.add_argument('roots', nargs='+', help='스캔할 폴더')
+    parser.add_argument('--index', default='scan_index.db', help='인덱스 SQLite 파일')
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 1) // 2),
+                        help='스캔 워커 프로세스 수 (기본: 코어 수 / 2)')
+    parser.add_argument('--settings', help='탐지 설정 JSON 파일 (/api/analyze의 settings와 같은 형식)')
+    parser.add_argument('--enable-pdf-ocr', action='store_true', help='PDF 페이지도 OCR')
+    parser.add_argument('--stop-early', action='store_true', help='민감 문서 판별만 (결과가 확정되면 남은 페이지 생략)')
+    parser.add_argument('--max-size-mb', type=int, default=100, help='이보다 큰 파일은 건너뜀')
+    parser.add_argument('--retry-errors', action='store_true', help='이전에 실패한 파일도 다시 스캔')
+    parser.add_argument('--prune', action='store_true', help='없어진 파일의 기록 삭제')
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error('--workers는 1 이상이어야 합니다')
+    return args
+
+
+def main(argv=None):
+    stats = scan(parse_args(argv))
+    sys.exit(130 if stats['interrupted'] else 0)
+
+
+if __name__ == '__main__':
+    main()
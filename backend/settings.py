@@ -0,0 +1,108 @@
+import os
+from pathlib import Path
+
+from ocr.batch_recognition import DEFAULT_BATCH_SIZE
+from ocr.preprocess import DEFAULT_MAX_SIDE, PreprocessOptions
+
+BASE_DIR = Path(__file__).resolve().parent
+
+
+def _bool(value):
+    return str(value).lower() == 'true'
+
+
+class Settings:
+    """
+    서버 설정 (create_app에 넘김, 보통 Settings.from_env()로 환경 변수에서 읽음)
+
+    항목별 환경 변수와 설명은 README의 "환경 변수" 표 참고
+    """
+
+    def __init__(self, upload_folder=BASE_DIR / 'uploads', max_content_length=100 * 1024 * 1024,
+                 in_memory_upload_max=20 * 1024 * 1024,
+                 ocr_workers=0, ocr_max_backlog=None, ocr_torch_threads=None,
+                 ocr_max_side=DEFAULT_MAX_SIDE, ocr_grayscale=False, ocr_binarize=False,
+                 ocr_rotation='auto', ocr_warmup=None, ocr_model_dir=None, ocr_memory_budget_mb=256,
+                 ocr_batch_size=DEFAULT_BATCH_SIZE, ocr_backend='easyocr', ocr_onnx_dir=BASE_DIR / 'onnx_models',
+                 ocr_cache_dir=BASE_DIR / 'cache', ocr_cache_max_mb=512,
+                 job_workers=2, job_max_pending=16, job_result_ttl=600,
+                 batch_concurrency=4, batch_max_unzipped=500 * 1024 * 1024):
+        self.upload_folder = Path(upload_folder)
+        self.max_content_length = max_content_length
+        self.in_memory_upload_max = in_memory_upload_max
+
+        self.ocr_workers = ocr_workers
+        self.ocr_max_backlog = ocr_max_backlog
+        self.ocr_torch_threads = ocr_torch_threads
+        self.ocr_max_side = ocr_max_side
+        self.ocr_grayscale = ocr_grayscale
+        self.ocr_binarize = ocr_binarize
+        self.ocr_rotation = ocr_rotation
+        # 워커 풀은 요청 스레드가 생기기 전에 fork하도록 eager, 아니면 서버를 먼저 띄우고 background
+        self.ocr_warmup = ocr_warmup or ('eager' if ocr_workers > 0 else 'background')
+        self.ocr_model_dir = ocr_model_dir
+        self.ocr_memory_budget_mb = ocr_memory_budget_mb
+        self.ocr_batch_size = ocr_batch_size
+        self.ocr_backend = ocr_backend
+        self.ocr_onnx_dir = ocr_onnx_dir
+
+        self.ocr_cache_dir = ocr_cache_dir
+        self.ocr_cache_max_mb = ocr_cache_max_mb
+
+        self.job_workers = job_workers
+        self.job_max_pending = job_max_pending
+        self.job_result_ttl = job_result_ttl
+
+        self.batch_concurrency = batch_concurrency
+        self.batch_max_unzipped = batch_max_unzipped
+
+    def ocr_engine_options(self):
+        """OCREngine 생성 인자 (서버와 scanner가 같은 설정으로 OCR하도록)"""
+        return {
+            'workers': self.ocr_workers,
+            'max_backlog': self.ocr_max_backlog,
+            'preprocess': PreprocessOptions(
+                max_side=self.ocr_max_side,
+                grayscale=self.ocr_grayscale,
+                binarize=self.ocr_binarize
+            ),
+            'rotation': self.ocr_rotation,
+            'warmup': self.ocr_warmup,
+            'model_dir': self.ocr_model_dir,
+            'torch_threads': self.ocr_torch_threads,
+            'memory_budget': self.ocr_memory_budget_mb * 1024 * 1024 or None,
+            'batch_size': self.ocr_batch_size,
+            'backend': self.ocr_backend,
+            'onnx_dir': self.ocr_onnx_dir,
+        }
+
+    @classmethod
+    def from_env(cls, environ=None):
+        """환경 변수에서 읽기 (없는 항목은 기본값)"""
+        env = os.environ if environ is None else environ
+        mb = 1024 * 1024
+        return cls(
+            upload_folder=env.get('UPLOAD_FOLDER', BASE_DIR / 'uploads'),
+            max_content_length=int(env.get('MAX_UPLOAD_MB', '100')) * mb,
+            in_memory_upload_max=int(env.get('IN_MEMORY_UPLOAD_MAX_MB', '20')) * mb,
+            ocr_workers=int(env.get('OCR_WORKERS', '0')),
+            ocr_max_backlog=int(env['OCR_MAX_BACKLOG']) if env.get('OCR_MAX_BACKLOG') else None,
+            ocr_torch_threads=int(env['OCR_TORCH_THREADS']) if env.get('OCR_TORCH_THREADS') else None,
+            ocr_max_side=int(env.get('OCR_MAX_SIDE', str(DEFAULT_MAX_SIDE))),
+            ocr_grayscale=_bool(env.get('OCR_GRAYSCALE', 'false')),
+            ocr_binarize=_bool(env.get('OCR_BINARIZE', 'false')),
+            ocr_rotation=env.get('OCR_ROTATION', 'auto'),
+            ocr_warmup=env.get('OCR_WARMUP') or None,
+            ocr_model_dir=env.get('OCR_MODEL_DIR') or None,
+            ocr_memory_budget_mb=int(env.get('OCR_MEMORY_BUDGET_MB', '256')),
+            ocr_batch_size=int(env.get('OCR_BATCH_SIZE', str(DEFAULT_BATCH_SIZE))),
+            ocr_backend=env.get('OCR_BACKEND', 'easyocr'),
+            ocr_onnx_dir=env.get('OCR_ONNX_DIR', BASE_DIR / 'onnx_models'),
+            ocr_cache_dir=env.get('OCR_CACHE_DIR', BASE_DIR / 'cache'),
+            ocr_cache_max_mb=int(env.get('OCR_CACHE_MAX_MB', '512')),
+            job_workers=int(env.get('JOB_WORKERS', '2')),
+            job_max_pending=int(env.get('JOB_MAX_PENDING', '16')),
+            job_result_ttl=int(env.get('JOB_RESULT_TTL', '600')),
+            batch_concurrency=int(env.get('BATCH_CONCURRENCY', '4')),
+            batch_max_unzipped=int(env.get('BATCH_MAX_UNZIPPED_MB', '500')) * mb,
+        )
@@ -0,0 +1,76 @@
+"""
+사용자 예외 패턴 검사 (detector.safe_regex)
+
+backend 폴더에서 실행: python -m pytest tests
+"""
+import re
+import time
+
+import pytest
+
+from detector.pii_detector import PIIDetector
+from detector.safe_regex import TimeBudget, UnsafePatternError, compile_user_pattern
+
+UNSAFE_PATTERNS = [
+    r'(?:(?:\d*){1,10}){1,10}x',        # 작은 반복 안의 큰 반복
+    r'(?:\d*\d*\d*\d*\d*\d*){1,16}x',   # 작은 반복 안에 이어진 큰 반복
+    r'\d*\d*x',                         # 같은 글자를 받는 큰 반복이 이어짐
+    r'(\d+)(\d+)',
+    r'[0-9]+\d+',
+    r'(a+)+',
+    r'(?:\d{1,10})*x',                  # 큰 반복 안의 가변 반복
+    r'(?:\d{0,3}){1,5}',                # 반복 안에서 빈 문자열도 되는 반복
+    r'(a|aa)*',
+    r'(a)\1',
+]
+
+SAFE_PATTERNS = [
+    r'010-1234-\d{4}',
+    r'^02',
+    r'(?:\d{3}-){2}\d{4}',
+    r'(?:\d{1,3}-)?\d{4}',
+    r'\d+-\d+',
+    r'[a-z]+\d+',
+    r'.*@gmail\.com$',
+    r'^(010|011)',
+]
+
+
+@pytest.mark.parametrize('pattern', UNSAFE_PATTERNS)
+def test_rejects_unsafe_pattern(pattern):
+    with pytest.raises(UnsafePatternError):
+        compile_user_pattern(pattern)
+
+
+@pytest.mark.parametrize('pattern', SAFE_PATTERNS)
+def test_accepts_safe_pattern(pattern):
+    compile_user_pattern(pattern)
+
+
+def test_rejects_syntax_error():
+    with pytest.raises(re.error):
+        compile_user_pattern(r'(\d+')
+
+
+@pytest.mark.parametrize('pattern', UNSAFE_PATTERNS[:2])
+def test_detect_ignores_unsafe_exception_quickly(pattern):
+    settings = {'mobilePhoneNumber': {'exceptions': pattern}}
+    started = time.perf_counter()
+    result = PIIDetector().detect('연락처 010-1234-5678 ' * 50, settings)
+    assert time.perf_counter() - started < 5
+    assert result['detected_items']['mobilePhoneNumber']['count'] == 50
+    assert any('mobilePhoneNumber' in warning for warning in result['warnings'])
+
+
+def test_exception_pattern_still_applies():
+    settings = {'mobilePhoneNumber': {'exceptions': r'^010-1234-'}}
+    result = PIIDetector().detect('010-1234-5678 010-9876-5432', settings)
+    assert result['detected_items']['mobilePhoneNumber']['raw'] == ['010-9876-5432']
+
+
+def test_time_budget_skips_after_exhausted():
+    budget = TimeBudget(seconds=0)
+    pattern = compile_user_pattern(r'\d{4}')
+    budget.search(pattern, '010-1234-5678')
+    assert budget.exhausted
+    assert budget.search(pattern, '010-1234-5678') is None
@@ -0,0 +1,82 @@
+"""
+폴더 일괄 스캔 (scanner.run)
+
+backend 폴더에서 실행: python -m pytest tests
+"""
+import os
+from types import SimpleNamespace
+
+import fitz  # pymupdf
+import pytest
+
+from scanner.index import ERROR, OK, SKIPPED, ScanIndex
+from scanner.run import is_unchanged, parse_args, scan
+
+MB = 1024 * 1024
+CONFIG = 'config'
+
+
+def stat_of(size, mtime_ns=1):
+    return SimpleNamespace(st_size=size, st_mtime_ns=mtime_ns)
+
+
+def test_skipped_file_rescanned_when_max_size_raised():
+    previous = (2 * MB, 1, None, CONFIG, SKIPPED)
+    assert is_unchanged(previous, stat_of(2 * MB), CONFIG, max_size=1 * MB)
+    assert not is_unchanged(previous, stat_of(2 * MB), CONFIG, max_size=2 * MB)
+
+
+def test_changed_file_rescanned():
+    previous = (MB, 1, 'sha', CONFIG, OK)
+    assert is_unchanged(previous, stat_of(MB), CONFIG, max_size=MB)
+    assert not is_unchanged(previous, stat_of(MB, mtime_ns=2), CONFIG, max_size=MB)
+    assert not is_unchanged(previous, stat_of(MB), 'other', max_size=MB)
+
+
+def test_error_rescanned_only_with_retry_errors():
+    previous = (MB, 1, 'sha', CONFIG, ERROR)
+    assert is_unchanged(previous, stat_of(MB), CONFIG, max_size=MB)
+    assert not is_unchanged(previous, stat_of(MB), CONFIG, max_size=MB, retry_errors=True)
+
+
+def make_pdf(path, size):
+    """텍스트 한 줄짜리 PDF를 (압축되지 않는) 첨부 파일로 size 바이트 이상으로 키움"""
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), '010-1234-5678')
+    doc.embfile_add('padding.bin', os.urandom(size))
+    doc.save(str(path))
+
+
+def status_of(index_path, path):
+    index = ScanIndex(str(index_path))
+    try:
+        return index.lookup(str(path))[-1]
+    finally:
+        index.close()
+
+
+def test_scan_picks_up_skipped_file_after_raising_max_size(tmp_path):
+    # 스캔 워커가 OCR 모델을 올리므로 OCR 의존성이 있어야 실행됨
+    pytest.importorskip('torch')
+    pytest.importorskip('easyocr')
+
+    root = tmp_path / 'share'
+    root.mkdir()
+    pdf_path = root / 'big.pdf'
+    make_pdf(pdf_path, 3 * MB // 2)
+    index_path = tmp_path / 'index.db'
+    argv = [str(root), '--index', str(index_path), '--workers', '1']
+
+    stats = scan(parse_args(argv + ['--max-size-mb', '1']))
+    assert stats['skipped'] == 1
+    assert status_of(index_path, pdf_path) == SKIPPED
+
+    stats = scan(parse_args(argv + ['--max-size-mb', '1']))
+    assert stats['unchanged'] == 1
+
+    stats = scan(parse_args(argv + ['--max-size-mb', '2']))
+    assert stats['scanned'] == 1
+    assert status_of(index_path, pdf_path) == OK
+
+    stats = scan(parse_args(argv + ['--max-size-mb', '2']))
+    assert stats['unchanged'] == 1
@@ -0,0 +1,12 @@
+"""
+운영 서버용 WSGI 진입점 (backend 폴더에서 `gunicorn wsgi:app`, 설정은 gunicorn.conf.py)
+
+OCR 모델은 gunicorn 마스터 프로세스에서 한 번만 올려두고(preload), fork된 워커들이
+load()할 때 그 메모리를 그대로 나눠 쓴다. (OCR_WARMUP 설정은 쓰지 않음)
+"""
+from app import create_app
+from settings import Settings
+
+settings = Settings.from_env()
+settings.ocr_warmup = 'preload'
+app = create_app(settings)